@@ -0,0 +1,116 @@
+import os
+import re
+import sys
+import threading
+from collections import defaultdict, deque
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import pytest
+
+# the generated protobuf modules predate the upb runtime.
+os.environ.setdefault("PROTOCOL_BUFFERS_PYTHON_IMPLEMENTATION", "python")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class MediaServer(ThreadingHTTPServer):
+    """
+    Local stand-in for the CDN, serves `files` (path -> bytes) with or
+    without Range support. Responses queued with `fail` are answered first,
+    every request is kept in `requests` as (path, Range header).
+    """
+
+    daemon_threads = True
+
+    def __init__(self):
+        super(MediaServer, self).__init__(("127.0.0.1", 0), MediaHandler)
+        self.files = {}
+        self.ranges = True
+        self.requests = []
+        self._failures = defaultdict(deque)
+        self._lock = threading.Lock()
+
+    def url(self, path):
+        return "http://127.0.0.1:%d/%s" % (self.server_port, path.lstrip("/"))
+
+    def fail(self, path, status, headers=None, times=1):
+        for _ in range(times):
+            self._failures["/" + path.lstrip("/")].append((status, headers or {}))
+
+    def ranged(self, path):
+        """Range headers received for `path`"""
+        path = "/" + path.lstrip("/")
+        return [r for p, r in self.requests if p == path and r]
+
+    def handle_error(self, request, client_address):
+        # clients drop bodies they reject (e.g. a 200 for a ranged request).
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super(MediaServer, self).handle_error(request, client_address)
+
+    def _failure(self, path):
+        with self._lock:
+            queue = self._failures.get(path)
+            return queue.popleft() if queue else None
+
+
+class MediaHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_HEAD(self):
+        self._serve(head=True)
+
+    def do_GET(self):
+        self._serve()
+
+    def _reply(self, status, body=b"", headers=None, head=False):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if not head:
+            self.wfile.write(body)
+
+    def _serve(self, head=False):
+        server = self.server
+        path = self.path.split("?")[0]
+        header = self.headers.get("Range")
+        with server._lock:
+            server.requests.append((path, header))
+        failure = server._failure(path)
+        if failure:
+            return self._reply(failure[0], headers=failure[1], head=head)
+        data = server.files.get(path)
+        if data is None:
+            return self._reply(404, head=head)
+        headers = {"ETag": '"%08x"' % (hash(data) & 0xFFFFFFFF)}
+        mobj = re.match(r"bytes=(\d+)-(\d*)$", header or "")
+        if not (server.ranges and mobj):
+            return self._reply(200, data, headers, head)
+        start = int(mobj.group(1))
+        end = min(int(mobj.group(2) or len(data) - 1), len(data) - 1)
+        headers["Accept-Ranges"] = "bytes"
+        headers["Content-Range"] = "bytes %d-%d/%d" % (start, end, len(data))
+        return self._reply(206, data[start : end + 1], headers, head)
+
+
+@pytest.fixture
+def server():
+    httpd = MediaServer()
+    thread = threading.Thread(
+        target=httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+    )
+    thread.start()
+    try:
+        yield httpd
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+
+
+@pytest.fixture
+def payload():
+    """1 MiB of random bytes, a range written at the wrong offset shows"""
+    return os.urandom(1048576)
@@ -0,0 +1,76 @@
+import shutil
+
+import pytest
+
+import udemy.hls
+from udemy.hls import HLSDownload
+from udemy.transport import shared_session
+
+
+PLAYLIST = """#EXTM3U
+#EXT-X-VERSION:4
+#EXT-X-TARGETDURATION:4
+#EXT-X-MEDIA-SEQUENCE:0
+#EXTINF:4.0,
+#EXT-X-BYTERANGE:400000@0
+media.ts
+#EXTINF:4.0,
+#EXT-X-BYTERANGE:400000
+media.ts
+#EXTINF:4.0,
+#EXT-X-BYTERANGE:248576@800000
+media.ts
+#EXT-X-ENDLIST
+"""
+
+
+@pytest.fixture
+def stream(server, payload, monkeypatch):
+    """an MPEG-TS rendition cut into EXT-X-BYTERANGE segments of one file"""
+    server.files["/index.m3u8"] = PLAYLIST.encode()
+    server.files["/media.ts"] = payload
+
+    def remux(src, dst):
+        shutil.copyfile(src, dst)
+        return {"status": "True", "msg": "download"}
+
+    monkeypatch.setattr(udemy.hls, "remux", remux)
+    return server
+
+
+def hls(server, tmp_path):
+    return HLSDownload(
+        shared_session(),
+        server.url("/index.m3u8"),
+        None,
+        str(tmp_path / "lecture.hls-part.mp4"),
+        quiet=True,
+    )
+
+
+def test_byterange_segments(stream, payload, tmp_path):
+    download = hls(stream, tmp_path)
+
+    assert download.load()
+    assert download.download() == {"status": "True", "msg": "postprocessing"}
+    assert download.pending.result() == {"status": "True", "msg": "download"}
+    assert (tmp_path / "lecture.hls-part.mp4").read_bytes() == payload
+    assert sorted(stream.ranged("/media.ts")) == [
+        "bytes=0-399999",
+        "bytes=400000-799999",
+        "bytes=800000-1048575",
+    ]
+    assert not (tmp_path / "lecture.hls-part.mp4.segments.d").exists()
+
+
+def test_byterange_ignored_by_the_server(stream, tmp_path):
+    stream.ranges = False
+    download = hls(stream, tmp_path)
+
+    assert download.load()
+    retval = download.download()
+    assert retval["status"] == "False"
+    assert "HTTP Code 200" in retval["msg"]
+    assert download.pending is None
+    assert not download.store.lengths
+    assert not (tmp_path / "lecture.hls-part.mp4").exists()
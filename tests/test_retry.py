@@ -0,0 +1,60 @@
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+
+from udemy.retry import RetryPolicy, retry_policy, metrics
+from udemy.segmented import SegmentedDownload
+from udemy.transport import shared_session
+
+
+def test_retries_after_the_advertised_delay(server):
+    server.files["/captions.vtt"] = b"WEBVTT\n"
+    server.fail("/captions.vtt", 503, {"Retry-After": "0"}, times=2)
+    retries, backoff = metrics.retries, metrics.backoff_time
+
+    resp = retry_policy.call(shared_session().get, server.url("/captions.vtt"), timeout=10)
+    assert resp.status_code == 200
+    assert resp.content == b"WEBVTT\n"
+    assert metrics.retries - retries == 2
+    assert metrics.backoff_time == backoff
+    assert len(server.requests) == 3
+
+
+def test_retry_after_seconds_and_date(server):
+    server.fail("/a", 429, {"Retry-After": "3"})
+    later = datetime.now(timezone.utc) + timedelta(seconds=30)
+    server.fail("/b", 503, {"Retry-After": format_datetime(later, usegmt=True)})
+
+    resp = shared_session().get(server.url("/a"), timeout=10)
+    assert retry_policy.delay(1, resp) == 3.0
+    resp = shared_session().get(server.url("/b"), timeout=10)
+    assert 25 < retry_policy.delay(1, resp) <= 30
+
+
+def test_gives_up_with_the_last_response(server):
+    server.fail("/slides.pdf", 503, {"Retry-After": "0"}, times=5)
+    policy = RetryPolicy(max_attempts=3)
+    giveups = metrics.giveups
+
+    resp = policy.call(shared_session().get, server.url("/slides.pdf"), timeout=10)
+    assert resp.status_code == 503
+    assert metrics.giveups - giveups == 1
+    assert len(server.requests) == 3
+
+
+def test_range_retried_after_the_advertised_delay(server, payload, tmp_path):
+    server.files["/media.bin"] = payload
+    filepath = tmp_path / "media.bin.part"
+    download = SegmentedDownload(
+        shared_session(),
+        server.url("/media.bin"),
+        str(filepath),
+        min_segment_size=262144,
+        quiet=True,
+    )
+    assert download.probe()
+    server.fail("/media.bin", 503, {"Retry-After": "0"})
+    retries = metrics.retries
+
+    assert download.download()["msg"] == "download"
+    assert filepath.read_bytes() == payload
+    assert metrics.retries - retries == 1
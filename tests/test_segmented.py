@@ -0,0 +1,159 @@
+import os
+import types
+
+from udemy.internal import InternUdemyLectureAssets
+from udemy.manifest import new_hash
+from udemy.segmented import SegmentedDownload
+from udemy.transport import shared_session
+
+
+SEGMENT = 262144
+
+
+def sha256(data):
+    digest = new_hash()
+    digest.update(data)
+    return digest.hexdigest()
+
+
+def ranges(*starts):
+    return ["bytes=%d-%d" % (start, start + SEGMENT - 1) for start in starts]
+
+
+def fetched(server, path="/media.bin"):
+    """ranges requested after the one byte probe"""
+    probe, *requested = server.ranged(path)
+    assert probe == "bytes=0-0"
+    return sorted(requested, key=lambda header: int(header[6:].split("-")[0]))
+
+
+def segmented(server, filepath, path="/media.bin"):
+    return SegmentedDownload(
+        shared_session(),
+        server.url(path),
+        str(filepath),
+        connections=4,
+        min_segment_size=SEGMENT,
+        quiet=True,
+    )
+
+
+def asset(server, path="/media.bin"):
+    parent = types.SimpleNamespace(_lecture_index=1)
+    return InternUdemyLectureAssets(
+        ("file", "bin", "media.bin", "media.bin", server.url(path), 1), parent
+    )
+
+
+def interrupted(server, filepath, payload, done):
+    """leaves a '.part' and its journal as a run that only finished `done` would"""
+    download = segmented(server, filepath)
+    assert download.probe()
+    download._preallocate()
+    download.journal.reset(
+        download.total, download.etag, download.last_modified, download.segments()
+    )
+    fd = os.open(str(filepath), os.O_RDWR)
+    try:
+        for index in done:
+            entry = download.journal.ranges[index]
+            data = payload[entry["start"] : entry["end"] + 1]
+            os.pwrite(fd, data, entry["start"])
+            download.journal.update(index, data)
+        download.journal.save(fd, force=True)
+    finally:
+        os.close(fd)
+
+
+def test_downloads_by_ranges(server, payload, tmp_path):
+    server.files["/media.bin"] = payload
+    filepath = tmp_path / "media.bin.part"
+    download = segmented(server, filepath)
+
+    assert download.probe()
+    assert download.download() == {"status": "True", "msg": "download"}
+    assert filepath.read_bytes() == payload
+    assert download.digest == sha256(payload)
+    assert fetched(server) == ranges(*range(0, len(payload), SEGMENT))
+    assert not os.path.exists(download.journal.filepath)
+
+
+def test_probe_without_range_support(server, payload, tmp_path):
+    server.files["/media.bin"] = payload
+    server.ranges = False
+    download = segmented(server, tmp_path / "media.bin.part")
+
+    assert not download.probe()
+    assert download.total == len(payload)
+
+
+def test_downloader_falls_back_to_a_single_stream(server, payload, tmp_path):
+    server.files["/media.bin"] = payload
+    server.ranges = False
+    item = asset(server)
+
+    assert item.download(filepath=str(tmp_path), quiet=True) == {
+        "status": "True",
+        "msg": "download",
+    }
+    assert (tmp_path / item.filename).read_bytes() == payload
+    assert item.digest == sha256(payload)
+    assert server.requests[-1] == ("/media.bin", None)
+
+
+def test_downloader_uses_ranges_when_supported(server, payload, tmp_path):
+    server.files["/media.bin"] = payload
+    item = asset(server)
+
+    assert item.download(filepath=str(tmp_path), quiet=True)["msg"] == "download"
+    assert (tmp_path / item.filename).read_bytes() == payload
+    assert server.ranged("/media.bin") == ["bytes=0-0", "bytes=0-%d" % (len(payload) - 1)]
+
+
+def test_resumes_from_the_journal(server, payload, tmp_path):
+    server.files["/media.bin"] = payload
+    filepath = tmp_path / "media.bin.part"
+    interrupted(server, filepath, payload, done=(0, 2))
+    del server.requests[:]
+
+    download = segmented(server, filepath)
+    assert download.probe()
+    assert download.download()["msg"] == "download"
+    assert filepath.read_bytes() == payload
+    assert download.digest == sha256(payload)
+    assert fetched(server) == ranges(SEGMENT, 3 * SEGMENT)
+
+
+def test_refetches_a_torn_range(server, payload, tmp_path):
+    server.files["/media.bin"] = payload
+    filepath = tmp_path / "media.bin.part"
+    interrupted(server, filepath, payload, done=(0, 1, 2))
+    with open(str(filepath), "r+b") as fd:
+        fd.seek(SEGMENT + 10)
+        fd.write(b"\x00" if payload[SEGMENT + 10] else b"\x01")
+    del server.requests[:]
+
+    download = segmented(server, filepath)
+    assert download.probe()
+    assert download.download()["msg"] == "download"
+    assert filepath.read_bytes() == payload
+    assert fetched(server) == ranges(SEGMENT, 3 * SEGMENT)
+
+
+def test_failed_range_keeps_the_journal_for_a_resume(server, payload, tmp_path):
+    server.files["/media.bin"] = payload
+    filepath = tmp_path / "media.bin.part"
+    download = segmented(server, filepath)
+    assert download.probe()
+    server.fail("/media.bin", 404)
+
+    retval = download.download()
+    assert retval["status"] == "False"
+    assert "404" in retval["msg"]
+    assert os.path.isfile(download.journal.filepath)
+
+    download = segmented(server, filepath)
+    assert download.probe()
+    assert download.download()["msg"] == "download"
+    assert filepath.read_bytes() == payload
+    assert download.digest == sha256(payload)
@@ -35,10 +35,18 @@ from udemy.logger import logger
 from udemy.getpass import getpass
 from udemy.vtt2srt import WebVtt2Srt
 from udemy.progress import ProgressBar
+from udemy.scheduler import Job, JobScheduler
+from udemy.aio import AsyncEngine
+from udemy.retry import metrics as retry_metrics
+from udemy.ratelimit import limiter, parse_rate, parse_schedule
+from udemy.planner import DownloadPlan
+from udemy.manifest import Manifest
+from udemy.paths import CoursePaths
+from udemy.sync import CourseSync
+from udemy.postprocess import postprocessor
 from udemy.colorized.banner import banner
 from udemy.utils import (
     to_configs,
-    to_filepath,
     load_configs,
     to_human_readable,
     extract_url_or_courses,
@@ -49,12 +57,13 @@ class Udemy(WebVtt2Srt, ProgressBar):
     """Udemy is class which implements downloading/listing and all"""
 
     def __init__(
-        self, url_or_courses, username="", password="", cookies="", cache_session=False, keys_decryptors="keyfile.json"
+        self, url_or_courses, username="", password="", cookies="", cache_session=False, keys_decryptors="keyfile.json", refresh=False
     ):
         self.username = username
         self.password = password
         self.cookies = cookies
         self._cache_session = cache_session
+        self._refresh = refresh
         self.url_or_courses = url_or_courses
 
         # Get the keys
@@ -67,35 +76,217 @@ class Udemy(WebVtt2Srt, ProgressBar):
                     keyfile = json.loads(keyfile)
 
         self.keys_decryptors = keyfile
+        self._manifest = None
+        self._postprocessing = []
+        self._engine = None
 
         super(Udemy, self).__init__()
 
-    def download_assets(self, assets, filepath):
+    def _schedule(self, scheduler, job):
+        """hands the job to the scheduler, or runs it right away without one"""
+        if scheduler:
+            scheduler.submit(job)
+        else:
+            job.func(*job.args, **job.kwargs)
+
+    def _select_subtitles(self, subtitles, language):
+        if language and subtitles and language != "all":
+            subtitle = subtitles[0]
+            subtitles = subtitle.get_subtitle(language)
+        return subtitles
+
+    def _select_stream(self, lecture, quality):
+        stream = lecture.getbest()
+        if quality and lecture:
+            stream = lecture.get_quality(quality)
+        return stream
+
+    def _selected_items(
+        self,
+        chapters,
+        paths,
+        quality="",
+        language="",
+        dl_assets=True,
+        dl_lecture=True,
+        dl_subtitles=True,
+        lecture_number=None,
+        lecture_start=None,
+        lecture_end=None,
+    ):
+        """yields (chapter, chapter directory, item) for everything selected"""
+        directories = paths.chapters(chapter.title for chapter in chapters)
+        paths.create()
+        for chapter, filepath in zip(chapters, directories):
+            lectures = chapter.get_lectures(
+                lecture_number=lecture_number,
+                lecture_start=lecture_start,
+                lecture_end=lecture_end,
+            )
+            for lecture in lectures:
+                items = []
+                if dl_lecture:
+                    items.append(self._select_stream(lecture, quality))
+                if dl_assets:
+                    items.extend(lecture.assets)
+                if dl_subtitles:
+                    items.extend(self._select_subtitles(lecture.subtitles, language))
+                for item in items:
+                    self._claim_file(paths, filepath, item)
+                    yield chapter, filepath, item
+
+    def _claim_file(self, paths, filepath, item):
+        """
+        names `item` through the course paths before anything is written, so
+        two downloads that sanitize to the same name never overwrite each other.
+        """
+        if item and item.mediatype != "external_link":
+            path = paths.file(filepath, item.filename, owner=item)
+            item.set_filename(os.path.basename(path))
+
+    def _plan_downloads(self, chapters, paths, **selection):
+        """
+        sizes everything selected concurrently and makes sure it fits on disk
+        before the first download, returns the chapters (a stream is read to
+        its end, the sizes are probed while later chapters are extracted).
+        """
+        logger.info(msg="Planning download size..", new_line=True)
+        plan = DownloadPlan()
+        planned = []
+        for chapter in chapters:
+            planned.append(chapter)
+            for _, filepath, item in self._selected_items(
+                [chapter], paths, **selection
+            ):
+                plan.add(chapter.title, item, filepath)
+        plan.probe()
+        for chapter_title, total, remaining in plan.chapters():
+            logger.info(
+                msg=f"Chapter ({chapter_title}) : {to_human_readable(total)}",
+                new_line=True,
+                post_msg=f"({to_human_readable(remaining)}left)" if remaining != total else None,
+            )
+        fits, required, free = plan.check_space(paths.course_path)
+        if not fits:
+            logger.error(
+                msg=f"> Not enough free space, ({to_human_readable(required)}) required but only ({to_human_readable(free)}) available!",
+                new_line=True,
+            )
+            sys.exit(1)
+        if plan.unknown:
+            logger.warning(
+                msg=f"({plan.unknown}) file(s) of unknown size not counted, HLS streams aren't sized either.",
+            )
+        logger.info(
+            msg=f"Downloading ({to_human_readable(required)}) of ({to_human_readable(free)}) free.",
+            new_line=True,
+        )
+        return planned
+
+    def _sync_course(self, course, chapters, paths, whole=True, **selection):
+        """
+        brings the files of the previous run in line with the curriculum, moved
+        lectures are renamed and changed ones removed so they are fetched again.
+        """
+        logger.info(msg="Comparing with the previous download..", new_line=True)
+        sync = CourseSync(self._manifest)
+        for _, filepath, item in self._selected_items(
+            chapters, paths, **selection
+        ):
+            if item and item.mediatype != "external_link" and hasattr(item, "source"):
+                sync.add(item, item._resolve_filepath(filepath))
+        lectures = None
+        if whole:
+            lectures = set(
+                lecture.id
+                for chapter in course.get_chapters()
+                for lecture in chapter.get_lectures()
+            )
+        sync.plan(lectures=lectures).apply()
+        self._manifest.save()
+        for title in sync.new:
+            logger.info(msg=f"New        ({title})", new_line=True)
+        for title in sync.changed:
+            logger.info(msg=f"Changed    ({title})", new_line=True)
+        for old, new in sync.moved:
+            logger.info(msg=f"Moved      ({old} -> {new})", new_line=True)
+        for relpath in sync.removed:
+            logger.warning(msg=f"No longer listed ({relpath}), kept on disk")
+        logger.info(
+            msg=f"Sync : ({len(sync.new)}) new, ({len(sync.changed)}) changed, "
+            f"({len(sync.moved)}) moved, ({len(sync.unchanged)}) unchanged, "
+            f"({len(sync.removed)}) no longer listed.",
+            new_line=True,
+        )
+
+    def _record(self, filename, digest=None, source=None):
+        """adds a finished download to the manifest of the current course"""
+        if self._manifest is not None:
+            self._manifest.record(filename, digest=digest, source=source)
+
+    def _record_subtitle(self, sub, filename):
+        # the .vtt is usually gone after the conversion, the .srt is kept.
+        self._record(filename, digest=sub.digest, source=sub.source)
+        self._record(filename.replace(".vtt", ".srt"), source=sub.source)
+
+    def _collect_postprocessing(self):
+        """waits for the lectures still being remuxed/muxed and reports them"""
+        postprocessing, self._postprocessing = self._postprocessing, []
+        for title, stream, filename, future in postprocessing:
+            try:
+                retval = postprocessor.result(future) or {}
+            except Exception as error:  # pylint: disable=W
+                retval = {"status": "False", "msg": f"Reason : {error}"}
+            msg = retval.get("msg")
+            if msg == "download":
+                logger.info(msg=f"Downloaded  ({title})", new_line=True)
+                self._record(
+                    filename,
+                    digest=getattr(stream, "digest", None),
+                    source=getattr(stream, "source", None),
+                )
+            else:
+                logger.download_skipped(msg=f"Lecture : '{title}' ", reason=msg)
+
+    def _fetch(self, item, filepath, callback):
+        """downloads a small item, on the async engine when one is running"""
+        if self._engine:
+            return self._engine.download(
+                item, filepath=filepath, quiet=True, callback=callback
+            )
+        return item.download(filepath=filepath, quiet=True, callback=callback)
+
+    def download_assets(self, assets, filepath, callback=None):
         """This function will simply download the asstes.."""
+        callback = callback or self.show_progress
         if assets:
             for asset in assets:
                 title = asset.filename
                 logger.info(msg="Downloading asset(s)", new_line=True, before=True)
                 logger.info(msg=f"Downloading ({title})", new_line=True)
                 try:
-                    retval = asset.download(
-                        filepath=filepath,
-                        quiet=True,
-                        callback=self.show_progress,
-                    )
+                    retval = self._fetch(asset, filepath, callback)
                     msg = retval.get("msg")
                     if msg == "already downloaded":
                         logger.already_downloaded(msg=f"Asset : '{title}'")
                     elif msg == "download":
                         logger.info(msg=f"Downloaded  ({title})", new_line=True)
+                        self._record(
+                            asset._resolve_filepath(filepath),
+                            digest=asset.digest,
+                            source=asset.source,
+                        )
                     else:
                         logger.download_skipped(msg=f"Asset : '{title}' ", reason=msg)
                 except KeyboardInterrupt:
                     logger.error(msg="User Interrupted..", new_line=True)
                     sys.exit(0)
 
-    def download_lecture(self, stream, filepath, current, total, keep_encrypted, do_decrypt):
+    def download_lecture(
+        self, stream, filepath, current, total, keep_encrypted, do_decrypt, callback=None
+    ):
         """This function will simply download the lectures.."""
+        callback = callback or self.show_progress
         if stream:
             title = stream.title
             logger.info(
@@ -111,6 +302,11 @@ class Udemy(WebVtt2Srt, ProgressBar):
                         stream.url, stream.format_id, stream.title, filepath,
                         concurrent_connections=10,
                     )
+                    if stream.pending:
+                        logger.info(msg=f"Muxing  ({title})", new_line=True)
+                        self._postprocessing.append(
+                            (title, stream, os.path.join(filepath, stream.filename), stream.pending)
+                        )
                 else:
                     logger.info(
                         msg=f"      > Lecture '{stream.title}' is missing media links",
@@ -126,24 +322,35 @@ class Udemy(WebVtt2Srt, ProgressBar):
                     retval = stream.download(
                         filepath=filepath,
                         quiet=True,
-                        callback=self.show_progress,
+                        callback=callback,
                     )
                     msg = retval.get("msg")
                     if msg == "already downloaded":
                         logger.already_downloaded(msg=f"Lecture : '{title}'")
                     elif msg == "download":
                         logger.info(msg=f"Downloaded  ({title})", new_line=True)
+                        self._record(
+                            stream._resolve_filepath(filepath),
+                            digest=stream.digest,
+                            source=stream.source,
+                        )
+                    elif msg == "postprocessing":
+                        logger.info(msg=f"Remuxing  ({title})", new_line=True)
+                        self._postprocessing.append(
+                            (title, stream, stream._resolve_filepath(filepath), stream.pending)
+                        )
                     else:
                         logger.download_skipped(msg=f"Lecture : '{title}' ", reason=msg)
                 except KeyboardInterrupt:
                     logger.error(msg="User Interrupted..", new_line=True)
                     sys.exit(0)
 
-    def download_subtitles(self, subtitles, filepath, language="en", keep_vtt=False):
+    def download_subtitles(
+        self, subtitles, filepath, language="en", keep_vtt=False, callback=None
+    ):
         """This function will simply download the subtitles.."""
-        if language and subtitles and language != "all":
-            subtitle = subtitles[0]
-            subtitles = subtitle.get_subtitle(language)
+        callback = callback or self.show_progress
+        subtitles = self._select_subtitles(subtitles, language)
         if subtitles:
             for sub in subtitles:
                 title = f"{sub.title}.{sub.language}"
@@ -151,17 +358,14 @@ class Udemy(WebVtt2Srt, ProgressBar):
                 logger.info(msg="Downloading subtitle(s)", new_line=True, before=True)
                 logger.info(msg=f"Downloading ({title})", new_line=True)
                 try:
-                    retval = sub.download(
-                        filepath=filepath,
-                        quiet=True,
-                        callback=self.show_progress,
-                    )
+                    retval = self._fetch(sub, filepath, callback)
                     msg = retval.get("msg")
                     if msg == "already downloaded":
                         logger.already_downloaded(msg=f"Subtitle : '{title}'")
                     elif msg == "download":
                         logger.info(msg=f"Downloaded  ({title})", new_line=True)
                         self.convert(filename=filename, keep_vtt=keep_vtt)
+                        self._record_subtitle(sub, filename)
                     else:
                         logger.download_skipped(
                             msg=f"Subtitle : '{title}' ", reason=msg
@@ -196,6 +400,7 @@ class Udemy(WebVtt2Srt, ProgressBar):
                 cookies=self.cookies,
                 skip_hls_stream=skip_hls_stream,
                 cache_session=self._cache_session,
+                refresh=self._refresh,
             )
             course_name = course.title
             chapters = course.get_chapters(
@@ -210,6 +415,18 @@ class Udemy(WebVtt2Srt, ProgressBar):
             logger.info(msg=f"Chapter(s) ({total_chapters})", new_line=True)
             logger.info(msg=f"Lecture(s) ({total_lectures})", new_line=True)
             logger.info(msg=f"Quizzes(s) ({total_quizzes})", new_line=True)
+            # size every listed file at once instead of one request at a time.
+            plan = DownloadPlan()
+            for chapter in chapters:
+                lectures = chapter.get_lectures(
+                    lecture_number=lecture_number,
+                    lecture_start=lecture_start,
+                    lecture_end=lecture_end,
+                )
+                for lecture in lectures:
+                    for item in lecture.streams + lecture.assets + lecture.subtitles:
+                        plan.add(chapter.title, item, "")
+            plan.probe()
             for chapter in chapters:
                 chapter_id = chapter.id
                 chapter_title = chapter.title
@@ -349,7 +566,11 @@ class Udemy(WebVtt2Srt, ProgressBar):
         keep_vtt=False,
         skip_hls_stream=False,
         keep_encrypted=False,
-        do_decrypt=True
+        do_decrypt=True,
+        jobs=1,
+        engine="sync",
+        plan=True,
+        sync=False,
     ):
         """This function will download the course contents .."""
         if not self.cookies:
@@ -357,6 +578,18 @@ class Udemy(WebVtt2Srt, ProgressBar):
         if self.cookies:
             logger.info(msg="Trying to login using session cookie", new_line=True)
 
+        aio = None
+        if engine == "async":
+            try:
+                aio = AsyncEngine().start()
+                self._engine = aio
+            except ImportError:
+                logger.error(
+                    msg="> aiohttp is missing, it is required by '--engine async'",
+                    new_line=True,
+                )
+                sys.exit(1)
+
         courses_paths = []
         for url in self.url_or_courses:
             course = udemy.course(
@@ -366,24 +599,31 @@ class Udemy(WebVtt2Srt, ProgressBar):
                 cookies=self.cookies,
                 skip_hls_stream=skip_hls_stream,
                 cache_session=self._cache_session,
-                chapter_start=chapter_start
+                chapter_start=chapter_start,
+                refresh=self._refresh,
             )
             course_name = course.title
             if path:
                 if "~" in path:
                     path = os.path.expanduser(path)
             course_path = os.path.join(path, course_name)
+            paths = CoursePaths(course_path)
 
             courses_paths.append({
                 "title": course_name,
                 "path": course_path
             })
 
-            chapters = course.get_chapters(
+            chapter_selection = dict(
                 chapter_number=chapter_number,
                 chapter_start=chapter_start,
                 chapter_end=chapter_end,
             )
+            if sync:
+                # the diff needs every selected lecture before anything is fetched.
+                chapters = course.get_chapters(**chapter_selection)
+            else:
+                chapters = course.iter_chapters(**chapter_selection)
             total_lectures = course.lectures
             total_quizzes = course.quizzes
             total_chapters = course.chapters
@@ -391,6 +631,42 @@ class Udemy(WebVtt2Srt, ProgressBar):
             logger.info(msg=f"Chapter(s) ({total_chapters})", new_line=True)
             logger.info(msg=f"Lecture(s) ({total_lectures})", new_line=True)
             logger.info(msg=f"Quiz(zes) ({total_quizzes})", new_line=True)
+            selection = dict(
+                quality=quality,
+                language=language,
+                dl_assets=dl_assets,
+                dl_lecture=dl_lecture,
+                dl_subtitles=dl_subtitles,
+                lecture_number=lecture_number,
+                lecture_start=lecture_start,
+                lecture_end=lecture_end,
+            )
+            if plan:
+                # a selection that can't fit fails before anything is downloaded.
+                chapters = self._plan_downloads(chapters, paths, **selection)
+            self._manifest = Manifest(course_path)
+            self._manifest.load()
+            if sync:
+                # without chapter_start the curriculum holds the whole course,
+                # chapter_number/chapter_end only select from it.
+                self._sync_course(
+                    course, chapters, paths, whole=not chapter_start, **selection
+                )
+            scheduler = None
+            if aio:
+                # the workers only wait on the event loop for small files.
+                scheduler = JobScheduler(
+                    jobs=jobs + aio.concurrency,
+                    limits={"lecture": max(1, jobs // 2)},
+                    host_limit=aio.limit_per_host,
+                ).start()
+            elif jobs and jobs > 1:
+                # every lecture already uses several connections of its own.
+                scheduler = JobScheduler(
+                    jobs=jobs, limits={"lecture": max(1, jobs // 2)}
+                ).start()
+            # quizzes link to lectures of any chapter, dumped once all are known.
+            saved_quizzes = []
             for chapter in chapters:
                 chapter_index = chapter.index
                 chapter_title = chapter.title
@@ -407,7 +683,8 @@ class Udemy(WebVtt2Srt, ProgressBar):
                 )
                 quizzes_count = chapter.quizzes
 
-                filepath = to_filepath(course_path, chapter_title)
+                filepath = paths.chapter(chapter_title)
+                paths.create()
                 logger.set_log_filepath(course_path)
                 chapter_progress = (
                     chapter_index
@@ -443,6 +720,12 @@ class Udemy(WebVtt2Srt, ProgressBar):
                 for lecture in lectures:
                     lecture_assets = lecture.assets
                     lecture_subtitles = lecture.subtitles
+                    if dl_assets:
+                        for asset in lecture_assets:
+                            self._claim_file(paths, filepath, asset)
+                    if dl_subtitles:
+                        for sub in self._select_subtitles(lecture_subtitles, language):
+                            self._claim_file(paths, filepath, sub)
                     if dl_lecture:
                         lecture_index = lecture_index + 1
                         if lecture.html:
@@ -452,25 +735,45 @@ class Udemy(WebVtt2Srt, ProgressBar):
                                 msg = f"Lecture: '{lecture.title}.{lecture.extension}' failed to dump, reason: {msg}"
                                 logger.warning(msg=msg, silent=True)
 
-                        stream = lecture.getbest()
-                        if quality and lecture:
-                            stream = lecture.get_quality(quality)
-                        self.download_lecture(
-                            stream,
-                            filepath,
-                            lecture_index,
-                            lectures_count,
-                            keep_encrypted,
-                            do_decrypt
+                        stream = self._select_stream(lecture, quality)
+                        self._claim_file(paths, filepath, stream)
+                        self._schedule(
+                            scheduler,
+                            Job(
+                                "lecture",
+                                self.download_lecture,
+                                args=(
+                                    stream,
+                                    filepath,
+                                    lecture_index,
+                                    lectures_count,
+                                    keep_encrypted,
+                                    do_decrypt,
+                                ),
+                                url=getattr(stream, "url", None),
+                            ),
                         )
                     if dl_assets:
-                        self.download_assets(lecture_assets, filepath)
-                    if dl_subtitles:
-                        self.download_subtitles(
-                            lecture_subtitles,
-                            filepath,
-                            language=language,
-                            keep_vtt=keep_vtt,
+                        for asset in lecture_assets:
+                            self._schedule(
+                                scheduler,
+                                Job(
+                                    "asset",
+                                    self.download_assets,
+                                    args=([asset], filepath),
+                                    url=asset.url,
+                                ),
+                            )
+                    if dl_subtitles and lecture_subtitles:
+                        self._schedule(
+                            scheduler,
+                            Job(
+                                "subtitle",
+                                self.download_subtitles,
+                                args=(lecture_subtitles, filepath),
+                                kwargs={"language": language, "keep_vtt": keep_vtt},
+                                url=lecture_subtitles[0].url,
+                            ),
                         )
 
                 quiz_index = 0
@@ -487,20 +790,60 @@ class Udemy(WebVtt2Srt, ProgressBar):
                     if dl_quizzes:
                         quiz_index = quiz_index + 1
                         quiz.quiz_index = quiz_index
-                        retval = quiz.dump(filepath=filepath)
-                        msg = retval.get("msg")
-                        if msg not in ["download", "already downloaded"]:
-                            msg = f"'{quiz.title}.json' failed to dump, reason: {msg}"
-                            logger.warning(msg=msg, silent=True)
+                        saved_quizzes.append((quiz, filepath))
+
+            for quiz, filepath in saved_quizzes:
+                retval = quiz.dump(filepath=filepath)
+                msg = retval.get("msg")
+                if msg not in ["download", "already downloaded"]:
+                    msg = f"'{quiz.title}.json' failed to dump, reason: {msg}"
+                    logger.warning(msg=msg, silent=True)
 
-                        logger.info(msg=f"Saving ({quiz.title})", new_line=True)
+                logger.info(msg=f"Saving ({quiz.title})", new_line=True)
 
-                        # TODO Agregar el JSON al Quiz Template
+                # TODO Agregar el JSON al Quiz Template
 
+            if scheduler:
+                scheduler.join()
+            self._collect_postprocessing()
+            if self._manifest.files:
+                self._manifest.save()
+            self._manifest = None
+            if retry_metrics.retries:
+                logger.info(
+                    msg=f"Retried ({retry_metrics.retries}) request(s), "
+                    f"{retry_metrics.backoff_time:.1f}s spent in backoff.",
+                    new_line=True,
+                )
             print("")
 
+        if aio:
+            aio.close()
+            self._engine = None
+        # jobs nobody collected, a failed one is reported instead of raised.
+        for title, error in postprocessor.close():
+            logger.download_skipped(msg=f"Lecture : '{title}' ", reason=f"Reason : {error}")
         return courses_paths
 
+
+def verify(course_path):
+    """checks a downloaded course directory against its manifest.json"""
+    manifest = Manifest(os.path.expanduser(course_path))
+    if not manifest.load():
+        logger.error(msg=f"> No manifest found at '{manifest.filepath}'", new_line=True)
+        sys.exit(1)
+    logger.info(msg=f"Verifying ({len(manifest.files)}) file(s)..", new_line=True)
+    failed = 0
+    for relpath, status in manifest.verify():
+        if status != "ok":
+            failed += 1
+            logger.warning(msg=f"{relpath} : {status}")
+    if failed:
+        logger.error(msg=f"> ({failed}) file(s) failed verification!", new_line=True)
+        sys.exit(1)
+    logger.success(msg="All file(s) verified")
+
+
 def main():
     """main function"""
     sys.stdout.write(banner())
@@ -640,6 +983,64 @@ def main():
         metavar="",
     )
 
+    advance.add_argument(
+        "-j",
+        "--jobs",
+        dest="jobs",
+        type=int,
+        default=1,
+        help="Download lectures, assets and subtitles concurrently with N workers.",
+        metavar="",
+    )
+
+    advance.add_argument(
+        "--engine",
+        dest="engine",
+        type=str,
+        choices=["sync", "async"],
+        default="sync",
+        help="Download backend for small files (async requires aiohttp).",
+        metavar="",
+    )
+
+    advance.add_argument(
+        "--limit-rate",
+        dest="limit_rate",
+        type=parse_rate,
+        default=0,
+        help="Limit the overall download rate (e.g:- 500K, 2M), shared fairly by all jobs.",
+        metavar="",
+    )
+
+    advance.add_argument(
+        "--limit-rate-schedule",
+        dest="limit_rate_schedule",
+        type=parse_schedule,
+        default=None,
+        help="Time of day rate windows overriding --limit-rate (e.g:- 09:00-18:00=500K,18:00-09:00=0).",
+        metavar="",
+    )
+
+    advance.add_argument(
+        "--verify",
+        dest="verify",
+        action="store_true",
+        help="Verify a downloaded course directory (given as course) against its manifest.json.",
+    )
+
+    advance.add_argument(
+        "--skip-size-check",
+        dest="skip_size_check",
+        action="store_true",
+        help="Skip sizing the course and checking free disk space before downloading.",
+    )
+    advance.add_argument(
+        "--sync",
+        dest="sync",
+        action="store_true",
+        help="Only download new or changed lectures, apply renames and moves on disk.",
+    )
+
     decrypt = parser.add_argument_group("Decrypt")
     decrypt.add_argument(
         "-d",
@@ -675,6 +1076,12 @@ def main():
         action="store_true",
         help="Cache your session to avoid providing again.",
     )
+    other.add_argument(
+        "--refresh",
+        dest="refresh",
+        action="store_true",
+        help="Ignore the cached course information and fetch it again.",
+    )
     other.add_argument(
         "--keep-vtt",
         dest="keep_vtt",
@@ -720,6 +1127,9 @@ def main():
     )
 
     args = parser.parse_args()
+    if args.verify:
+        verify(args.course)
+        sys.exit(0)
     if args.cookies:
         f_in = open(args.cookies)
         with open(args.cookies) as f_in:
@@ -781,13 +1191,17 @@ def main():
         )
         sys.exit(1)
 
+    limiter.configure(rate=args.limit_rate, schedule=args.limit_rate_schedule)
+
     udemy_obj = Udemy(
         url_or_courses=url_or_courses,
         username=args.username,
         password=args.password,
         cookies=args.cookies,
         cache_session=args.cache_session,
-        keys_decryptors=args.keys_decryptors or "keyfile.json"
+        keys_decryptors=args.keys_decryptors or "keyfile.json",
+        # a sync compares against what udemy lists right now.
+        refresh=args.refresh or args.sync,
     )
     # setting the caching default so that we can avoid future login attemps.
     if args.cache_session:
@@ -842,7 +1256,11 @@ def main():
             keep_vtt=args.keep_vtt,
             skip_hls_stream=args.skip_hls_stream,
             keep_encrypted=args.keep_encrypted,
-            do_decrypt=not args.not_decrypt
+            do_decrypt=not args.not_decrypt,
+            jobs=args.jobs,
+            engine=args.engine,
+            plan=not args.skip_size_check,
+            sync=args.sync,
         )
     if args.info:
         udemy_obj.course_listdown(
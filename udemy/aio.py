@@ -0,0 +1,178 @@
+# pylint: disable=R,C,W
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+
+Author  : Nasir Khan (r0ot h3x49)
+Github  : https://github.com/r0oth3x49
+License : MIT
+
+
+Copyright (c) 2018-2025 Nasir Khan (r0ot h3x49)
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), to deal in the
+Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, 
+and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR
+ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH 
+THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""
+
+import asyncio
+import threading
+
+from udemy.compat import os, HEADERS
+from udemy.retry import retry_policy, metrics as retry_metrics
+from udemy.ratelimit import limiter
+from udemy.manifest import new_hash
+
+
+class AsyncEngine(object):
+    """
+    asyncio download backend for small objects (subtitles, external links,
+    source code zips, slides..). Hundreds of transfers share one event loop
+    running in a background thread, bounded by `concurrency`, while lecture
+    files keep using the threaded, segmented `Downloader.download`.
+
+    `download(item, filepath, quiet, callback)` takes the place of
+    `item.download(filepath, quiet, callback)` and returns the same retVal.
+
+    Requires the optional `aiohttp` module.
+    """
+
+    def __init__(self, concurrency=200, limit_per_host=64, chunksize=65536):
+        self.concurrency = concurrency
+        self.limit_per_host = limit_per_host
+        self.chunksize = chunksize
+
+        self._loop = None
+        self._thread = None
+        self._session = None
+        self._semaphore = None
+
+    def start(self):
+        import aiohttp  # pylint: disable=W
+
+        self._aiohttp = aiohttp
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    async def _get_session(self):
+        if self._session is None:
+            aiohttp = self._aiohttp
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.concurrency, limit_per_host=self.limit_per_host
+                ),
+                timeout=aiohttp.ClientTimeout(total=None, sock_connect=10, sock_read=30),
+                headers={"User-Agent": HEADERS.get("User-Agent")},
+                auto_decompress=False,
+            )
+        return self._session
+
+    def download(self, item, filepath="", quiet=False, callback=lambda *x: None):
+        """
+        downloads `item` on the event loop, same call and retVal as
+        `Downloader.download`, the calling thread only waits for it.
+        """
+        return asyncio.run_coroutine_threadsafe(
+            self._download(item, filepath, callback), self._loop
+        ).result()
+
+    async def _io(self, func, *args):
+        # file system calls block, they run on the default executor.
+        return await self._loop.run_in_executor(None, func, *args)
+
+    async def _fetch(self, session, url, temp_filepath, callback):
+        async with session.get(url) as resp:
+            if resp.status != 200:
+                return resp, None
+            total = int(resp.headers.get("Content-Length", 0))
+            bytesdone = 0
+            digest = new_hash()
+            media_file = await self._io(open, temp_filepath, "wb")
+            try:
+                async for chunk in resp.content.iter_chunked(self.chunksize):
+                    if limiter.active:
+                        # the limiter blocks, keep it off the event loop.
+                        await self._io(limiter.consume, len(chunk), temp_filepath)
+                    await self._io(media_file.write, chunk)
+                    digest.update(chunk)
+                    bytesdone += len(chunk)
+            finally:
+                await self._io(media_file.close)
+            if total and bytesdone != total:
+                raise self._aiohttp.ClientPayloadError(
+                    "incomplete body, received %s of %s byte(s)" % (bytesdone, total)
+                )
+            if callback:
+                callback(bytesdone, bytesdone, 1.0, 0, 0)
+            return resp, digest.hexdigest()
+
+    async def _download(self, item, filepath, callback):
+        filepath = await self._io(item._resolve_filepath, filepath)
+        if item.mediatype == "external_link":
+            return await self._io(item._write_external_links, filepath)
+        if await self._io(item._is_downloaded, filepath):
+            return {"status": "True", "msg": "already downloaded"}
+
+        temp_filepath = filepath + ".part"
+        session = await self._get_session()
+        attempt, slept = 0, 0.0
+        async with self._semaphore:
+            while True:
+                attempt += 1
+                resp = error = None
+                try:
+                    resp, digest = await self._fetch(
+                        session, item.url, temp_filepath, callback
+                    )
+                except (self._aiohttp.ClientError, asyncio.TimeoutError) as exc:
+                    error = exc
+                else:
+                    if digest is not None:
+                        break
+                    if resp.status not in retry_policy.RETRY_STATUSES:
+                        return {
+                            "status": "False",
+                            "msg": "Udemy returned HTTP Code %s: %s"
+                            % (resp.status, resp.reason),
+                        }
+                delay = retry_policy.delay(attempt, resp if error is None else None)
+                if attempt >= retry_policy.max_attempts or slept + delay > retry_policy.budget:
+                    retry_metrics._add_giveup()
+                    if error is not None:
+                        return {"status": "False", "msg": "Reason : {}".format(error)}
+                    return {
+                        "status": "False",
+                        "msg": "Udemy returned HTTP Code %s: %s" % (resp.status, resp.reason),
+                    }
+                retry_metrics._add_retry(delay)
+                await asyncio.sleep(delay)
+                slept += delay
+
+        await self._io(os.replace, temp_filepath, filepath)
+        item._digest = digest
+        return {"status": "True", "msg": "download"}
+
+    async def _close(self):
+        if self._session is not None:
+            await self._session.close()
+
+    def close(self):
+        if self._loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self._close(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self._loop = None
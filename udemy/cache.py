@@ -0,0 +1,142 @@
+# pylint: disable=R,C,W
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+
+Author  : Nasir Khan (r0ot h3x49)
+Github  : https://github.com/r0oth3x49
+License : MIT
+
+
+Copyright (c) 2018-2025 Nasir Khan (r0ot h3x49)
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), to deal in the
+Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, 
+and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR
+ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH 
+THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""
+
+import threading
+
+from udemy.compat import os, re, json, time
+
+
+class PlaylistCache(object):
+    """
+    Parsed HLS variant lists by playlist URL. An entry lives as long as the
+    signed URL it came from ('Expires=', 'exp=' in the query) minus a safety
+    margin, or `default_ttl` seconds when the URL carries no expiry.
+    """
+
+    _EXPIRY = re.compile(r"(?i)(?:[?&~]|\b)(?:expires|exp)=(\d{9,})")
+
+    def __init__(self, default_ttl=300, margin=60):
+        self.default_ttl = default_ttl
+        self.margin = margin
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def ttl(self, url, now=None):
+        now = now or time.time()
+        mobj = self._EXPIRY.search(url)
+        if mobj:
+            return max(0, int(mobj.group(1)) - now - self.margin)
+        return self.default_ttl
+
+    def get(self, url):
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires <= time.time():
+                del self._entries[url]
+                return None
+            return value
+
+    def set(self, url, value):
+        ttl = self.ttl(url)
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._entries[url] = (time.time() + ttl, value)
+
+
+class CurriculumCache(object):
+    """
+    Extracted course structures on disk, one JSON file per course id. An entry
+    is served while its revision matches and it is younger than `ttl`, and no
+    longer than the earliest signed URL it holds stays valid.
+    """
+
+    VERSION = 1
+
+    def __init__(self, path=None, ttl=6 * 3600, margin=300):
+        if not path:
+            root = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+                os.path.expanduser("~"), ".cache"
+            )
+            path = os.path.join(root, "udemy-dl", "curriculum")
+        self.path = path
+        self.ttl = ttl
+        self.margin = margin
+
+    def _filepath(self, course_id):
+        return os.path.join(self.path, "{}.json".format(course_id))
+
+    def revision(self, course_info, *options):
+        """marker that changes whenever the course or the extraction options do."""
+        values = [self.VERSION, (course_info or {}).get("last_update_date")]
+        values.extend(options)
+        return ":".join(str(value) for value in values)
+
+    def expires(self, text, now=None):
+        now = now or time.time()
+        expires = now + self.ttl
+        for value in PlaylistCache._EXPIRY.findall(text):
+            expires = min(expires, int(value) - self.margin)
+        return expires
+
+    def get(self, course_id, revision):
+        try:
+            with open(self._filepath(course_id), encoding="utf-8") as fd:
+                entry = json.load(fd)
+        except (OSError, ValueError):
+            return None
+        if entry.get("revision") != revision or entry.get("expires", 0) <= time.time():
+            return None
+        return entry.get("course")
+
+    def set(self, course_id, revision, course):
+        course = {k: v for k, v in course.items() if k != "access_token"}
+        text = json.dumps(course)
+        entry = {
+            "revision": revision,
+            "expires": self.expires(text),
+            "course": course,
+        }
+        filepath = self._filepath(course_id)
+        temp = filepath + ".tmp"
+        try:
+            os.makedirs(self.path, exist_ok=True)
+            fd = os.open(temp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w", encoding="utf-8") as fd:
+                json.dump(entry, fd)
+            os.replace(temp, filepath)
+        except OSError:
+            return False
+        return True
+
+    def remove(self, course_id):
+        try:
+            os.remove(self._filepath(course_id))
+        except OSError:
+            pass
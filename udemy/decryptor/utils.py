@@ -71,19 +71,27 @@ def mux_process(video_title, video_filepath, audio_filepath, output_path):
     """
     @author Jayapraveen
     """
-    if os.name == "nt":
-        command = (
-            f"ffmpeg -y -i \"{video_filepath}\" -i \"{audio_filepath}\" "
-            f"-acodec copy -vcodec copy -fflags +bitexact -map_metadata -1 "
-            f"-metadata title=\"{video_title}\" \"{output_path}\""
-        )
-    else:
-        command = (
-            f"nice -n 7 ffmpeg -y -i \"{video_filepath}\" -i \"{audio_filepath}\" "
-            f"-acodec copy -vcodec copy -fflags +bitexact -map_metadata -1 "
-            f"-metadata title=\"{video_title}\" \"{output_path}\""
-        )
-    os.system(command)
+    command = [
+        "ffmpeg", "-y", "-loglevel", "error",
+        "-i", video_filepath, "-i", audio_filepath,
+        "-acodec", "copy", "-vcodec", "copy", "-fflags", "+bitexact",
+        "-map_metadata", "-1", "-metadata", f"title={video_title}",
+        "-movflags", "+faststart", output_path,
+    ]
+    if os.name != "nt":
+        command = ["nice", "-n", "7"] + command
+    try:
+        proc = subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    except OSError as error:
+        return {"status": "False", "msg": f"Error: {error}"}
+    if proc.returncode != 0:
+        reason = proc.stderr.decode("utf-8", "ignore").strip().splitlines()
+        return {
+            "status": "False",
+            "msg": "ffmpeg failed to mux: %s" % (reason[-1] if reason else proc.returncode),
+        }
+    return {"status": "True", "msg": "download"}
+
 
 def decrypt(keys_decryptors, kid, in_filepath, out_filepath):
     """
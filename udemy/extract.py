@@ -24,6 +24,7 @@ THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 
 """
 import yt_dlp
+from concurrent.futures import ThreadPoolExecutor
 
 from udemy.auth import UdemyAuth
 from udemy.utils import (
@@ -47,6 +48,9 @@ from udemy.compat import (
     SUBSCRIBED_COURSES, QUIZ_URL, LECTURE_URL, REFERER_QUIZ_URL,
 )
 from udemy.sanitize import slugify, sanitize, SLUG_OK
+from udemy.paths import clean
+from udemy.retry import no_retry
+from udemy.cache import PlaylistCache, CurriculumCache
 from udemy.logger import logger
 from udemy.getpass import getpass
 
@@ -56,12 +60,12 @@ class Udemy:
         self._session = ""
         self._cookies = ""
         self._access_token = ""
+        self._m3u8_cache = PlaylistCache()
+        self._m3u8_pending = {}
+        self._curriculum_cache = CurriculumCache()
 
     def _clean(self, text):
-        ok = re.compile(r'[^\\/:*?"<>|]')
-        text = "".join(x if ok.match(x) else "_" for x in text)
-        text = re.sub(r"\.+$", "", text.strip())
-        return text
+        return clean(text)
 
     def _sanitize(self, unsafetext):
         text = sanitize(
@@ -158,11 +162,13 @@ class Udemy:
     def _extract_quizzes(self, url, portal_name, quiz_id, last_version, course_name):
         # https://indra.udemy.com/api-2.0/quizzes/4900310/assessments/?version=1&page_size=250&fields[assessment]=id,assessment_type,prompt,correct_response,section,question_plain,related_lectures
         referer = REFERER_QUIZ_URL.format(portal_name=portal_name, quiz_id=quiz_id, course_name=course_name)
-        self._session._headers.update({"Referer": referer})
         url = QUIZ_URL.format(portal_name=portal_name, quiz_id=quiz_id, last_version=last_version)
         try:
-            resp = self._session._get(url)
+            resp = self._session._get(url, headers={"Referer": referer})
             if resp.status_code in [502, 503]:
+                logger.warning(
+                    msg=f"Udemy Says: {resp.status_code} {resp.reason} on quiz ({quiz_id}), retries exhausted"
+                )
                 resp = {}
             else:
                 resp = resp.json()
@@ -178,11 +184,14 @@ class Udemy:
 
     def _extract_lectures(self, url, portal_name, course_id, lecture_id):
         # https://indra.udemy.com/api-2.0/users/me/subscribed-courses/3142166/lectures/20244808/?fields[lecture]=asset,description,download_url,is_free,last_watched_second&fields[asset]=asset_type,length,media_license_token,course_is_drmed,media_sources,captions,thumbnail_sprite,slides,slide_urls,download_urls&q=0.6148300542269443
-        self._session._headers.update({"Referer": url})
+        referer = url
         url = LECTURE_URL.format(portal_name=portal_name, course_id=course_id, lecture_id=lecture_id)
         try:
-            resp = self._session._get(url)
+            resp = self._session._get(url, headers={"Referer": referer})
             if resp.status_code in [502, 503]:
+                logger.warning(
+                    msg=f"Udemy Says: {resp.status_code} {resp.reason} on lecture ({lecture_id}), retries exhausted"
+                )
                 resp = {}
             else:
                 resp = resp.json()
@@ -285,30 +294,67 @@ class Udemy:
         else:
             results = response.get("results", [])
             _temp.extend(results)
-            _next = response.get("next")
             logger.progress(msg="Fetching all enrolled course(s) url(s).. ")
-            while _next:
-                logger.progress(msg="Fetching all enrolled course(s) url(s).. ")
-                try:
-                    resp = self._session._get(_next)
-                    resp.raise_for_status()
-                    resp = resp.json()
-                except conn_error as error:
-                    logger.error(msg=f"Udemy Says: Connection error, {error}")
-                    time.sleep(0.8)
-                    sys.exit(0)
-                except Exception as error:
-                    logger.error(msg=f"Udemy Says: error, {error}")
-                    time.sleep(0.8)
-                    sys.exit(0)
-                else:
-                    _next = resp.get("next")
-                    results = resp.get("results", [])
-                    _temp.extend(results)
+            pages = self._fetch_pages(response, self._subscribed_courses_page)
+            _temp.extend(r for page in pages for r in page.get("results") or [])
         if _temp:
             _temp = clean_urls(_temp)
         return _temp
 
+    def _subscribed_courses_page(self, url):
+        logger.progress(msg="Fetching all enrolled course(s) url(s).. ")
+        try:
+            resp = self._session._get(url)
+            resp.raise_for_status()
+            resp = resp.json()
+        except conn_error as error:
+            logger.error(msg=f"Udemy Says: Connection error, {error}")
+            time.sleep(0.8)
+            sys.exit(0)
+        except Exception as error:
+            logger.error(msg=f"Udemy Says: error, {error}")
+            time.sleep(0.8)
+            sys.exit(0)
+        return resp
+
+    def _page_urls(self, response):
+        """
+        urls of the pages after `response`, derived from `count` and the page
+        number and size of its `next` link. returns None if they can't be derived.
+        """
+        _next = response.get("next")
+        count = response.get("count")
+        if not _next or not isinstance(count, int):
+            return None
+        page = re.search(r"[?&]page=(\d+)", _next)
+        page_size = re.search(r"[?&]page_size=(\d+)", _next)
+        page_size = int(page_size.group(1)) if page_size else len(response.get("results") or [])
+        if not page or not page_size:
+            return None
+        last = -(-count // page_size)
+        return [
+            re.sub(r"([?&]page=)\d+", r"\g<1>{}".format(number), _next)
+            for number in range(int(page.group(1)), last + 1)
+        ]
+
+    def _fetch_pages(self, response, fetch, workers=8):
+        """
+        fetches the pages following `response` concurrently and returns them in
+        order, falls back to following the `next` links one by one.
+        """
+        pages = []
+        urls = self._page_urls(response)
+        _next = response.get("next")
+        if urls:
+            with ThreadPoolExecutor(max_workers=min(workers, len(urls))) as executor:
+                pages = list(executor.map(fetch, urls))
+            _next = pages[-1].get("next")
+        while _next:
+            page = fetch(_next)
+            pages.append(page)
+            _next = page.get("next")
+        return pages
+
     def __extract_course(self, response, course_name):
         _temp = {}
         if response:
@@ -367,28 +413,30 @@ class Udemy:
             time.sleep(0.8)
             sys.exit(0)
         else:
-            _next = data.get("next")
-            while _next:
-                logger.progress(msg="Downloading course information .. ")
-                try:
-                    resp = self._session._get(_next).json()
-                except conn_error as error:
-                    logger.error(msg=f"Udemy Says: Connection error, {error}")
-                    time.sleep(0.8)
-                    sys.exit(0)
-                else:
-                    _next = resp.get("next")
-                    results = resp.get("results")
-                    if results and isinstance(results, list):
-                        for d in resp["results"]:
-                            data["results"].append(d)
+            pages = self._fetch_pages(data, self._course_content_page)
+            data["results"].extend(
+                r
+                for page in pages
+                if isinstance(page.get("results"), list)
+                for r in page["results"]
+            )
             return data
 
+    def _course_content_page(self, url):
+        logger.progress(msg="Downloading course information .. ")
+        try:
+            return self._session._get(url).json()
+        except conn_error as error:
+            logger.error(msg=f"Udemy Says: Connection error, {error}")
+            time.sleep(0.8)
+            sys.exit(0)
+
     def _extract_course_json(self, url, course_id, portal_name):
         self._session._headers.update({"Referer": url})
         url = COURSE_URL.format(portal_name=portal_name, course_id=course_id)
         try:
-            resp = self._session._get(url)
+            # 502/503 here means the course is too large for one page, no point retrying.
+            resp = self._session._get(url, policy=no_retry)
             if resp.status_code in [502, 503]:
                 resp = self._extract_large_course_content(url=url)
             else:
@@ -431,7 +479,16 @@ class Udemy:
         return data, text_tracks
 
     def _extract_m3u8(self, url):
-        """extracts m3u8 streams"""
+        """extracts m3u8 streams, waiting for a prefetch of `url` if one is running"""
+        pending = self._m3u8_pending.get(url)
+        if pending is not None:
+            return list(pending.result())
+        return self._fetch_m3u8(url)
+
+    def _fetch_m3u8(self, url):
+        cached = self._m3u8_cache.get(url)
+        if cached is not None:
+            return list(cached)
         _temp = []
         try:
             resp = self._session._get(url)
@@ -460,10 +517,69 @@ class Udemy:
                             "download_url": download_url,
                         }
                     )
+            self._m3u8_cache.set(url, list(_temp))
         except Exception as error:
             logger.error(msg=f"Udemy Says : '{error}' while fetching hls streams..")
         return _temp
 
+    def _prefetch_m3u8(self, executor, course, chapter_start=0):
+        """
+        submits the master playlists of every lecture to `executor` in course
+        order, the extraction loop waits for each one as it gets there.
+        """
+        urls, counter = [], -1
+        for entry in course:
+            clazz = entry.get("_class")
+            if clazz == "chapter":
+                counter += 1
+            if clazz != "lecture" or counter < chapter_start - 1:
+                continue
+            data = (entry.get("asset") or {}).get("stream_urls")
+            if not data or not isinstance(data, dict):
+                continue
+            for source in data.get("Video") or []:
+                download_url = source.get("file")
+                if not download_url or (source.get("label") or "").lower() == "audio":
+                    continue
+                if (
+                    source.get("type") == "application/x-mpegURL"
+                    or "m3u8" in download_url
+                ) and self._m3u8_cache.get(download_url) is None:
+                    urls.append(download_url)
+        for url in dict.fromkeys(urls):
+            self._m3u8_pending[url] = executor.submit(self._fetch_m3u8, url)
+
+    def _resolve_lectures_and_quizzes(
+        self, executor, url, course, portal_name, course_id, course_title, chapter_start=0
+    ):
+        """
+        submits the lectures without stream urls and every quiz to `executor`,
+        returns their futures keyed by id. they are consumed in course order so
+        failures surface the same way as when they were fetched inline.
+        """
+        lectures, quizzes, counter = {}, {}, -1
+        for entry in course:
+            clazz = entry.get("_class")
+            if clazz == "chapter":
+                counter += 1
+            _id = entry.get("id")
+            if counter < chapter_start - 1 or not _id:
+                continue
+            if clazz == "lecture" and _id not in lectures:
+                asset = entry.get("asset")
+                if not isinstance(asset, dict) or asset.get("stream_urls") is not None:
+                    continue
+                asset_type = (asset.get("asset_type") or asset.get("assetType") or "").lower()
+                if asset_type == "video":
+                    lectures[_id] = executor.submit(
+                        self._extract_lectures, url, portal_name, course_id, _id
+                    )
+            elif clazz == "quiz" and _id not in quizzes:
+                quizzes[_id] = executor.submit(
+                    self._extract_quizzes, url, portal_name, _id, entry.get("version", 1), course_title
+                )
+        return lectures, quizzes
+
     def _extract_ppt(self, assets):
         _temp = []
         download_urls = assets.get("download_urls")
@@ -681,6 +797,7 @@ class Udemy:
                     _temp.append(
                         {
                             "type": "file",
+                            "id": entry.get("id"),
                             "title": title,
                             "filename": filename,
                             "extension": extension,
@@ -694,6 +811,7 @@ class Udemy:
                     _temp.append(
                         {
                             "type": "source_code",
+                            "id": entry.get("id"),
                             "title": title,
                             "filename": filename,
                             "extension": extension,
@@ -704,6 +822,7 @@ class Udemy:
                 _temp.append(
                     {
                         "type": "external_link",
+                        "id": entry.get("id"),
                         "title": title,
                         "filename": filename,
                         "extension": "txt",
@@ -712,7 +831,42 @@ class Udemy:
                 )
         return _temp
 
-    def _real_extract(self, url="", skip_hls_stream=False, chapter_start=None):
+    def _real_extract(self, url="", skip_hls_stream=False, chapter_start=None, refresh=False):
+        _udemy = {}
+        for kind, record in self._iter_extract(
+            url, skip_hls_stream=skip_hls_stream, chapter_start=chapter_start, refresh=refresh
+        ):
+            if kind == "course":
+                # filled in place, complete once the records run out.
+                _udemy = record
+        return _udemy
+
+    def _count_curriculum(self, course, chapter_start=0):
+        """the totals of the extracted course, known before anything is resolved"""
+        chapters = lectures = quizzes = 0
+        counter = -1
+        for entry in course or []:
+            clazz = entry.get("_class")
+            if clazz == "chapter":
+                chapters += 1
+                counter += 1
+            elif clazz in ("lecture", "quiz") and counter >= chapter_start - 1:
+                if chapters == 0:
+                    chapters += 1
+                    counter += 1
+                if entry.get("id") and clazz == "lecture":
+                    lectures += 1
+                elif entry.get("id"):
+                    quizzes += 1
+        return chapters, lectures, quizzes
+
+    def _iter_extract(self, url="", skip_hls_stream=False, chapter_start=None, refresh=False):
+        """
+        extracts the course as a stream of ("course", dict), then ("chapter", dict),
+        ("lecture", dict) and ("quiz", dict) records in course order. lectures
+        and quizzes belong to the last chapter, the course dict is the one
+        _real_extract returns and is complete when the stream ends.
+        """
         if chapter_start is None:
             chapter_start = 0
 
@@ -724,6 +878,22 @@ class Udemy:
             course_title = course_info.get("published_title")
             portal_name = course_info.get("portal_name")
 
+        revision = self._curriculum_cache.revision(course_info, skip_hls_stream, chapter_start)
+        if not refresh:
+            cached = self._curriculum_cache.get(course_id, revision)
+            if cached:
+                cached["access_token"] = self._access_token
+                yield "course", cached
+                for chapter in cached["chapters"]:
+                    yield "chapter", dict(
+                        chapter, lectures=[], quizzes=[], lectures_count=0, quizzes_count=0
+                    )
+                    for lecture in chapter.get("lectures", []):
+                        yield "lecture", lecture
+                    for quiz in chapter.get("quizzes", []):
+                        yield "quiz", quiz
+                return
+
         course_json = self._extract_course_json(url, course_id, portal_name)
         course = course_json.get("results")
         resource = course_json.get("detail")
@@ -754,20 +924,90 @@ class Udemy:
         _udemy["title"] = title
         _udemy["course_title"] = course_title
         _udemy["chapters"] = []
-
-        counter = -1
+        (
+            _udemy["total_chapters"],
+            _udemy["total_lectures"],
+            _udemy["total_quizzes"],
+        ) = self._count_curriculum(course, chapter_start=chapter_start)
+        yield "course", _udemy
 
         if course:
-            quizzes = []
-            content_counter = 0
-            quiz_counter = 1
-            for entry in course:
-                clazz = entry.get("_class")
-                asset = entry.get("asset")
-                supp_assets = entry.get("supplementary_assets")
+            m3u8_executor = ThreadPoolExecutor(max_workers=16)
+            executor = ThreadPoolExecutor(max_workers=8)
+            try:
+                if not skip_hls_stream:
+                    logger.progress(msg="Downloading course information .. ")
+                    self._prefetch_m3u8(m3u8_executor, course, chapter_start=chapter_start)
+                resolved_lectures, resolved_quizzes = self._resolve_lectures_and_quizzes(
+                    executor, url, course, portal_name, course_id, course_title,
+                    chapter_start=chapter_start,
+                )
+                yield from self._extract_entries(
+                    url, course, _udemy, resolved_lectures, resolved_quizzes,
+                    portal_name, course_id, course_title, skip_hls_stream, chapter_start,
+                )
+            finally:
+                self._m3u8_pending = {}
+                m3u8_executor.shutdown(wait=False, cancel_futures=True)
+                executor.shutdown(wait=False, cancel_futures=True)
+            _udemy["total_chapters"] = len(_udemy["chapters"])
+            _udemy["total_lectures"] = sum(
+                [
+                    entry.get("lectures_count", 0)
+                    for entry in _udemy["chapters"]
+                    if entry
+                ]
+            )
+            _udemy["total_quizzes"] = sum(
+                [
+                    entry.get("quizzes_count", 0)
+                    for entry in _udemy["chapters"]
+                    if entry
+                ]
+            )
+            # lectures or quizzes the api failed to return are not worth keeping.
+            resolved = list(resolved_lectures.values()) + list(resolved_quizzes.values())
+            if all(future.result() for future in resolved):
+                self._curriculum_cache.set(course_id, revision, _udemy)
 
-                if clazz == "chapter":
-                    # content_counter = 0
+    def _extract_entries(
+        self, url, course, _udemy, resolved_lectures, resolved_quizzes,
+        portal_name, course_id, course_title, skip_hls_stream=False, chapter_start=0,
+    ):
+        """builds the chapters of `_udemy` entry by entry and yields their records"""
+        counter = -1
+        quizzes = []
+        content_counter = 0
+        quiz_counter = 1
+        for entry in course:
+            clazz = entry.get("_class")
+            asset = entry.get("asset")
+            supp_assets = entry.get("supplementary_assets")
+
+            if clazz == "chapter":
+                # content_counter = 0
+                lectures = []
+                quizzes = []
+                chapter_index = entry.get("object_index")
+                chapter_title = "{0:02d} ".format(chapter_index) + self._clean(
+                    entry.get("title")
+                )
+                if chapter_title not in _udemy["chapters"]:
+                    _udemy["chapters"].append(
+                        {
+                            "chapter_title": chapter_title,
+                            "chapter_id": entry.get("id"),
+                            "chapter_index": chapter_index,
+                            "lectures": [],
+                            "quizzes": [],
+                        }
+                    )
+                    counter += 1
+                    yield "chapter", _udemy["chapters"][-1]
+            elif clazz == "lecture" and counter >= chapter_start-1:
+                content_counter += 1
+                lecture_id = entry.get("id")
+                if len(_udemy["chapters"]) == 0:
                     lectures = []
                     quizzes = []
                     chapter_index = entry.get("object_index")
@@ -778,150 +1018,119 @@ class Udemy:
                         _udemy["chapters"].append(
                             {
                                 "chapter_title": chapter_title,
-                                "chapter_id": entry.get("id"),
+                                "chapter_id": lecture_id,
                                 "chapter_index": chapter_index,
                                 "lectures": [],
                                 "quizzes": [],
                             }
                         )
                         counter += 1
-                elif clazz == "lecture" and counter >= chapter_start-1:
-                    content_counter += 1
-                    lecture_id = entry.get("id")
-                    if len(_udemy["chapters"]) == 0:
-                        lectures = []
-                        quizzes = []
-                        chapter_index = entry.get("object_index")
-                        chapter_title = "{0:02d} ".format(chapter_index) + self._clean(
-                            entry.get("title")
-                        )
-                        if chapter_title not in _udemy["chapters"]:
-                            _udemy["chapters"].append(
-                                {
-                                    "chapter_title": chapter_title,
-                                    "chapter_id": lecture_id,
-                                    "chapter_index": chapter_index,
-                                    "lectures": [],
-                                    "quizzes": [],
-                                }
-                            )
-                            counter += 1
+                        yield "chapter", _udemy["chapters"][-1]
 
-                    if lecture_id:
+                if lecture_id:
 
-                        retVal = []
+                    retVal = []
 
-                        if isinstance(asset, dict):
-                            asset_type = (
-                                asset.get("asset_type").lower()
-                                or asset.get("assetType").lower()
-                            )
-                            if asset_type == "article":
-                                if (
-                                    isinstance(supp_assets, list)
-                                    and len(supp_assets) > 0
-                                ):
-                                    retVal = self._extract_supplementary_assets(
-                                        supp_assets
-                                    )
-                            elif asset_type == "video":
-                                if (
-                                    isinstance(supp_assets, list)
-                                    and len(supp_assets) > 0
-                                ):
-                                    retVal = self._extract_supplementary_assets(
-                                        supp_assets
-                                    )
-                            elif asset_type == "e-book":
-                                retVal = self._extract_ebook(asset)
-                            elif asset_type == "file":
-                                retVal = self._extract_file(asset)
-                            elif asset_type == "presentation":
-                                retVal = self._extract_ppt(asset)
-                            elif asset_type == "audio":
-                                retVal = self._extract_audio(asset)
-
-                        logger.progress(msg="Downloading course information .. ")
-                        lecture_index = entry.get("object_index")
-                        lecture_title = "{0:03d} ".format(
-                            content_counter
-                        ) + self._clean(entry.get("title"))
-                        data = asset.get("stream_urls")
-                        if data and isinstance(data, dict):
-                            sources = data.get("Video")
+                    if isinstance(asset, dict):
+                        asset_type = (
+                            asset.get("asset_type").lower()
+                            or asset.get("assetType").lower()
+                        )
+                        if asset_type == "article":
+                            if (
+                                isinstance(supp_assets, list)
+                                and len(supp_assets) > 0
+                            ):
+                                retVal = self._extract_supplementary_assets(
+                                    supp_assets
+                                )
+                        elif asset_type == "video":
+                            if (
+                                isinstance(supp_assets, list)
+                                and len(supp_assets) > 0
+                            ):
+                                retVal = self._extract_supplementary_assets(
+                                    supp_assets
+                                )
+                        elif asset_type == "e-book":
+                            retVal = self._extract_ebook(asset)
+                        elif asset_type == "file":
+                            retVal = self._extract_file(asset)
+                        elif asset_type == "presentation":
+                            retVal = self._extract_ppt(asset)
+                        elif asset_type == "audio":
+                            retVal = self._extract_audio(asset)
+
+                    logger.progress(msg="Downloading course information .. ")
+                    lecture_index = entry.get("object_index")
+                    lecture_title = "{0:03d} ".format(
+                        content_counter
+                    ) + self._clean(entry.get("title"))
+                    data = asset.get("stream_urls")
+                    if data and isinstance(data, dict):
+                        sources = data.get("Video")
+                        tracks = asset.get("captions")
+                        duration = asset.get("time_estimation")
+                        sources = self._extract_sources(
+                            sources, skip_hls_stream=skip_hls_stream
+                        )
+                        subtitles = self._extract_subtitles(tracks)
+                        sources_count = len(sources)
+                        subtitle_count = len(subtitles)
+                        lectures.append(
+                            {
+                                "index": content_counter,
+                                "lecture_index": lecture_index,
+                                "lectures_id": lecture_id,
+                                "lecture_title": lecture_title,
+                                "duration": duration,
+                                "assets": retVal,
+                                "assets_count": len(retVal),
+                                "sources": sources,
+                                "subtitles": subtitles,
+                                "subtitle_count": subtitle_count,
+                                "sources_count": sources_count,
+                                "video_sources": [],
+                                "is_encrypted": False,
+                                "asset_id": asset.get("id")
+                            }
+                        )
+                    elif data is None and asset_type == "video":
+                        resolved = resolved_lectures.get(lecture_id)
+                        if resolved is not None:
+                            data_lecture = resolved.result()
+                        else:
+                            data_lecture = self._extract_lectures(url, portal_name, course_id, lecture_id)
+                        # TODO: CUANDO SE TENGAN LAS CLAVES DE CHROME PARA AVERIGUAR CUAL ES EL ID DE
+                        #  DESENCRIPTADO DEL VIDEO
+                        # encrypted
+                        asset = data_lecture.get("asset", {})
+                        media_sources = asset.get("media_sources")
+                        if media_sources and isinstance(media_sources, list):
+                            sources = self._extract_media_sources(media_sources)
                             tracks = asset.get("captions")
-                            duration = asset.get("time_estimation")
-                            sources = self._extract_sources(
-                                sources, skip_hls_stream=skip_hls_stream
-                            )
+                            # duration = asset.get("time_estimation")
                             subtitles = self._extract_subtitles(tracks)
                             sources_count = len(sources)
                             subtitle_count = len(subtitles)
-                            lectures.append(
-                                {
-                                    "index": content_counter,
-                                    "lecture_index": lecture_index,
-                                    "lectures_id": lecture_id,
-                                    "lecture_title": lecture_title,
-                                    "duration": duration,
-                                    "assets": retVal,
-                                    "assets_count": len(retVal),
-                                    "sources": sources,
-                                    "subtitles": subtitles,
-                                    "subtitle_count": subtitle_count,
-                                    "sources_count": sources_count,
-                                    "video_sources": [],
-                                    "is_encrypted": False,
-                                    "asset_id": None
-                                }
-                            )
-                        elif data is None and asset_type == "video":
-                            data_lecture = self._extract_lectures(url, portal_name, course_id, lecture_id)
-                            # TODO: CUANDO SE TENGAN LAS CLAVES DE CHROME PARA AVERIGUAR CUAL ES EL ID DE
-                            #  DESENCRIPTADO DEL VIDEO
-                            # encrypted
-                            asset = data_lecture.get("asset", {})
-                            media_sources = asset.get("media_sources")
-                            if media_sources and isinstance(media_sources, list):
-                                sources = self._extract_media_sources(media_sources)
-                                tracks = asset.get("captions")
-                                # duration = asset.get("time_estimation")
-                                subtitles = self._extract_subtitles(tracks)
-                                sources_count = len(sources)
-                                subtitle_count = len(subtitles)
-                                lectures.append({
-                                    "index": content_counter,
-                                    "lecture_index": lecture_index,
-                                    "lectures_id": lecture_id,
-                                    "lecture_title": lecture_title,
-                                    # "duration": duration,
-                                    "assets": retVal,
-                                    "assets_count": len(retVal),
-                                    "sources": [],
-                                    "video_sources": sources,
-                                    "subtitles": subtitles,
-                                    "subtitle_count": subtitle_count,
-                                    "sources_count": sources_count,
-                                    "is_encrypted": True,
-                                    "asset_id": asset.get("id")
-                                })
-                            else:
-                                # ALGO PASA CON ESTE LECTURE
-                                lectures.append(
-                                    {
-                                        "index": content_counter,
-                                        "lecture_index": lecture_index,
-                                        "lectures_id": lecture_id,
-                                        "lecture_title": lecture_title,
-                                        "html_content": asset.get("body"),
-                                        "extension": "html",
-                                        "assets": retVal,
-                                        "assets_count": len(retVal),
-                                        "subtitle_count": 0,
-                                        "sources_count": 0,
-                                    }
-                                )
+                            lectures.append({
+                                "index": content_counter,
+                                "lecture_index": lecture_index,
+                                "lectures_id": lecture_id,
+                                "lecture_title": lecture_title,
+                                # "duration": duration,
+                                "assets": retVal,
+                                "assets_count": len(retVal),
+                                "sources": [],
+                                "video_sources": sources,
+                                "subtitles": subtitles,
+                                "subtitle_count": subtitle_count,
+                                "sources_count": sources_count,
+                                "is_encrypted": True,
+                                "asset_id": asset.get("id")
+                            })
                         else:
+                            # ALGO PASA CON ESTE LECTURE
                             lectures.append(
                                 {
                                     "index": content_counter,
@@ -936,40 +1145,65 @@ class Udemy:
                                     "sources_count": 0,
                                 }
                             )
+                    else:
+                        lectures.append(
+                            {
+                                "index": content_counter,
+                                "lecture_index": lecture_index,
+                                "lectures_id": lecture_id,
+                                "lecture_title": lecture_title,
+                                "html_content": asset.get("body"),
+                                "extension": "html",
+                                "assets": retVal,
+                                "assets_count": len(retVal),
+                                "subtitle_count": 0,
+                                "sources_count": 0,
+                            }
+                        )
+                    yield "lecture", lectures[-1]
 
-                    _udemy["chapters"][counter]["lectures"] = lectures
-                    _udemy["chapters"][counter]["lectures_count"] = len(lectures)
-                elif clazz == "quiz" and counter >= chapter_start-1:
-                    quiz_counter += 1
-                    content_counter += 1
-                    quiz_id = entry.get("id")
-                    if len(_udemy["chapters"]) == 0:
-                        lectures = []
-                        quizzes = []
-                        chapter_index = entry.get("object_index")
-                        chapter_title = "{0:02d} ".format(chapter_index) + self._clean(
-                            entry.get("title")
+                _udemy["chapters"][counter]["lectures"] = lectures
+                _udemy["chapters"][counter]["lectures_count"] = len(lectures)
+            elif clazz == "quiz" and counter >= chapter_start-1:
+                quiz_counter += 1
+                content_counter += 1
+                quiz_id = entry.get("id")
+                if len(_udemy["chapters"]) == 0:
+                    lectures = []
+                    quizzes = []
+                    chapter_index = entry.get("object_index")
+                    chapter_title = "{0:02d} ".format(chapter_index) + self._clean(
+                        entry.get("title")
+                    )
+                    if chapter_title not in _udemy["chapters"]:
+                        # content_counter = 0
+                        _udemy["chapters"].append(
+                            {
+                                "chapter_title": chapter_title,
+                                "chapter_id": quiz_id,
+                                "chapter_index": chapter_index,
+                                "lectures": [],
+                                "quizzes": [],
+                            }
                         )
-                        if chapter_title not in _udemy["chapters"]:
-                            # content_counter = 0
-                            _udemy["chapters"].append(
-                                {
-                                    "chapter_title": chapter_title,
-                                    "chapter_id": quiz_id,
-                                    "chapter_index": chapter_index,
-                                    "lectures": [],
-                                    "quizzes": [],
-                                }
-                            )
-                            counter += 1
+                        counter += 1
+                        yield "chapter", _udemy["chapters"][-1]
 
-                    if quiz_id:
-                        # AQUI HAY QUE DESCARGAR EL JSON DE LOS QUIZZES
-                        last_version_quiz = entry.get("version", 1)
+                if quiz_id:
+                    # AQUI HAY QUE DESCARGAR EL JSON DE LOS QUIZZES
+                    last_version_quiz = entry.get("version", 1)
 
-                        lecture_title = "{0:03d} ".format(content_counter) + f"Quiz {quiz_counter} " + self._clean(entry.get("title"))
+                    lecture_title = "{0:03d} ".format(content_counter) + f"Quiz {quiz_counter} " + self._clean(entry.get("title"))
 
+                    resolved = resolved_quizzes.get(quiz_id)
+                    if resolved is not None:
+                        quiz_res = resolved.result()
+                    else:
                         quiz_res = self._extract_quizzes(url, portal_name, quiz_id, last_version_quiz, course_title)
+                    if "results" not in quiz_res:
+                        # an empty dump would pass for downloaded, fetched again next run.
+                        logger.warning(msg=f"Skipping quiz ({quiz_id}), its questions couldn't be fetched")
+                    else:
                         quizzes.append(
                             {
                                 "index": content_counter,
@@ -979,24 +1213,8 @@ class Udemy:
                                 "questions": quiz_res['results'],
                             }
                         )
-                    _udemy["chapters"][counter]["quizzes"] = quizzes
-                    _udemy["chapters"][counter]["quizzes_count"] = len(quizzes)
-                    # _udemy["chapters"][counter]["lectures"] = lectures
-                    # _udemy["chapters"][counter]["lectures_count"] = len(lectures)
-            _udemy["total_chapters"] = len(_udemy["chapters"])
-            _udemy["total_lectures"] = sum(
-                [
-                    entry.get("lectures_count", 0)
-                    for entry in _udemy["chapters"]
-                    if entry
-                ]
-            )
-            _udemy["total_quizzes"] = sum(
-                [
-                    entry.get("quizzes_count", 0)
-                    for entry in _udemy["chapters"]
-                    if entry
-                ]
-            )
-
-        return _udemy
+                        yield "quiz", quizzes[-1]
+                _udemy["chapters"][counter]["quizzes"] = quizzes
+                _udemy["chapters"][counter]["quizzes_count"] = len(quizzes)
+                # _udemy["chapters"][counter]["lectures"] = lectures
+                # _udemy["chapters"][counter]["lectures_count"] = len(lectures)
@@ -22,18 +22,130 @@ ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
 THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 
 """
+import signal
+import threading
 import subprocess
+from collections import namedtuple
 from udemy.compat import re, time
+from udemy.ratelimit import limiter
 
 # from udemy.logger import logger
 from udemy.progress import progress
 
 
+ProgressEvent = namedtuple(
+    "ProgressEvent", "out_time_us total_size speed bitrate fps frame progress"
+)
+
+
+class ProgressReader(threading.Thread):
+    """
+    Parses the key=value blocks ffmpeg writes with '-progress' in a background
+    thread and publishes each one as a typed ProgressEvent, to `callback` and
+    as `latest`. Consumers sample `latest` at their own rate, so the cost per
+    job doesn't grow with how often ffmpeg reports. The input duration is
+    picked from the log lines sharing the stream.
+    """
+
+    _KEY_VALUE = re.compile(r"^([a-z0-9_]+)=(\S*)$")
+    _DURATION = re.compile(r"Duration: (\d+):(\d{2}):(\d{2})\.\d+")
+
+    def __init__(self, stream, callback=None):
+        super(ProgressReader, self).__init__(daemon=True)
+        self.stream = stream
+        self.callback = callback
+        self.latest = None
+        self.duration = None
+        self.finished = threading.Event()
+
+    @staticmethod
+    def _number(value, cast=int, suffix=""):
+        if value is None:
+            return None
+        try:
+            return cast(value[: -len(suffix)] if suffix and value.endswith(suffix) else value)
+        except (TypeError, ValueError):
+            return None
+
+    def _event(self, block):
+        return ProgressEvent(
+            out_time_us=self._number(block.get("out_time_us")),
+            total_size=self._number(block.get("total_size")),
+            speed=self._number(block.get("speed"), float, "x"),
+            bitrate=self._number(block.get("bitrate"), float, "kbits/s"),
+            fps=self._number(block.get("fps"), float),
+            frame=self._number(block.get("frame")),
+            progress=block.get("progress"),
+        )
+
+    def run(self):
+        block = {}
+        try:
+            for raw in iter(self.stream.readline, b""):
+                line = raw.decode("utf-8", "ignore").strip()
+                mobj = self._KEY_VALUE.match(line)
+                if not mobj:
+                    if self.duration is None:
+                        mobj = self._DURATION.search(line)
+                        if mobj:
+                            hours, mins, secs = map(int, mobj.groups())
+                            self.duration = hours * 3600 + mins * 60 + secs
+                    continue
+                key, value = mobj.groups()
+                block[key] = value
+                if key != "progress":
+                    continue
+                event = self._event(block)
+                block = {}
+                self.latest = event
+                if self.callback:
+                    self.callback(event)
+                if event.progress == "end":
+                    # keep draining, ffmpeg still logs while it closes.
+                    self.finished.set()
+        finally:
+            self.finished.set()
+
+
+def remux(source, filepath):
+    """
+    ffmpeg -i source -c copy -bsf:a aac_adtstoasc -movflags +faststart out.mp4,
+    a local stream copy of an already downloaded HLS stream into an mp4.
+    """
+    command = [
+        "ffmpeg",
+        "-y",
+        "-loglevel",
+        "error",
+        "-i",
+        f"{source}",
+        "-c",
+        "copy",
+        "-bsf:a",
+        "aac_adtstoasc",
+        "-movflags",
+        "+faststart",
+        f"{filepath}",
+    ]
+    try:
+        proc = subprocess.run(
+            command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE
+        )
+    except OSError as error:
+        return {"status": "False", "msg": f"Error: {error}"}
+    if proc.returncode != 0:
+        reason = proc.stderr.decode("utf-8", "ignore").strip().splitlines()
+        return {
+            "status": "False",
+            "msg": "ffmpeg failed to remux: %s" % (reason[-1] if reason else proc.returncode),
+        }
+    return {"status": "True", "msg": "download"}
+
+
 class FFMPeg:
 
-    _PROGRESS_PATTERN = re.compile(
-        r"(frame|fps|total_size|out_time|bitrate|speed|progress)\s*\=\s*(\S+)"
-    )
+    # seconds between two progress samples of the running ffmpeg.
+    PROGRESS_INTERVAL = 0.5
 
     def __init__(
         self, duration, url, token, filepath, quiet=False, callback=lambda *x: None
@@ -66,29 +178,6 @@ class FFMPeg:
         ]
         return command
 
-    def _fetch_total_duration(self, line):
-        duration_in_secs = 0
-        duration_regex = re.compile(r"Duration: (\d{2}):(\d{2}):(\d{2})\.\d{2}")
-        mobj = duration_regex.search(line)
-        if mobj:
-            duration_tuple = mobj.groups()
-            duration_in_secs = (
-                int(duration_tuple[0]) * 60
-                + int(duration_tuple[1]) * 60
-                + int(duration_tuple[2])
-            )
-        else:
-            duration_in_secs = self.duration
-        return duration_in_secs
-
-    def _fetch_current_duration_done(self, time_str):
-        time_str = time_str.split(":")
-        return (
-            int(time_str[0]) * 60
-            + int(time_str[1]) * 60
-            + int(time_str[2].split(".")[0])
-        )
-
     def _prepare_time_str(self, secs):
         (mins, secs) = divmod(secs, 60)
         (hours, mins) = divmod(mins, 60)
@@ -157,89 +246,76 @@ class FFMPeg:
             bar_length=bar_length,
         )
 
-    def _parse_progress(self, line):
-        items = {key: value for key, value in self._PROGRESS_PATTERN.findall(line)}
-        return items
+    def _throttle(self, proc, nbytes):
+        """
+        ffmpeg fetches the playlist itself, so it is stopped while the global
+        rate limiter catches up with the bytes it reported.
+        """
+        if nbytes <= 0 or not limiter.active:
+            return
+        pausable = hasattr(signal, "SIGSTOP")
+        if pausable:
+            proc.send_signal(signal.SIGSTOP)
+        try:
+            limiter.consume(nbytes, consumer=self)
+        finally:
+            if pausable:
+                proc.send_signal(signal.SIGCONT)
+
+    def _sample(self, proc, reader, t0, charged):
+        """draws the latest progress event, returns the bytes charged so far"""
+        event = reader.latest
+        if not event:
+            return charged
+        bytes_done = event.total_size or 0
+        self._throttle(proc, bytes_done - charged)
+        total_time = reader.duration or self.duration
+        if event.progress == "end":
+            secs = total_time
+        else:
+            secs = (event.out_time_us or 0) // 1000000
+        try:
+            self._progress(
+                secs,
+                total_time,
+                bytes_done,
+                event.bitrate or 0,
+                time.time() - t0,
+                fps=event.fps,
+            )
+        except KeyboardInterrupt:
+            raise
+        except Exception:  # pylint: disable=W
+            pass
+        return max(charged, bytes_done)
 
     def download(self):
-        total_time = None
         t0 = time.time()
-        progress_lines = []
-        active = True
         retVal = {}
+        charged = 0
         command = self._command()
-        bytes_done = 0
-        download_speed = 0
-        try:
-            with subprocess.Popen(
-                command, stdout=subprocess.PIPE, stderr=subprocess.PIPE
-            ) as proc:
-                while active:
-                    elapsed = time.time() - t0
-                    try:
-                        line = proc.stderr.readline().decode("utf-8").strip()
-                        if not total_time:
-                            total_time = self._fetch_total_duration(line)
-                        if "progress=end" in line:
-                            try:
-                                self._progress(
-                                    total_time,
-                                    total_time,
-                                    bytes_done,
-                                    download_speed,
-                                    elapsed,
-                                )
-                            except KeyboardInterrupt:
-                                retVal = {
-                                    "status": "False",
-                                    "msg": "Error: KeyboardInterrupt",
-                                }
-                                raise KeyboardInterrupt
-                            except Exception as err:
-                                {"status": "False", "msg": f"Error: {err}"}
-                            active = False
-                            retVal = {"status": "True", "msg": "download"}
-                            break
-                        if "progress" not in line:
-                            progress_lines.append(line)
-                        else:
-                            lines = "\n".join(progress_lines)
-                            items = self._parse_progress(lines)
-                            if items:
-                                secs = self._fetch_current_duration_done(
-                                    items.get("out_time")
-                                )
-                                _tsize = (
-                                    items.get("total_size").lower().replace("kb", "")
-                                )
-                                _brate = (
-                                    items.get("bitrate").lower().replace("kbits/s", "")
-                                )
-                                fps = items.get("fps")
-                                bytes_done = float(_tsize) if _tsize != "n/a" else 0
-                                download_speed = float(_brate) if _brate != "n/a" else 0
-                                try:
-                                    self._progress(
-                                        secs,
-                                        total_time,
-                                        bytes_done,
-                                        download_speed,
-                                        elapsed,
-                                        fps=fps,
-                                    )
-                                except KeyboardInterrupt:
-                                    retVal = {
-                                        "status": "False",
-                                        "msg": "Error: KeyboardInterrupt",
-                                    }
-                                    raise KeyboardInterrupt
-                                except Exception as err:
-                                    {"status": "False", "msg": f"Error: {err}"}
-                            progress_lines = []
-                    except KeyboardInterrupt:
-                        active = False
-                        retVal = {"status": "False", "msg": "Error: KeyboardInterrupt"}
-                        raise KeyboardInterrupt
-        except KeyboardInterrupt:
-            raise KeyboardInterrupt
+        with subprocess.Popen(
+            command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE
+        ) as proc:
+            reader = ProgressReader(proc.stderr)
+            reader.start()
+            try:
+                while True:
+                    finished = reader.finished.wait(self.PROGRESS_INTERVAL)
+                    charged = self._sample(proc, reader, t0, charged)
+                    if finished:
+                        break
+                proc.wait()
+            except KeyboardInterrupt:
+                proc.kill()
+                raise KeyboardInterrupt
+            reader.join()
+        event = reader.latest
+        if event and event.progress == "end" and proc.returncode == 0:
+            retVal = {"status": "True", "msg": "download"}
+        else:
+            retVal = {
+                "status": "False",
+                "msg": "ffmpeg exited with code %s" % (proc.returncode),
+            }
         return retVal
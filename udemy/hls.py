@@ -0,0 +1,443 @@
+# pylint: disable=R,C,W
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+
+Author  : Nasir Khan (r0ot h3x49)
+Github  : https://github.com/r0oth3x49
+License : MIT
+
+
+Copyright (c) 2018-2025 Nasir Khan (r0ot h3x49)
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), to deal in the
+Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, 
+and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR
+ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH 
+THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""
+
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from udemy.compat import os, re, sys, time, json, m3u8, HEADERS
+from udemy.decryptor.mp4parse import F4VParser
+from udemy.ffmpeg import remux
+from udemy.postprocess import postprocessor
+from udemy.retry import retry_policy, HTTPStatusError, IncompleteTransferError
+from udemy.segmented import ReceiveBuffer, PROGRESS_INTERVAL
+
+
+class SegmentStore(object):
+    """
+    Checkpoint directory of an HLS download ('<file>.segments.d'), one file
+    per completed segment named after its media sequence number and an
+    'index.json' of their byte lengths, a restart only fetches what is missing.
+    """
+
+    def __init__(self, filepath, interval=1.0):
+        self.dirpath = filepath + ".segments.d"
+        self.index_filepath = os.path.join(self.dirpath, "index.json")
+        self.interval = interval
+        self.count = 0
+        self.lengths = {}
+
+        self._lock = threading.Lock()
+        self._saved_at = 0
+
+    def path(self, key):
+        name = key if isinstance(key, str) else "%08d" % key
+        return os.path.join(self.dirpath, name + ".seg")
+
+    def _is_valid(self, key, length):
+        path = self.path(key)
+        return os.path.isfile(path) and os.path.getsize(path) == length
+
+    def load(self, count):
+        """keeps the segments of a previous run of the same playlist"""
+        try:
+            with open(self.index_filepath) as fd:
+                data = json.load(fd)
+            if int(data["count"]) != count:
+                raise ValueError("playlist changed")
+            lengths = {k: int(v) for k, v in data["lengths"].items()}
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            self.reset(count)
+            return 0
+        self.count = count
+        self.lengths = {
+            k: v
+            for k, v in lengths.items()
+            if self._is_valid(k if k == "init" else int(k), v)
+        }
+        return len(self.lengths)
+
+    def reset(self, count):
+        self.remove()
+        os.makedirs(self.dirpath)
+        self.count = count
+        self.lengths = {}
+
+    def is_done(self, key):
+        return str(key) in self.lengths
+
+    @property
+    def bytesdone(self):
+        return sum(self.lengths.values())
+
+    def commit(self, key, temp_path):
+        """moves a fully received segment into place and records it"""
+        length = os.path.getsize(temp_path)
+        os.replace(temp_path, self.path(key))
+        with self._lock:
+            self.lengths[str(key)] = length
+        self.save()
+
+    def save(self, force=False):
+        now = time.time()
+        if not force and now - self._saved_at < self.interval:
+            return
+        with self._lock:
+            self._saved_at = now
+            data = {"count": self.count, "lengths": dict(self.lengths)}
+            temp = self.index_filepath + ".tmp"
+            with open(temp, "w") as fd:
+                json.dump(data, fd)
+            os.replace(temp, self.index_filepath)
+
+    def _copy(self, src, dst, length):
+        """
+        appends `length` bytes of `src` to `dst` inside the kernel where
+        copy_file_range or sendfile allow it, read/write otherwise.
+        """
+        copied = 0
+        for name in ("copy_file_range", "sendfile"):
+            if not hasattr(os, name):
+                continue
+            try:
+                while copied < length:
+                    if name == "copy_file_range":
+                        sent = os.copy_file_range(src, dst, length - copied)
+                    else:
+                        sent = os.sendfile(dst, src, None, length - copied)
+                    if not sent:
+                        break
+                    copied += sent
+                return copied
+            except OSError:
+                # e.g. EXDEV/ENOSYS/EINVAL, try the next way from where we are.
+                continue
+        while copied < length:
+            data = os.read(src, min(length - copied, 1048576))
+            if not data:
+                break
+            os.write(dst, data)
+            copied += len(data)
+        return copied
+
+    def assemble(self, keys, filepath):
+        """joins the segments into `filepath` in the given order"""
+        flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+        dst = os.open(filepath, flags, 0o644)
+        try:
+            for key in keys:
+                path = self.path(key)
+                src = os.open(path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+                try:
+                    length = os.fstat(src).st_size
+                    if self._copy(src, dst, length) != length:
+                        raise IOError("short copy of segment '%s'" % path)
+                finally:
+                    os.close(src)
+        finally:
+            os.close(dst)
+
+    def remove(self):
+        shutil.rmtree(self.dirpath, ignore_errors=True)
+
+
+class HLSDownload(object):
+    """
+    Downloads an HLS stream natively, the media playlist is parsed with m3u8
+    and its segments are fetched concurrently within a bounded window into a
+    SegmentStore. Once every segment is there they are joined in playlist
+    order, fragmented mp4 straight into the output and MPEG-TS into a staging
+    file that a single local ffmpeg run remuxes.
+    """
+
+    _CONTENT_RANGE = re.compile(r"bytes\s+(\d+)-(\d+)/(\d+|\*)")
+    _STATUS_STRING = (
+        "  {:,} Bytes [{:.2%}] received. Rate: [{:4.0f} "
+        "KB/s].  ETA: [{:.0f} secs]"
+    )
+
+    def __init__(
+        self,
+        session,
+        url,
+        token,
+        filepath,
+        window=8,
+        quiet=False,
+        callback=lambda *x: None,
+        name=None,
+    ):
+        self._sess = session
+        self.url = url
+        self.token = token
+        self.filepath = filepath
+        self.window = window
+        self.quiet = quiet
+        self.callback = callback
+        self.name = name
+
+        self.staging_filepath = filepath + ".segments"
+        self.store = SegmentStore(filepath)
+        self.init_section = None
+        self.segments = []
+        self.completed = False
+        self.pending = None
+
+        self._lock = threading.Lock()
+        self._t0 = None
+        self._reported_at = 0
+        self._bytesdone = 0
+        self._done = 0
+
+    def _headers(self, start=None, end=None):
+        headers = {"User-Agent": HEADERS.get("User-Agent"), "Accept-Encoding": None}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        if start is not None:
+            headers["Range"] = "bytes={}-{}".format(start, end)
+        return headers
+
+    def _get_playlist(self, url):
+        resp = retry_policy.call(self._sess.get, url, headers=self._headers(), timeout=10)
+        if not resp.ok:
+            raise HTTPStatusError(resp)
+        return m3u8.loads(resp.text, uri=resp.url)
+
+    def _ranges(self, segments):
+        """(uri, start, end) per segment, EXT-X-BYTERANGE offsets carry over"""
+        ranges, offsets = [], {}
+        for segment in segments:
+            uri = segment.absolute_uri
+            if not segment.byterange:
+                ranges.append((uri, None, None))
+                continue
+            length, _, offset = segment.byterange.partition("@")
+            start = int(offset) if offset else offsets.get(uri, 0)
+            end = start + int(length) - 1
+            offsets[uri] = end + 1
+            ranges.append((uri, start, end))
+        return ranges
+
+    def load(self):
+        """
+        fetches the playlist, False when it can't be downloaded natively
+        (encrypted segments are left to ffmpeg).
+        """
+        try:
+            playlist = self._get_playlist(self.url)
+            if playlist.is_variant:
+                best = max(
+                    playlist.playlists,
+                    key=lambda p: p.stream_info.bandwidth or 0,
+                )
+                playlist = self._get_playlist(best.absolute_uri)
+        except Exception:  # pylint: disable=W
+            return False
+        if not playlist.segments:
+            return False
+        if any(key and key.method and key.method != "NONE" for key in playlist.keys):
+            return False
+        init = playlist.segments[0].init_section
+        if init:
+            self.init_section = self._ranges([init])[0]
+        sequence = playlist.media_sequence or 0
+        self.segments = [
+            (sequence + i, segment)
+            for i, segment in enumerate(self._ranges(playlist.segments))
+        ]
+        return True
+
+    @property
+    def keys(self):
+        """store keys in playlist order, the init section first"""
+        keys = [key for key, _ in self.segments]
+        if self.init_section:
+            keys.insert(0, "init")
+        return keys
+
+    def _boxes(self, key, limit=4):
+        try:
+            headers = F4VParser.parse(filename=self.store.path(key), headers_only=True)
+            return [header.box_type for _, header in zip(range(limit), headers)]
+        except Exception:  # pylint: disable=W
+            return []
+
+    def is_fmp4(self):
+        """
+        fragmented mp4 renditions (an EXT-X-MAP init section holding ftyp and
+        moov, media segments made of moof/mdat) can be joined byte for byte.
+        """
+        if not self.init_section or not self.segments:
+            return False
+        init = self._boxes("init")
+        if "ftyp" not in init or "moov" not in init:
+            return False
+        first = self._boxes(self.segments[0][0], limit=1)
+        return bool(first) and first[0] in ("styp", "sidx", "prft", "emsg", "moof")
+
+    def _check_range(self, resp, start, end):
+        """
+        a server ignoring Range answers 200 with the whole resource, which
+        would be stored as the EXT-X-BYTERANGE segment.
+        """
+        mobj = self._CONTENT_RANGE.search(resp.headers.get("Content-Range", ""))
+        if (
+            resp.status_code != 206
+            or not mobj
+            or (int(mobj.group(1)), int(mobj.group(2))) != (start, end)
+        ):
+            raise HTTPStatusError(
+                resp,
+                "Udemy returned HTTP Code %s: %s (Content-Range '%s') for range %s-%s"
+                % (
+                    resp.status_code,
+                    resp.reason,
+                    resp.headers.get("Content-Range", ""),
+                    start,
+                    end,
+                ),
+            )
+
+    def _fetch(self, key, segment):
+        uri, start, end = segment
+        temp_path = self.store.path(key) + ".tmp"
+        resp = self._sess.get(
+            uri, headers=self._headers(start, end), stream=True, timeout=10
+        )
+        received = 0
+        try:
+            if resp.status_code not in (200, 206):
+                raise HTTPStatusError(resp)
+            if start is not None:
+                self._check_range(resp, start, end)
+            expected = int(resp.headers.get("Content-Length", 0))
+            with open(temp_path, "wb") as media_file:
+                for block in ReceiveBuffer().blocks(resp.raw, consumer=self):
+                    media_file.write(block)
+                    received += len(block)
+                    self._report(len(block))
+            if expected and received != expected:
+                raise IncompleteTransferError(
+                    "incomplete segment %s, received %s of %s byte(s)"
+                    % (key, received, expected)
+                )
+        except BaseException:
+            # a retry starts the segment over, take its bytes back.
+            self._report(-received)
+            raise
+        finally:
+            resp.close()
+        self.store.commit(key, temp_path)
+        self._report(0, segment_done=True)
+        return received
+
+    def _report(self, received, segment_done=False):
+        with self._lock:
+            self._bytesdone += received
+            if segment_done:
+                self._done += 1
+            now = time.time()
+            finished = self._done == self.store.count
+            if now - self._reported_at < PROGRESS_INTERVAL and not finished:
+                return
+            self._reported_at = now
+            bytesdone, done = self._bytesdone, self._done
+        fraction = max(done, 1) / float(self.store.count)
+        # the size of the remaining segments is only known once fetched.
+        total = int(bytesdone / fraction) if bytesdone else 0
+        elapsed = now - self._t0
+        rate = (bytesdone / 1024.0) / elapsed if elapsed else 0
+        eta = (total - bytesdone) / (rate * 1024.0) if rate else 0
+        progress_stats = (bytesdone, done / float(self.store.count), rate, eta)
+        if not self.quiet:
+            status = self._STATUS_STRING.format(*progress_stats)
+            sys.stdout.write("\r" + status + " " * 4 + "\r")
+            sys.stdout.flush()
+        if self.callback:
+            self.callback(total, *progress_stats)
+
+    def _fetch_missing(self):
+        self._t0 = time.time()
+        self._done = self.store.load(len(self.keys))
+        self._bytesdone = self.store.bytesdone
+        entries = list(self.segments)
+        if self.init_section:
+            entries.insert(0, ("init", self.init_section))
+        pending = [(k, s) for k, s in entries if not self.store.is_done(k)]
+        if not pending:
+            return
+        with ThreadPoolExecutor(max_workers=self.window) as executor:
+            futures = [
+                executor.submit(retry_policy.call, self._fetch, key, segment)
+                for key, segment in pending
+            ]
+            try:
+                for future in futures:
+                    future.result()
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+
+    def _remuxed(self, retVal, finalize=None):
+        if os.path.isfile(self.staging_filepath):
+            os.unlink(self.staging_filepath)
+        if retVal.get("status") == "True":
+            self.completed = True
+            self.store.remove()
+        return finalize(retVal) if finalize else retVal
+
+    def download(self, finalize=None):
+        """
+        fetches what is missing and builds the output, MPEG-TS remuxes are
+        queued on the post-processing stage and tracked by `pending`, a future
+        of `finalize(retVal)`.
+        """
+        try:
+            self._fetch_missing()
+        except KeyboardInterrupt as error:
+            self.store.save(force=True)
+            raise error
+        except Exception as error:  # pylint: disable=W
+            self.store.save(force=True)
+            return {"status": "False", "msg": "Reason : {}".format(str(error))}
+        self.store.save(force=True)
+        # the output is only built from a complete set of segments.
+        if self.is_fmp4():
+            self.store.assemble(self.keys, self.filepath)
+            return self._remuxed({"status": "True", "msg": "download"}, finalize)
+        # MPEG-TS needs its streams copied into an mp4 container.
+        self.store.assemble(self.keys, self.staging_filepath)
+        staged = self.store.bytesdone + os.path.getsize(self.staging_filepath)
+        self.pending = postprocessor.submit(
+            remux,
+            self.staging_filepath,
+            self.filepath,
+            staged=staged,
+            finalize=lambda retVal: self._remuxed(retVal, finalize),
+            name=self.name,
+        )
+        return {"status": "True", "msg": "postprocessing"}
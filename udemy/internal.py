@@ -23,12 +23,10 @@ ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
 THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 
 """
-from typing import List
-
-from udemy.auxiliar.decrypt_all_sources import clean_title
-from udemy.compat import time, sys
+from udemy.compat import sys
 from udemy.extract import Udemy
 from udemy.logger import logger
+from udemy.paths import clean_title
 from udemy.shared import (
     UdemyCourse,
     UdemyCourses,
@@ -40,8 +38,51 @@ from udemy.shared import (
 )
 
 
+def _compact(entries, fields):
+    """
+    keeps only `fields` of every entry as a tuple, the short values repeated
+    across a course (types, extensions, languages, sizes) are interned.
+    """
+    compacted = []
+    for entry in entries or ():
+        values = []
+        for name, default, shared in fields:
+            value = entry.get(name, default)
+            if shared and type(value) is str:
+                value = sys.intern(value)
+            values.append(value)
+        compacted.append(tuple(values))
+    return tuple(compacted)
+
+
+_STREAM_FIELDS = (
+    ("type", None, True),
+    ("extension", None, True),
+    ("height", "0", True),
+    ("width", "0", True),
+    ("download_url", None, False),
+)
+_ENCRYPTED_STREAM_FIELDS = _STREAM_FIELDS + (("format_id", None, True),)
+_ASSET_FIELDS = (
+    ("type", None, True),
+    ("extension", None, True),
+    ("title", "", False),
+    ("filename", None, False),
+    ("download_url", None, False),
+    ("id", None, False),
+)
+_SUBTITLE_FIELDS = (
+    ("type", None, True),
+    ("extension", None, True),
+    ("language", None, True),
+    ("download_url", None, False),
+)
+
+
 class InternUdemyCourses(UdemyCourses, Udemy):
     def __init__(self, *args, **kwargs):
+        # UdemyCourses doesn't chain up, the extractor state is set here.
+        Udemy.__init__(self)
         super(InternUdemyCourses, self).__init__(*args, **kwargs)
 
     def _fetch_course(self):
@@ -54,7 +95,6 @@ class InternUdemyCourses(UdemyCourses, Udemy):
             logger.info(msg="Logged in successfully.", new_line=True)
             logger.info(msg="Fetching all enrolled course(s) url(s)..")
             self._courses = self._extract_subscribed_courses()
-            time.sleep(1)
             logger.success(msg="Fetching all enrolled course(s) url(s).. ")
             self._logout()
         if auth.get("login") == "failed":
@@ -65,6 +105,9 @@ class InternUdemyCourses(UdemyCourses, Udemy):
 class InternUdemyCourse(UdemyCourse, Udemy):
     def __init__(self, *args, **kwargs):
         self._info = ""
+        Udemy.__init__(self)
+        self._records = None
+        self._partial = None
         super(InternUdemyCourse, self).__init__(*args, **kwargs)
 
     def _fetch_course(self):
@@ -82,38 +125,75 @@ class InternUdemyCourse(UdemyCourse, Udemy):
         if auth.get("login") == "successful":
             logger.info(msg="Logged in successfully.", new_line=True)
             logger.info(msg="Downloading course information ..")
-            self._info = self._real_extract(
-                self._url, skip_hls_stream=self._skip_hls_stream, chapter_start=self._chapter_start
+            # chapters are built while the rest of the course is extracted.
+            self._records = self._iter_extract(
+                self._url,
+                skip_hls_stream=self._skip_hls_stream,
+                chapter_start=self._chapter_start,
+                refresh=self._refresh,
             )
-            time.sleep(1)
+            _, self._info = next(self._records)
             logger.success(msg="Downloaded course information .. ")
-            access_token = self._info["access_token"]
             self._id = self._info["course_id"]
             self._title = self._info["course_title"]
-            self._chapters_count = self._info["total_chapters"]
-            self._total_lectures = self._info["total_lectures"]
-            self._total_quizzes = self._info["total_quizzes"]
-            self._chapters = [
-                InternUdemyChapter(z, access_token=access_token)
-                for z in self._info["chapters"]
-            ]
-            logger.info(
-                msg="Trying to logout now...",
-                new_line=True,
-            )
-            if not self._cookies:
-                self._logout()
-            logger.info(
-                msg="Logged out successfully.",
-                new_line=True,
-            )
+            self._update_totals()
             self._have_basic = True
         if auth.get("login") == "failed":
             logger.error(msg="Failed to login ..\n")
             sys.exit(0)
 
+    def _update_totals(self):
+        self._chapters_count = self._info["total_chapters"]
+        self._total_lectures = self._info["total_lectures"]
+        self._total_quizzes = self._info["total_quizzes"]
+
+    def _next_chapter(self):
+        """pulls records until the chapter being extracted is complete"""
+        while self._records is not None:
+            try:
+                kind, record = next(self._records)
+            except StopIteration:
+                self._records = None
+                chapter, self._partial = self._partial, None
+                if chapter:
+                    self._chapters.append(chapter)
+                    self._index_chapter(chapter)
+                self._finish()
+                return chapter
+            if kind == "chapter":
+                chapter = self._partial
+                self._partial = InternUdemyChapter(
+                    record, access_token=self._info["access_token"]
+                )
+                if chapter:
+                    self._chapters.append(chapter)
+                    self._index_chapter(chapter)
+                    return chapter
+            elif kind == "lecture":
+                self._partial._add_lecture(record)
+            elif kind == "quiz":
+                self._partial._add_quiz(record)
+        return None
+
+    def _finish(self):
+        self._update_totals()
+        # every chapter is built, the raw curriculum is not needed anymore.
+        self._info.pop("chapters", None)
+        logger.info(
+            msg="Trying to logout now...",
+            new_line=True,
+        )
+        if not self._cookies:
+            self._logout()
+        logger.info(
+            msg="Logged out successfully.",
+            new_line=True,
+        )
+
 
 class InternUdemyChapter(UdemyChapters):
+    __slots__ = ("_access_token",)
+
     def __init__(self, chapter, access_token=None):
         super(InternUdemyChapter, self).__init__()
 
@@ -140,24 +220,40 @@ class InternUdemyChapter(UdemyChapters):
             if self._question_count > 0
             else []
         )
+        self._access_token = access_token
+
+    def _add_lecture(self, lecture):
+        self._lectures.append(InternUdemyLecture(lecture, access_token=self._access_token))
+        self._lectures_count = len(self._lectures)
+
+    def _add_quiz(self, quiz):
+        self._quizzes.append(InternUdemyQuiz(quiz, access_token=self._access_token))
+        self._question_count = len(self._quizzes)
 
 
 class InternUdemyLecture(UdemyLectures):
+    __slots__ = (
+        "_access_token",
+        "_sources",
+        "_video_sources",
+        "_asset_sources",
+        "_subtitle_sources",
+    )
+
     def __init__(self, lectures, access_token=None):
         super(InternUdemyLecture, self).__init__()
         self._access_token = access_token
-        self._info = lectures
-
-        self._lecture_id = self._info["lectures_id"]
-        self._lecture_title = clean_title(self._info["lecture_title"])
-        self._lecture_index = self._info["lecture_index"]
-
-        self._subtitles_count = self._info.get("subtitle_count", 0)
-        self._sources_count = self._info.get("sources_count", 0)
-        self._assets_count = self._info.get("assets_count", 0)
-        self._extension = self._info.get("extension")
-        self._html_content = self._info.get("html_content")
-        self._duration = self._info.get("duration")
+
+        self._lecture_id = lectures["lectures_id"]
+        self._lecture_title = clean_title(lectures["lecture_title"])
+        self._lecture_index = lectures["lecture_index"]
+
+        self._subtitles_count = lectures.get("subtitle_count", 0)
+        self._sources_count = lectures.get("sources_count", 0)
+        self._assets_count = lectures.get("assets_count", 0)
+        self._extension = lectures.get("extension")
+        self._html_content = lectures.get("html_content")
+        self._duration = lectures.get("duration")
         if self._duration:
             duration = int(self._duration)
             (mins, secs) = divmod(duration, 60)
@@ -167,132 +263,147 @@ class InternUdemyLecture(UdemyLectures):
             else:
                 self._duration = "%02d:%02d:%02d" % (hours, mins, secs)
 
-        self._is_encrypted = self._info.get("is_encrypted", False)
-        self._asset_id = self._info.get("asset_id", None)
+        self._is_encrypted = lectures.get("is_encrypted", False)
+        self._asset_id = lectures.get("asset_id", None)
 
-    def _process_encrypted_sources(self):
-        _sources = self._info.get("video_sources", [])
-        encrypt_streams = (
-            [InternUdemyLectureEncryptStreams(z, self) for z in _sources]
-            if len(_sources) > 0
-            else []
+        # objects are only built when accessed, until then the fields they
+        # need are kept instead of the extracted lecture.
+        self._sources = (
+            _compact(lectures.get("sources"), _STREAM_FIELDS)
+            if self._sources_count > 0
+            else ()
+        )
+        self._video_sources = _compact(
+            lectures.get("video_sources"), _ENCRYPTED_STREAM_FIELDS
+        )
+        self._asset_sources = (
+            _compact(lectures.get("assets"), _ASSET_FIELDS)
+            if self._assets_count > 0
+            else ()
         )
-        self._encrypt_streams = encrypt_streams
+        self._subtitle_sources = (
+            _compact(lectures.get("subtitles"), _SUBTITLE_FIELDS)
+            if self._subtitles_count > 0
+            else ()
+        )
+
+    def _process_encrypted_sources(self):
+        self._encrypt_streams = [
+            InternUdemyLectureEncryptStreams(z, self) for z in self._video_sources
+        ]
         # self._streams = sorted(streams, key=lambda k: k.quality)
         # self._streams = sorted(self._streams, key=lambda k: k.mediatype)
 
     def _process_streams(self):
-        streams = (
-            [InternUdemyLectureStream(z, self) for z in self._info["sources"]]
-            if self._sources_count > 0
-            else []
-        )
+        streams = [InternUdemyLectureStream(z, self) for z in self._sources]
         self._streams = sorted(streams, key=lambda k: k.quality)
         self._streams = sorted(self._streams, key=lambda k: k.mediatype)
 
     def _process_assets(self):
-        assets = (
-            [InternUdemyLectureAssets(z, self) for z in self._info["assets"]]
-            if self._assets_count > 0
-            else []
-        )
-        self._assets = assets
+        self._assets = [InternUdemyLectureAssets(z, self) for z in self._asset_sources]
 
     def _process_subtitles(self):
-        subtitles = (
-            [InternUdemyLectureSubtitles(z, self) for z in self._info["subtitles"]]
-            if self._subtitles_count > 0
-            else []
-        )
-        self._subtitles = subtitles
+        self._subtitles = [
+            InternUdemyLectureSubtitles(z, self) for z in self._subtitle_sources
+        ]
 
 
 class InternUdemyLectureEncryptStreams(UdemyLectureEncryptStreams):
+    __slots__ = ()
+
     def __init__(self, sources, parent):
         super(InternUdemyLectureEncryptStreams, self).__init__(parent)
-        self._mediatype = sources.get("type")
-        self._extension = sources.get("extension")
-        self._format_id = sources.get("format_id")
+        mediatype, extension, height, width, url, format_id = sources
+        self._mediatype = mediatype
+        self._extension = extension
+        self._format_id = format_id
         self._token = parent._access_token
-        height = sources.get("height", "0")
-        width = sources.get("width", "0")
         self._resolution = "%sx%s" % (width, height)
         self._dimension = width, height
         self._quality = int(height)
         self._is_hls = "hls" in self._mediatype
-        self._url = sources.get("download_url")
+        self._url = url
 
 
 class InternUdemyLectureStream(UdemyLectureStream):
+    __slots__ = ()
+
     def __init__(self, sources, parent):
         super(InternUdemyLectureStream, self).__init__(parent)
-
-        self._mediatype = sources.get("type")
-        self._extension = sources.get("extension")
+        mediatype, extension, height, width, url = sources
+        self._mediatype = mediatype
+        self._extension = extension
         self._token = parent._access_token
-        height = sources.get("height", "0")
-        width = sources.get("width", "0")
         self._resolution = "%sx%s" % (width, height)
         self._dimension = width, height
         self._quality = int(height)
         self._is_hls = "hls" in self._mediatype
-        self._url = sources.get("download_url")
+        self._url = url
+        self._asset_id = parent._asset_id
 
 
 class InternUdemyLectureAssets(UdemyLectureAssets):
+    __slots__ = ()
+
     def __init__(self, assets, parent):
         super(InternUdemyLectureAssets, self).__init__(parent)
-
-        self._mediatype = assets.get("type")
-        self._extension = assets.get("extension")
-        title = clean_title(assets.get("title", ""))
+        mediatype, extension, title, filename, url, asset_id = assets
+        self._mediatype = mediatype
+        self._extension = extension
+        title = clean_title(title)
         if not title:
-            title = assets.get("filename")
+            title = filename
         if title and title.endswith(self._extension):
             ok = "{0:03d} ".format(parent._lecture_index) + title
             self._filename = ok
         else:
-            ok = "{0:03d} ".format(parent._lecture_index) + assets.get("filename")
+            ok = "{0:03d} ".format(parent._lecture_index) + filename
             self._filename = ok
-        self._url = assets.get("download_url")
+        self._url = url
+        self._asset_id = asset_id
 
 
 class InternUdemyLectureSubtitles(UdemyLectureSubtitles):
+    __slots__ = ()
+
     def __init__(self, subtitles, parent):
         super(InternUdemyLectureSubtitles, self).__init__(parent)
-
-        self._mediatype = subtitles.get("type")
-        self._extension = subtitles.get("extension")
-        self._language = subtitles.get("language")
-        self._url = subtitles.get("download_url")
+        mediatype, extension, language, url = subtitles
+        self._mediatype = mediatype
+        self._extension = extension
+        self._language = language
+        self._url = url
 
 
 class InternUdemyQuiz(UdemyQuizzes):
+    __slots__ = ("_access_token", "_question_sources")
+
     def __init__(self, quizzes, access_token=None):
         super(InternUdemyQuiz, self).__init__()
         self._access_token = access_token
-        self._info = quizzes
 
-        self._quiz_id = self._info["quiz_id"]
-        self._quiz_title = clean_title(self._info["quiz_title"])
-        self._question_count = self._info.get("quizzes_count", 0)
+        self._quiz_id = quizzes["quiz_id"]
+        self._quiz_title = clean_title(quizzes["quiz_title"])
+        self._question_count = quizzes.get("quizzes_count", 0)
+        self._question_sources = quizzes.get("questions", []) if self._question_count > 0 else []
 
     def _process_questions(self):
-        questions = (
-            [InternUdemyQuizQuestion(self._info["questions"][i], i, self) for i in range(len(self._info["questions"]))]
-            if self._question_count > 0
-            else []
-        )
+        questions = [
+            InternUdemyQuizQuestion(question, i, self)
+            for i, question in enumerate(self._question_sources)
+        ]
         self._questions = questions
 
 
 class InternUdemyQuizQuestion(UdemyQuizQuestion):
     LETTERS = ["a", "b", "c", "d", "e", "f", "g"]
 
+    __slots__ = ("_related_ids",)
+
     def __init__(self, question, index, parent):
         super(InternUdemyQuizQuestion, self).__init__(parent)
         self._index = index
-        self._question = question
+        self._related_ids = [x["id"] for x in question.get("related_lectures", [])]
 
         self._class = question.get("_class")
         self._id = question.get("id")
@@ -306,19 +417,11 @@ class InternUdemyQuizQuestion(UdemyQuizQuestion):
         self._section = question.get("section")
         self._question_plain = question.get("question_plain")
 
-    def _process_related_lectures(self, lectures: List[UdemyLectures]):
-        rel_lectures = []
-        pending_lectures = self._question.get("related_lectures", [])
-        for lec in lectures:
-            if pending_lectures:
-                _rel = pending_lectures[0]
-                found = False
-                for _rel in pending_lectures:
-                    if _rel['id'] == lec.id:
-                        rel_lectures.append(lec)
-                        found = True
-                        break
-                if found:
-                    pending_lectures.remove(_rel)
-        self._related_lectures = rel_lectures
-        return self._related_lectures
+    def _process_related_lectures(self, lecture_index):
+        # course order, every lecture once, like the related lectures were listed.
+        related = sorted(
+            lecture_index[lecture_id]
+            for lecture_id in set(self._related_ids)
+            if lecture_id in lecture_index
+        )
+        return [lecture for _, lecture in related]
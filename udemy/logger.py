@@ -23,7 +23,6 @@ THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 
 """
 
-import sys
 import logging
 from udemy.compat import os, re
 from colorama import init, Fore, Style
@@ -111,15 +110,13 @@ class Logging(ProgressBar):
                 + set_color(")\r\n", level=70)
             )
             string = prefix + msg
-            sys.stdout.write(string)
-            sys.stdout.flush()
+            self._write(string)
         else:
             if not new_line:
                 # log.info(f"{msg}")
                 msg = set_color(f"{msg}\r", level=cc_msg if cc_msg else 70)
                 string = prefix + msg
-                sys.stdout.write(string)
-                sys.stdout.flush()
+                self._write(string)
             if new_line:
                 if post_msg and cc_pmsg:
                     # log.info(f"{msg}{post_msg}")
@@ -132,8 +129,7 @@ class Logging(ProgressBar):
                 string = prefix + msg
                 if before:
                     string = "\r\n" + string
-                sys.stdout.write(string)
-                sys.stdout.flush()
+                self._write(string)
 
     def progress(self, msg):
         prefix = (
@@ -169,8 +165,7 @@ class Logging(ProgressBar):
         if course:
             msg = set_color("Course ", level=70) + set_color(f"'{msg}'\r\n", level=55)
             string = prefix + msg
-            sys.stdout.write(string)
-            sys.stdout.flush()
+            self._write(string)
         if not course:
             msg = (
                 set_color(f"{msg} (", level=70)
@@ -178,8 +173,7 @@ class Logging(ProgressBar):
                 + set_color(")\r\n", level=70)
             )
             string = prefix + msg
-            sys.stdout.write(string)
-            sys.stdout.flush()
+            self._write(string)
 
     def failed(self, msg):
         """This function prints already downloaded msg"""
@@ -203,8 +197,7 @@ class Logging(ProgressBar):
             + set_color(")\r\n", level=70)
         )
         string = prefix + msg
-        sys.stdout.write(string)
-        sys.stdout.flush()
+        self._write(string)
 
     def warning(self, msg, silent=False):
         """This function prints already downloaded msg"""
@@ -225,8 +218,7 @@ class Logging(ProgressBar):
         msg = set_color(f"{msg}\n", level=10)
         string = prefix + msg
         if not silent:
-            sys.stdout.write(string)
-            sys.stdout.flush()
+            self._write(string)
 
     def error(self, msg, new_line=False):
         """This function prints already downloaded msg"""
@@ -247,13 +239,11 @@ class Logging(ProgressBar):
         if not new_line:
             msg = set_color(f"{msg}\n", level=40)
             string = prefix + msg
-            sys.stdout.write(string)
-            sys.stdout.flush()
+            self._write(string)
         if new_line:
             msg = set_color(f"{msg}\n", level=40)
             string = "\n" + prefix + msg
-            sys.stdout.write(string)
-            sys.stdout.flush()
+            self._write(string)
 
     def already_downloaded(self, msg):
         """This function prints already downloaded msg"""
@@ -275,8 +265,7 @@ class Logging(ProgressBar):
             + set_color(")\r\n", level=70)
         )
         string = prefix + msg
-        sys.stdout.write(string)
-        sys.stdout.flush()
+        self._write(string)
 
     def download_skipped(self, msg, reason=""):
         """This function prints already downloaded msg"""
@@ -300,8 +289,7 @@ class Logging(ProgressBar):
             + set_color(")\r\n", level=70)
         )
         string = prefix + msg
-        sys.stdout.write(string)
-        sys.stdout.flush()
+        self._write(string)
         if reason:
             self.error(msg=reason, new_line=True)
 
@@ -0,0 +1,138 @@
+# pylint: disable=R,C,W
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+
+Author  : Nasir Khan (r0ot h3x49)
+Github  : https://github.com/r0oth3x49
+License : MIT
+
+
+Copyright (c) 2018-2025 Nasir Khan (r0ot h3x49)
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), to deal in the
+Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, 
+and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR
+ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH 
+THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""
+
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from udemy.compat import os, json
+
+
+HASH_NAME = "sha256"
+BLOCKSIZE = 4194304
+
+
+def new_hash():
+    return hashlib.new(HASH_NAME)
+
+
+def hash_file(filepath, digest=None, blocksize=BLOCKSIZE):
+    """feeds the file to `digest` (a new one by default) with large sequential reads"""
+    digest = digest or new_hash()
+    view = memoryview(bytearray(blocksize))
+    with open(filepath, "rb", buffering=0) as fd:
+        while True:
+            received = fd.readinto(view)
+            if not received:
+                break
+            digest.update(view[:received])
+    return digest
+
+
+class Manifest(object):
+    """
+    'manifest.json' of a course, the size, hash, source ids and mtime of every
+    file downloaded keyed by its path relative to the course directory.
+    """
+
+    def __init__(self, course_path, filename="manifest.json"):
+        self.course_path = course_path
+        self.filepath = os.path.join(course_path, filename)
+        self.files = {}
+        self._lock = threading.Lock()
+
+    def load(self):
+        try:
+            with open(self.filepath, encoding="utf-8") as fd:
+                data = json.load(fd)
+            self.files = data["files"]
+        except (OSError, ValueError, KeyError, TypeError):
+            return False
+        return True
+
+    def _relpath(self, filepath):
+        return os.path.relpath(filepath, self.course_path).replace(os.sep, "/")
+
+    def record(self, filepath, digest=None, source=None):
+        """adds a downloaded file, it is hashed here when no digest is given"""
+        if not os.path.isfile(filepath):
+            return
+        if not digest:
+            digest = hash_file(filepath).hexdigest()
+        st = os.stat(filepath)
+        entry = {
+            "size": st.st_size,
+            HASH_NAME: digest,
+            "source": source or {},
+            "mtime": st.st_mtime,
+        }
+        with self._lock:
+            self.files[self._relpath(filepath)] = entry
+
+    def move(self, moves):
+        """
+        follows files renamed on disk without hashing them again, `moves` are
+        (relpath, new filepath, source) and may swap names between them.
+        """
+        with self._lock:
+            entries = [(self.files.pop(relpath), filepath, source) for relpath, filepath, source in moves]
+            for entry, filepath, source in entries:
+                if source is not None:
+                    entry["source"] = source
+                entry["mtime"] = os.stat(filepath).st_mtime
+                self.files[self._relpath(filepath)] = entry
+
+    def discard(self, relpath):
+        with self._lock:
+            self.files.pop(relpath, None)
+
+    def save(self):
+        with self._lock:
+            data = {"algorithm": HASH_NAME, "files": self.files}
+            temp = self.filepath + ".tmp"
+            with open(temp, "w", encoding="utf-8") as fd:
+                json.dump(data, fd, indent=2, sort_keys=True)
+            os.replace(temp, self.filepath)
+
+    def _check(self, relpath):
+        entry = self.files[relpath]
+        filepath = os.path.join(self.course_path, *relpath.split("/"))
+        if not os.path.isfile(filepath):
+            return relpath, "missing"
+        if os.stat(filepath).st_size != entry["size"]:
+            return relpath, "size mismatch"
+        if hash_file(filepath).hexdigest() != entry[HASH_NAME]:
+            return relpath, "hash mismatch"
+        return relpath, "ok"
+
+    def verify(self, workers=None):
+        """
+        checks every file against the manifest, hashlib releases the GIL on
+        large updates so the files are hashed in parallel across cores.
+        """
+        workers = workers or os.cpu_count() or 4
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(self._check, sorted(self.files)))
@@ -0,0 +1,155 @@
+# pylint: disable=R,C,W
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+
+Author  : Nasir Khan (r0ot h3x49)
+Github  : https://github.com/r0oth3x49
+License : MIT
+
+
+Copyright (c) 2018-2025 Nasir Khan (r0ot h3x49)
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), to deal in the
+Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, 
+and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR
+ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH 
+THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""
+
+import functools
+import unicodedata
+
+from udemy.compat import os, re
+from udemy.logger import logger
+
+# characters no filesystem we write to accepts in a name.
+UNSAFE = '\\/:*?"<>|'
+
+
+class CharTable(dict):
+    """
+    str.translate table calling `replace(char)` once per character, when it
+    is first seen, so the whole of Unicode never has to be enumerated.
+    """
+
+    def __init__(self, replace):
+        super(CharTable, self).__init__()
+        self._replace = replace
+
+    def __missing__(self, code):
+        value = self[code] = self._replace(chr(code))
+        return value
+
+
+_SAFE_TABLE = str.maketrans(dict.fromkeys(UNSAFE, "_"))
+# same characters as re.sub(r"[^\w-]", "_", title), \w is str.isalnum() and '_'.
+_TITLE_TABLE = CharTable(lambda char: char if char.isalnum() or char in "_-" else "_")
+
+
+@functools.lru_cache(maxsize=8192)
+def safe_name(text):
+    """`text` with every character a filesystem would reject replaced by '_'"""
+    return text.translate(_SAFE_TABLE)
+
+
+@functools.lru_cache(maxsize=8192)
+def clean(text):
+    """safe name of a title, without surrounding spaces and trailing dots"""
+    return safe_name(text).strip().rstrip(".")
+
+
+@functools.lru_cache(maxsize=8192)
+def clean_title(title):
+    """`title` with everything but letters, digits, '_' and '-' replaced by '_'"""
+    return title.translate(_TITLE_TABLE)
+
+
+class CoursePaths(object):
+    """
+    Directory tree of a course. Chapter directories are planned together and
+    created in one go, names that only differ in case or Unicode form, the
+    same file on Windows and macOS, are reported before anything is written.
+    """
+
+    def __init__(self, course_path):
+        self.course_path = re.sub(r'"', "", course_path.strip())
+        self.collisions = []
+        self._chapters = {}
+        self._claimed = {}
+        self._owners = {}
+        self._files = {}
+        self._pending = []
+
+    @staticmethod
+    def _key(path):
+        return unicodedata.normalize("NFC", path).casefold()
+
+    def _claim(self, path):
+        claimed = self._claimed.setdefault(self._key(path), path)
+        if claimed != path:
+            self.collisions.append((claimed, path))
+            logger.warning(
+                msg=f"'{path}' and '{claimed}' only differ in case or Unicode form, "
+                "they are the same file on Windows and macOS."
+            )
+        return path
+
+    def chapter(self, title):
+        """directory of the chapter named `title`, created by the next create()"""
+        path = self._chapters.get(title)
+        if path is None:
+            path = self._chapters[title] = self._claim(
+                os.path.join(self.course_path, title)
+            )
+            self._pending.append(path)
+        return path
+
+    def chapters(self, titles):
+        return [self.chapter(title) for title in titles]
+
+    def file(self, directory, filename, owner=None):
+        """
+        path of `filename` in a planned chapter directory. when the name is
+        already taken by another `owner`, the same file once sanitized, it is
+        reported and 'name (2).ext' is handed out so neither overwrites the
+        other. an owner always gets back the path it got first.
+        """
+        if owner is None:
+            return self._claim(os.path.join(directory, filename))
+        path = self._files.get(owner)
+        if path is not None:
+            return path
+        stem, extension = os.path.splitext(filename)
+        path, count = os.path.join(directory, filename), 1
+        while self._owners.get(self._key(path), owner) is not owner:
+            count += 1
+            path = os.path.join(directory, f"{stem} ({count}){extension}")
+        if count > 1:
+            self.collisions.append((os.path.join(directory, filename), path))
+            logger.warning(
+                msg=f"'{filename}' is taken by another download, saving as '{os.path.basename(path)}'."
+            )
+        self._owners[self._key(path)] = owner
+        self._files[owner] = path
+        return path
+
+    def create(self):
+        """creates every chapter directory planned since the last call"""
+        pending, self._pending = self._pending, []
+        if not pending:
+            return self
+        os.makedirs(self.course_path, exist_ok=True)
+        for path in pending:
+            try:
+                os.mkdir(path)
+            except FileExistsError:
+                pass
+        return self
@@ -0,0 +1,112 @@
+# pylint: disable=R,C,W
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+
+Author  : Nasir Khan (r0ot h3x49)
+Github  : https://github.com/r0oth3x49
+License : MIT
+
+
+Copyright (c) 2018-2025 Nasir Khan (r0ot h3x49)
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), to deal in the
+Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, 
+and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR
+ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH 
+THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""
+
+import shutil
+import collections
+from concurrent.futures import ThreadPoolExecutor
+
+from udemy.compat import os
+from udemy.segmented import ResumeJournal
+
+
+class DownloadPlan(object):
+    """
+    Sizes every selected object of a course up front with concurrent probes
+    (cached on the objects), so the run can be checked against the free
+    space of the target filesystem before the first byte is downloaded.
+    """
+
+    def __init__(self, workers=16):
+        self.workers = workers
+        self._entries = []
+        self._executor = None
+        self._probes = []
+        self._totals = None
+
+    def add(self, chapter, item, filepath):
+        if not item or not hasattr(item, "get_filesize"):
+            # encrypted streams are fetched by yt-dlp, nothing to probe.
+            return
+        if item.is_hls or item.mediatype == "external_link":
+            return
+        self._entries.append((chapter, item, filepath))
+        self._totals = None
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers)
+        # sized in the background while the rest of the course is added.
+        self._probes.append(self._executor.submit(item.get_filesize))
+
+    def probe(self):
+        """waits until every entry added is sized"""
+        probes, self._probes = self._probes, []
+        try:
+            for future in probes:
+                future.result()
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+        return self
+
+    def _remaining(self, item, filepath):
+        size = int(item.get_filesize())
+        filepath = item._resolve_filepath(filepath)
+        if item._is_downloaded(filepath):
+            return 0
+        temp_filepath = filepath + ".part"
+        if os.path.isfile(temp_filepath):
+            journal = ResumeJournal(temp_filepath)
+            if journal.load():
+                # preallocated by a segmented download, only the journal knows.
+                return max(0, size - journal.bytesdone)
+            return max(0, size - os.path.getsize(temp_filepath))
+        return size
+
+    def chapters(self):
+        """[(chapter, total bytes, bytes still to download)] in course order"""
+        if self._totals is None:
+            # every entry is stat'ed once, the check reuses the same totals.
+            totals = collections.OrderedDict()
+            for chapter, item, filepath in self._entries:
+                total, remaining = totals.get(chapter, (0, 0))
+                totals[chapter] = (
+                    total + int(item.get_filesize()),
+                    remaining + self._remaining(item, filepath),
+                )
+            self._totals = [(chapter, t, r) for chapter, (t, r) in totals.items()]
+        return self._totals
+
+    @property
+    def unknown(self):
+        return sum(1 for _, item, _ in self._entries if not item.get_filesize())
+
+    def check_space(self, path):
+        """returns (fits, bytes still to download, free bytes) for `path`"""
+        required = sum(r for _, _, r in self.chapters())
+        while path and not os.path.isdir(path):
+            path = os.path.dirname(path)
+        free = shutil.disk_usage(path or os.getcwd()).free
+        return required <= free, required, free
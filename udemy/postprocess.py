@@ -0,0 +1,122 @@
+# pylint: disable=R,C,W
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+
+Author  : Nasir Khan (r0ot h3x49)
+Github  : https://github.com/r0oth3x49
+License : MIT
+
+
+Copyright (c) 2018-2025 Nasir Khan (r0ot h3x49)
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), to deal in the
+Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, 
+and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR
+ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH 
+THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from udemy.compat import os
+
+
+class PostProcessor(object):
+    """
+    Post-processing stage (remux, muxing decrypted tracks, faststart) fed by
+    a queue and run by a bounded pool of worker threads sized to the cores,
+    so the network stage moves on to the next lecture while ffmpeg runs.
+
+    The bytes staged on disk for jobs not finished yet are bounded by
+    `max_staged`, `submit` blocks the downloader beyond that.
+    """
+
+    def __init__(self, workers=None, max_staged=4294967296):
+        self.workers = workers or os.cpu_count() or 2
+        self.max_staged = max_staged
+        self.staged = 0
+
+        self._cond = threading.Condition()
+        self._pool = None
+        self._pending = {}
+
+    def _start(self):
+        if self._pool is None:
+            # the jobs wait on ffmpeg processes, threads are enough to drive them.
+            self._pool = ThreadPoolExecutor(max_workers=self.workers)
+
+    def _run(self, func, args, staged, finalize):
+        try:
+            try:
+                result = func(*args)
+            except Exception as error:  # pylint: disable=W
+                result = {"status": "False", "msg": "Reason : {}".format(error)}
+            return finalize(result) if finalize else result
+        finally:
+            with self._cond:
+                self.staged -= staged
+                self._cond.notify_all()
+
+    def submit(self, func, *args, staged=0, finalize=None, name=None):
+        """
+        queues `func(*args)` (returning a retVal dict) and returns a future
+        of `finalize(retVal)`, run on the same worker once it is done. `name`
+        is what wait() reports a failure of the job as.
+        """
+        with self._cond:
+            while self.staged and self.staged + staged > self.max_staged:
+                self._cond.wait()
+            self.staged += staged
+            self._start()
+        done = self._pool.submit(self._run, func, args, staged, finalize)
+        with self._cond:
+            self._pending[done] = name
+        done.add_done_callback(self._discard)
+        return done
+
+    def result(self, future):
+        """waits for a job submitted here, wait() no longer reports it"""
+        self._discard(future)
+        return future.result()
+
+    def _discard(self, future):
+        with self._cond:
+            self._pending.pop(future, None)
+
+    def wait(self):
+        """
+        blocks until every queued job is finished, returns [(name, error)]
+        of those that raised (a failed rename or cleanup in a finalizer).
+        """
+        failed = []
+        while True:
+            with self._cond:
+                pending = list(self._pending.items())
+            if not pending:
+                return failed
+            for future, name in pending:
+                try:
+                    future.result()
+                except Exception as error:  # pylint: disable=W
+                    failed.append((name, error))
+                # finished ones may still wait for their done callback.
+                self._discard(future)
+
+    def close(self):
+        failed = self.wait()
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+        return failed
+
+
+postprocessor = PostProcessor()
@@ -23,23 +23,85 @@ THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 
 """
 
+import atexit
 import itertools
-from udemy.compat import sys, time
+import threading
+from udemy.compat import sys
 from udemy.logger import Fore, Style
 
 
+class Spinner(object):
+    """
+    Spinner drawn by a render thread at a fixed frame rate, showing a status
+    never blocks the caller. Any other output hides it until the next status.
+    """
+
+    FRAMES = ["-", "|", "/", "\\"]
+
+    def __init__(self, interval=0.1):
+        self.interval = interval
+        self._frames = itertools.cycle(self.FRAMES)
+        self._status = None
+        self._closed = False
+        self._thread = None
+        self._cond = threading.Condition()
+
+    def _draw(self):
+        sys.stdout.write(self._status + next(self._frames))
+        sys.stdout.flush()
+
+    def _render(self):
+        with self._cond:
+            while not self._closed:
+                if self._status is None:
+                    self._cond.wait()
+                else:
+                    self._draw()
+                    self._cond.wait(self.interval)
+
+    def show(self, status):
+        with self._cond:
+            if self._closed:
+                return
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._render, daemon=True)
+                self._thread.start()
+            changed = status != self._status
+            self._status = status
+            if changed:
+                self._draw()
+                self._cond.notify()
+
+    def write(self, string):
+        with self._cond:
+            self._status = None
+            sys.stdout.write(string)
+            sys.stdout.flush()
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._status = None
+            self._cond.notify()
+        if self._thread:
+            self._thread.join()
+
+
+spinner = Spinner()
+# the render thread must not touch stdout while the interpreter shuts down.
+atexit.register(spinner.close)
+
+
 class ProgressBar(object):
     """
     Custom progress bar for udemy
     """
 
-    SPINNER = itertools.cycle(["-", "|", "/", "\\"])
-
     def _spinner(self, text):
-        spin = self.SPINNER.__next__()
-        sys.stdout.write(text + spin)
-        sys.stdout.flush()
-        time.sleep(0.02)
+        spinner.show(text)
+
+    def _write(self, string):
+        spinner.write(string)
 
     # thanks to https://stackoverflow.com/questions/3173320/text-progress-bar-in-the-console
     def _progress(
@@ -64,7 +126,7 @@ class ProgressBar(object):
             + "-" * (bar_length - filledLength)
         )
         if "0.00" not in rate:
-            sys.stdout.write(
+            self._write(
                 "\033[2K\033[1G\r\r{}{}[{}{}*{}{}] : {}{}{}/{} {}% |{}{}{}| {} {}".format(
                     Fore.CYAN,
                     Style.DIM,
@@ -84,7 +146,6 @@ class ProgressBar(object):
                     suffix,
                 )
             )
-            sys.stdout.flush()
 
     def hls_progress(
         self, downloaded, percents, filled_length, rate, suffix, bar_length=30
@@ -97,7 +158,7 @@ class ProgressBar(object):
             + Style.DIM
             + "-" * (bar_length - filled_length)
         )
-        sys.stdout.write(
+        self._write(
             "\033[2K\033[1G\r\r{}{}[{}{}*{}{}] : {}{}{} {}% |{}{}{}| {} {}".format(
                 Fore.CYAN,
                 Style.DIM,
@@ -116,7 +177,6 @@ class ProgressBar(object):
                 suffix,
             )
         )
-        sys.stdout.flush()
 
     def show_progress(self, total, recvd, ratio, rate, eta):
         if total <= 1048576:
@@ -0,0 +1,151 @@
+# pylint: disable=R,C,W
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+
+Author  : Nasir Khan (r0ot h3x49)
+Github  : https://github.com/r0oth3x49
+License : MIT
+
+
+Copyright (c) 2018-2025 Nasir Khan (r0ot h3x49)
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), to deal in the
+Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, 
+and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR
+ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH 
+THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""
+
+import threading
+import collections
+
+from udemy.compat import re, time
+
+
+_RATE_REGEX = re.compile(r"(?i)^\s*(\d+(?:\.\d+)?)\s*([kmg]?)i?b?(?:/s)?\s*$")
+_WINDOW_REGEX = re.compile(r"^\s*(\d{1,2}):(\d{2})\s*-\s*(\d{1,2}):(\d{2})\s*=\s*(.+)$")
+_UNITS = {"": 1, "k": 1024, "m": 1024 ** 2, "g": 1024 ** 3}
+
+
+def parse_rate(value):
+    """'500K', '2M', '1.5m', '65536' -> bytes per second, 0 means unlimited"""
+    mobj = _RATE_REGEX.match(str(value))
+    if not mobj:
+        raise ValueError("invalid rate '%s' (e.g:- 500K, 2M)" % value)
+    return int(float(mobj.group(1)) * _UNITS[mobj.group(2).lower()])
+
+
+def parse_schedule(value):
+    """
+    '08:00-18:00=500K,18:00-23:00=2M' -> [(start_minute, end_minute, rate)],
+    windows may wrap around midnight.
+    """
+    windows = []
+    for entry in filter(None, (e.strip() for e in value.split(","))):
+        mobj = _WINDOW_REGEX.match(entry)
+        if not mobj:
+            raise ValueError("invalid schedule window '%s' (e.g:- 08:00-18:00=500K)" % entry)
+        h1, m1, h2, m2, rate = mobj.groups()
+        windows.append((int(h1) * 60 + int(m1), int(h2) * 60 + int(m2), parse_rate(rate)))
+    return windows
+
+
+class RateLimiter(object):
+    """
+    Process wide token bucket every transfer draws from. Waiting consumers
+    (one per download, whatever the number of connections it uses) are
+    served round robin in `quantum` sized grants, so a large lecture can't
+    starve a subtitle fetch running next to it.
+    """
+
+    def __init__(self, rate=0, schedule=None, quantum=65536):
+        self.rate = rate
+        self.schedule = schedule or []
+        self.quantum = quantum
+
+        self._cond = threading.Condition()
+        self._tokens = 0.0
+        self._updated = time.time()
+        self._order = collections.deque()
+        self._waiting = {}
+
+    def configure(self, rate=0, schedule=None):
+        with self._cond:
+            self.rate = rate
+            self.schedule = schedule or []
+            self._cond.notify_all()
+
+    def current_rate(self, now=None):
+        if self.schedule:
+            now = time.localtime(now)
+            minute = now.tm_hour * 60 + now.tm_min
+            for start, end, rate in self.schedule:
+                inside = start <= minute < end if start <= end else (minute >= start or minute < end)
+                if inside:
+                    return rate
+        return self.rate
+
+    @property
+    def active(self):
+        return bool(self.rate or self.schedule)
+
+    def block_size(self):
+        """largest read worth doing in one go at the current rate, None if unlimited"""
+        rate = self.current_rate()
+        if not rate:
+            return None
+        return max(16384, min(rate // 4, 4194304))
+
+    def _refill(self, rate):
+        now = time.time()
+        burst = max(rate / 2.0, self.quantum)
+        self._tokens = min(burst, self._tokens + (now - self._updated) * rate)
+        self._updated = now
+
+    def _acquire(self, amount, consumer):
+        with self._cond:
+            self._waiting[consumer] = self._waiting.get(consumer, 0) + 1
+            if self._waiting[consumer] == 1:
+                self._order.append(consumer)
+            while True:
+                rate = self.current_rate()
+                if not rate:
+                    break
+                self._refill(rate)
+                if self._order[0] is consumer and self._tokens >= amount:
+                    self._tokens -= amount
+                    break
+                if self._order[0] is consumer:
+                    self._cond.wait((amount - self._tokens) / rate)
+                else:
+                    self._cond.wait(0.5)
+            self._waiting[consumer] -= 1
+            self._order.remove(consumer)
+            if self._waiting[consumer]:
+                # more connections of the same download are waiting, next turn.
+                self._order.append(consumer)
+            else:
+                del self._waiting[consumer]
+            self._cond.notify_all()
+
+    def consume(self, nbytes, consumer=None):
+        """blocks until `nbytes` may be transferred by `consumer`"""
+        if not self.active:
+            return
+        if consumer is None:
+            consumer = threading.current_thread()
+        while nbytes > 0:
+            amount = min(nbytes, self.quantum)
+            self._acquire(amount, consumer)
+            nbytes -= amount
+
+
+limiter = RateLimiter()
@@ -0,0 +1,168 @@
+# pylint: disable=R,C,W
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+
+Author  : Nasir Khan (r0ot h3x49)
+Github  : https://github.com/r0oth3x49
+License : MIT
+
+
+Copyright (c) 2018-2025 Nasir Khan (r0ot h3x49)
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), to deal in the
+Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, 
+and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR
+ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH 
+THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""
+
+import random
+import threading
+from email.utils import parsedate_to_datetime
+
+from requests.exceptions import ChunkedEncodingError, Timeout
+from urllib3.exceptions import ProtocolError, ReadTimeoutError
+
+from udemy.compat import time, conn_error
+
+
+class HTTPStatusError(Exception):
+    """Raised by transfer code for an unexpected status, keeps the response."""
+
+    def __init__(self, response, msg=""):
+        self.response = response
+        self.status_code = response.status_code
+        super(HTTPStatusError, self).__init__(
+            msg or "Udemy returned HTTP Code %s: %s" % (response.status_code, response.reason)
+        )
+
+
+class IncompleteTransferError(Exception):
+    """The server closed the body before every expected byte arrived."""
+
+
+class RetryMetrics(object):
+    """Process wide retry counters, shared by API calls and media transfers."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.retries = 0
+        self.giveups = 0
+        self.backoff_time = 0.0
+
+    def _add_retry(self, delay):
+        with self._lock:
+            self.retries += 1
+            self.backoff_time += delay
+
+    def _add_giveup(self):
+        with self._lock:
+            self.giveups += 1
+
+    def __repr__(self):
+        return "retries=%s giveups=%s backoff=%.2fs" % (
+            self.retries,
+            self.giveups,
+            self.backoff_time,
+        )
+
+
+metrics = RetryMetrics()
+
+
+class RetryPolicy(object):
+    """
+    Exponential backoff with full jitter. Transient failures (connection
+    errors, timeouts, 429/5xx) are retried until either `max_attempts` or the
+    per request `budget` of backoff seconds is used up, everything else is
+    fatal and raised/returned straight away. 'Retry-After' is honoured.
+    """
+
+    RETRY_STATUSES = frozenset([408, 425, 429, 500, 502, 503, 504])
+    RETRY_ERRORS = (
+        conn_error,
+        Timeout,
+        ChunkedEncodingError,
+        IncompleteTransferError,
+        # raised by raw `readinto` reads which bypass requests' wrapping.
+        ProtocolError,
+        ReadTimeoutError,
+    )
+
+    def __init__(self, max_attempts=5, backoff=0.5, max_backoff=30.0, budget=120.0):
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.budget = budget
+
+    def is_retryable(self, error=None, response=None):
+        if response is not None:
+            return response.status_code in self.RETRY_STATUSES
+        if isinstance(error, HTTPStatusError):
+            return error.status_code in self.RETRY_STATUSES
+        return isinstance(error, self.RETRY_ERRORS)
+
+    def _retry_after(self, response):
+        value = response.headers.get("Retry-After") if response is not None else None
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+    def delay(self, attempt, response=None):
+        retry_after = self._retry_after(response)
+        if retry_after is not None:
+            return retry_after
+        ceiling = min(self.max_backoff, self.backoff * (2 ** (attempt - 1)))
+        return random.uniform(0, ceiling)
+
+    def call(self, func, *args, **kwargs):
+        """
+        calls `func` until it succeeds, fails for good or the retry budget is
+        spent. When `func` returns a response, a retryable one that is still
+        failing at the end is returned as is so callers keep their own handling.
+        """
+        attempt, slept = 0, 0.0
+        while True:
+            attempt += 1
+            response = None
+            try:
+                response = func(*args, **kwargs)
+            except Exception as error:  # pylint: disable=W
+                if not self.is_retryable(error=error):
+                    raise
+                delay = self.delay(attempt, getattr(error, "response", None))
+                if attempt >= self.max_attempts or slept + delay > self.budget:
+                    metrics._add_giveup()
+                    raise
+            else:
+                if not hasattr(response, "status_code"):
+                    return response
+                if not self.is_retryable(response=response):
+                    return response
+                delay = self.delay(attempt, response)
+                if attempt >= self.max_attempts or slept + delay > self.budget:
+                    metrics._add_giveup()
+                    return response
+                response.close()
+            metrics._add_retry(delay)
+            time.sleep(delay)
+            slept += delay
+
+
+retry_policy = RetryPolicy()
+no_retry = RetryPolicy(max_attempts=1)
@@ -6,8 +6,10 @@ from __future__ import unicode_literals
 
 import re
 import six
+import functools
 import unicodedata
 from unidecode import unidecode
+from udemy.paths import CharTable
 
 
 def smart_text(s, encoding="utf-8", errors="strict"):
@@ -95,48 +97,57 @@ def slugify(
     return new
 
 
+# replacements of the non ASCII characters sanitize() knows about.
+_LOCALE = {
+    194: "A",
+    199: "C",
+    286: "G",
+    304: "I",
+    206: "I",
+    214: "O",
+    350: "S",
+    219: "U",
+    226: "a",
+    231: "c",
+    287: "g",
+    305: "i",
+    238: "i",
+    246: "o",
+    351: "s",
+    251: "u",
+    191: "",
+    225: "a",
+    233: "e",
+    237: "i",
+    243: "o",
+    250: "u",
+    252: "u",
+    168: "",
+    241: "n",
+    193: "A",
+    201: "E",
+    205: "I",
+    211: "O",
+    218: "U",
+    220: "U",
+    209: "N",
+    223: "ss",
+}
+
+
+def _sanitize_char(char):
+    code = ord(char)
+    if code > 128:
+        # unknown characters are spelled out as their code point.
+        return _LOCALE.get(code, str(code))
+    if char in '\\/:*?"<>':
+        return "_"
+    return char
+
+
+_SANITIZE_TABLE = CharTable(_sanitize_char)
+
+
+@functools.lru_cache(maxsize=8192)
 def sanitize(title):
-    _locale = {
-        "194": "A",
-        "199": "C",
-        "286": "G",
-        "304": "I",
-        "206": "I",
-        "214": "O",
-        "350": "S",
-        "219": "U",
-        "226": "a",
-        "231": "c",
-        "287": "g",
-        "305": "i",
-        "238": "i",
-        "246": "o",
-        "351": "s",
-        "251": "u",
-        "191": "",
-        "225": "a",
-        "233": "e",
-        "237": "i",
-        "243": "o",
-        "250": "u",
-        "252": "u",
-        "168u": "u",
-        "241": "n",
-        "193": "A",
-        "201": "E",
-        "205": "I",
-        "211": "O",
-        "218": "U",
-        "220": "U",
-        "168U": "U",
-        "209": "N",
-        "223": "ss",
-    }
-    _temp = "".join([str(ord(i)) if ord(i) > 128 else i for i in title])
-    for _ascii, _char in _locale.items():
-        if _ascii in _temp:
-            _temp = _temp.replace(_ascii, _char)
-
-    ok = re.compile(r'[^\\/:*?"<>]')
-    _title = "".join(x if ok.match(x) else "_" for x in _temp)
-    return _title
+    return title.translate(_SANITIZE_TABLE)
@@ -0,0 +1,190 @@
+# pylint: disable=R,C,W
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+
+Author  : Nasir Khan (r0ot h3x49)
+Github  : https://github.com/r0oth3x49
+License : MIT
+
+
+Copyright (c) 2018-2025 Nasir Khan (r0ot h3x49)
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), to deal in the
+Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, 
+and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR
+ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH 
+THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""
+
+import bisect
+import itertools
+import threading
+from urllib.parse import urlparse
+
+from udemy.compat import time
+from udemy.logger import logger
+from udemy.progress import progress
+
+
+# small files go first so they are never starved by long lectures.
+PRIORITIES = {"subtitle": 0, "asset": 1, "lecture": 2}
+
+
+class Job(object):
+    """A unit of work (lecture, asset or subtitle download) for the scheduler."""
+
+    def __init__(self, kind, func, args=(), kwargs=None, priority=None, url=None):
+        self.kind = kind
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs or {}
+        self.priority = PRIORITIES.get(kind, 0) if priority is None else priority
+        self.host = urlparse(url).netloc if url else None
+
+    def __repr__(self):
+        return "%s@%s" % (self.kind, self.host)
+
+
+class JobProgress(object):
+    """
+    Merges the progress callbacks of every running job into one progress bar,
+    the bar is redrawn at most every `interval` seconds.
+    """
+
+    def __init__(self, interval=0.1):
+        self.interval = interval
+        self._stats = {}
+        self._lock = threading.Lock()
+        self._drawn_at = 0
+
+    def callback(self, token):
+        def _callback(total, recvd, ratio, rate, eta):
+            with self._lock:
+                self._stats[token] = (total, recvd, rate)
+            self._draw()
+
+        return _callback
+
+    def done(self, token):
+        with self._lock:
+            self._stats.pop(token, None)
+
+    def _draw(self):
+        now = time.time()
+        with self._lock:
+            if now - self._drawn_at < self.interval:
+                return
+            self._drawn_at = now
+            stats = list(self._stats.values())
+        total = sum(s[0] for s in stats)
+        recvd = sum(s[1] for s in stats)
+        rate = sum(s[2] for s in stats)
+        if not total:
+            return
+        eta = (total - recvd) / (rate * 1024.0) if rate else 0
+        progress.show_progress(total, recvd, recvd * 1.0 / total, rate, eta)
+
+
+class JobScheduler(object):
+    """
+    Bounded worker pool for download jobs. Jobs run by priority (lower first,
+    then submission order) while honouring a concurrency limit per job kind
+    and per host.
+    """
+
+    def __init__(self, jobs=1, limits=None, host_limit=6):
+        self.jobs = max(1, jobs)
+        self.limits = limits or {}
+        self.host_limit = host_limit
+        self.progress = JobProgress()
+
+        self._queue = []
+        self._counter = itertools.count()
+        self._running = {}
+        self._hosts = {}
+        self._cond = threading.Condition()
+        self._closed = False
+        self._workers = []
+
+    def submit(self, job):
+        with self._cond:
+            bisect.insort(self._queue, (job.priority, next(self._counter), job))
+            self._cond.notify()
+
+    def _can_start(self, job):
+        limit = self.limits.get(job.kind)
+        if limit and self._running.get(job.kind, 0) >= limit:
+            return False
+        if job.host and self._hosts.get(job.host, 0) >= self.host_limit:
+            return False
+        return True
+
+    def _next_job(self):
+        """pops the best runnable job, blocks while every queued job is throttled"""
+        with self._cond:
+            while True:
+                for position, (_, _, job) in enumerate(self._queue):
+                    if self._can_start(job):
+                        del self._queue[position]
+                        self._running[job.kind] = self._running.get(job.kind, 0) + 1
+                        if job.host:
+                            self._hosts[job.host] = self._hosts.get(job.host, 0) + 1
+                        return job
+                if self._closed and not self._queue:
+                    return None
+                self._cond.wait()
+
+    def _release(self, job):
+        with self._cond:
+            self._running[job.kind] -= 1
+            if job.host:
+                self._hosts[job.host] -= 1
+            self._cond.notify_all()
+
+    def _worker(self):
+        while True:
+            job = self._next_job()
+            if job is None:
+                return
+            token = id(job)
+            job.kwargs.setdefault("callback", self.progress.callback(token))
+            try:
+                job.func(*job.args, **job.kwargs)
+            except Exception as error:  # pylint: disable=W
+                logger.error(msg=f"Job {job} failed: {error}", new_line=True)
+            finally:
+                self.progress.done(token)
+                self._release(job)
+
+    def start(self):
+        """starts the workers, jobs submitted from now on run right away"""
+        self._workers = [
+            threading.Thread(target=self._worker, daemon=True)
+            for _ in range(self.jobs)
+        ]
+        for worker in self._workers:
+            worker.start()
+        return self
+
+    def join(self):
+        """waits for every submitted job once no more are coming"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        for worker in self._workers:
+            while worker.is_alive():
+                worker.join(0.5)
+        with self._cond:
+            self._closed = False
+
+    def run(self):
+        """runs every submitted job and waits for all of them"""
+        self.start().join()
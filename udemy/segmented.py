@@ -0,0 +1,484 @@
+# pylint: disable=R,C,W
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+
+Author  : Nasir Khan (r0ot h3x49)
+Github  : https://github.com/r0oth3x49
+License : MIT
+
+
+Copyright (c) 2018-2025 Nasir Khan (r0ot h3x49)
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), to deal in the
+Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, 
+and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR
+ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH 
+THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""
+
+import zlib
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from udemy.compat import (
+    os,
+    re,
+    sys,
+    time,
+    json,
+    conn_error,
+    HEADERS,
+)
+from udemy.retry import retry_policy, HTTPStatusError, IncompleteTransferError
+from udemy.ratelimit import limiter
+from udemy.utils import preallocate
+from udemy.manifest import new_hash
+
+
+# progress callbacks are rate limited to this many seconds.
+PROGRESS_INTERVAL = 0.2
+
+
+class DownloadStopped(Exception):
+    """Raised in the ranges still running once a download is stopped."""
+
+
+class ReceiveBuffer(object):
+    """
+    Reusable receive buffer, the body is read straight into it with
+    `readinto` and handed out as memoryviews so no per chunk bytes objects are
+    created. The buffer doubles while reads fill it quickly and halves when a
+    single read takes too long, keeping progress responsive on slow links.
+    """
+
+    def __init__(self, minimum=65536, maximum=4194304, target=0.1):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.target = target
+        self._resize(minimum)
+
+    def _resize(self, size):
+        # a new buffer instead of resizing, views handed out may still be alive.
+        self.size = size
+        self._view = memoryview(bytearray(size))
+
+    def _adapt(self, filled, elapsed):
+        if filled and elapsed < self.target / 2 and self.size < self.maximum:
+            self._resize(min(self.maximum, self.size * 2))
+        elif elapsed > self.target * 4 and self.size > self.minimum:
+            self._resize(max(self.minimum, self.size // 2))
+
+    def blocks(self, raw, limit=None, consumer=None):
+        """
+        yields memoryviews of the data read, each is only valid until the next,
+        the global rate limiter is charged on behalf of `consumer`.
+        """
+        remaining = limit
+        while remaining is None or remaining > 0:
+            size = self.size if remaining is None else min(self.size, remaining)
+            capped = limiter.block_size()
+            if capped:
+                size = min(size, capped)
+            t0 = time.time()
+            received = raw.readinto(self._view[:size])
+            if not received:
+                return
+            elapsed = time.time() - t0
+            limiter.consume(received, consumer)
+            yield self._view[:received]
+            if remaining is not None:
+                remaining -= received
+            self._adapt(received == size, elapsed)
+
+
+class ResumeJournal(object):
+    """
+    Sidecar journal ('<file>.part.json') of the byte ranges already written to
+    a '.part' file, together with the validators of the remote file and a
+    rolling crc32 per range so a resume can detect torn writes.
+    """
+
+    def __init__(self, filepath, interval=1.0):
+        self.filepath = filepath + ".json"
+        self.interval = interval
+        self.content_length = 0
+        self.etag = None
+        self.last_modified = None
+        self.ranges = []
+
+        self._lock = threading.Lock()
+        self._saved_at = 0
+
+    def load(self):
+        try:
+            with open(self.filepath) as fd:
+                data = json.load(fd)
+            self.content_length = int(data["content_length"])
+            self.etag = data.get("etag")
+            self.last_modified = data.get("last_modified")
+            self.ranges = data["ranges"]
+        except (OSError, ValueError, KeyError, TypeError):
+            return False
+        return True
+
+    def matches(self, content_length, etag, last_modified):
+        if self.content_length != content_length:
+            return False
+        if (etag or self.etag) and etag != self.etag:
+            return False
+        if (last_modified or self.last_modified) and last_modified != self.last_modified:
+            return False
+        return True
+
+    def reset(self, content_length, etag, last_modified, segments):
+        self.content_length = content_length
+        self.etag = etag
+        self.last_modified = last_modified
+        self.ranges = [
+            {"start": start, "end": end, "done": 0, "crc": 0} for start, end in segments
+        ]
+
+    @property
+    def bytesdone(self):
+        return sum(r["done"] for r in self.ranges)
+
+    @property
+    def is_complete(self):
+        return all(r["done"] == r["end"] - r["start"] + 1 for r in self.ranges)
+
+    def update(self, index, data):
+        with self._lock:
+            entry = self.ranges[index]
+            entry["crc"] = zlib.crc32(data, entry["crc"])
+            entry["done"] += len(data)
+
+    def validate(self, fd, blocksize=1048576):
+        """re-reads every journaled range, drops the ones whose checksum differs"""
+        invalid = 0
+        for entry in self.ranges:
+            crc, offset, remaining = 0, entry["start"], entry["done"]
+            while remaining > 0:
+                data = self._read_at(fd, min(blocksize, remaining), offset)
+                if not data:
+                    break
+                crc = zlib.crc32(data, crc)
+                offset += len(data)
+                remaining -= len(data)
+            if remaining or crc != entry["crc"]:
+                entry["done"], entry["crc"] = 0, 0
+                invalid += 1
+        return invalid
+
+    def _read_at(self, fd, size, offset):
+        if hasattr(os, "pread"):
+            return os.pread(fd, size, offset)
+        os.lseek(fd, offset, os.SEEK_SET)
+        return os.read(fd, size)
+
+    def save(self, fd=None, force=False):
+        """
+        writes the journal atomically, the data is flushed first so the journal
+        never claims bytes that are not on disk yet.
+        """
+        now = time.time()
+        if not force and now - self._saved_at < self.interval:
+            return
+        with self._lock:
+            self._saved_at = now
+            if fd is not None:
+                os.fsync(fd)
+            content = {
+                "content_length": self.content_length,
+                "etag": self.etag,
+                "last_modified": self.last_modified,
+                "ranges": [dict(r) for r in self.ranges],
+            }
+            temp_filepath = self.filepath + ".tmp"
+            with open(temp_filepath, "w") as journal:
+                json.dump(content, journal)
+            os.replace(temp_filepath, self.filepath)
+
+    def remove(self):
+        for path in (self.filepath, self.filepath + ".tmp"):
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+
+
+class SegmentedDownload(object):
+    """
+    Downloads a single progressive file over several HTTP connections by
+    splitting it into byte ranges, each range is written at its own offset
+    into a preallocated temporary file and recorded in a ResumeJournal.
+    """
+
+    _CONTENT_RANGE = re.compile(r"bytes\s+(\d+)-(\d+)/(\d+)")
+    _STATUS_STRING = (
+        "  {:,} Bytes [{:.2%}] received. Rate: [{:4.0f} "
+        "KB/s].  ETA: [{:.0f} secs]"
+    )
+
+    def __init__(
+        self,
+        session,
+        url,
+        filepath,
+        connections=4,
+        min_segment_size=4194304,
+        quiet=False,
+        callback=lambda *x: None,
+    ):
+        self._sess = session
+        self.url = url
+        self.filepath = filepath
+        self.connections = connections
+        self.min_segment_size = min_segment_size
+        self.quiet = quiet
+        self.callback = callback
+
+        self.total = 0
+        self.etag = None
+        self.last_modified = None
+        self.accept_ranges = False
+        self.completed = False
+        self.digest = None
+        self.journal = ResumeJournal(filepath)
+
+        self._lock = threading.Lock()
+        self._bytesdone = 0
+        self._offset = 0
+        self._t0 = None
+        self._reported_at = 0
+        self._hash = new_hash()
+        self._hashed = 0
+        self._hash_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._fetching = 0
+        self._idle = threading.Condition()
+
+    def _headers(self, start=None, end=None):
+        headers = {"User-Agent": HEADERS.get("User-Agent"), "Accept-Encoding": None}
+        if start is not None:
+            headers["Range"] = "bytes={}-{}".format(start, end)
+        return headers
+
+    def probe(self):
+        """
+        issues a one byte ranged request, returns True only if the server
+        answered with 206 so the file can be fetched (and resumed) by ranges.
+        """
+        try:
+            with retry_policy.call(
+                self._sess.get,
+                self.url,
+                headers=self._headers(0, 0),
+                stream=True,
+                timeout=10,
+            ) as resp:
+                if resp.status_code == 206:
+                    # drain the single byte so the connection goes back to the pool.
+                    resp.content
+                    mobj = self._CONTENT_RANGE.search(
+                        resp.headers.get("Content-Range", "")
+                    )
+                    if mobj:
+                        self.total = int(mobj.group(3))
+                        self.accept_ranges = True
+                elif resp.ok:
+                    self.total = int(resp.headers.get("Content-Length", 0))
+                self.etag = resp.headers.get("ETag")
+                self.last_modified = resp.headers.get("Last-Modified")
+        except conn_error:
+            return False
+        return bool(self.accept_ranges and self.total > 0)
+
+    def segments(self):
+        """splits the file into (start, end) inclusive byte ranges"""
+        count = min(self.connections, max(1, self.total // self.min_segment_size))
+        size = self.total // count
+        ranges = []
+        for i in range(count):
+            start = i * size
+            end = self.total - 1 if i == count - 1 else start + size - 1
+            ranges.append((start, end))
+        return ranges
+
+    def _preallocate(self):
+        with open(self.filepath, "wb") as fd:
+            preallocate(fd.fileno(), self.total)
+
+    def _can_resume(self):
+        return bool(
+            os.path.isfile(self.filepath)
+            and os.stat(self.filepath).st_size == self.total
+            and self.journal.load()
+            and self.journal.matches(self.total, self.etag, self.last_modified)
+        )
+
+    def _write_at(self, fd, data, offset):
+        if hasattr(os, "pwrite"):
+            return os.pwrite(fd, data, offset)
+        with self._lock:
+            os.lseek(fd, offset, os.SEEK_SET)
+            return os.write(fd, data)
+
+    def _report(self, received):
+        now = time.time()
+        with self._lock:
+            self._bytesdone += received
+            bytesdone = self._bytesdone
+            if now - self._reported_at < PROGRESS_INTERVAL and bytesdone < self.total:
+                return
+            self._reported_at = now
+        elapsed = now - self._t0
+        if elapsed:
+            rate = ((float(bytesdone) - float(self._offset)) / 1024.0) / elapsed
+            eta = (self.total - bytesdone) / (rate * 1024.0) if rate else 0
+        else:
+            rate = 0
+            eta = 0
+        progress_stats = (bytesdone, bytesdone * 1.0 / self.total, rate, eta)
+        if not self.quiet:
+            status = self._STATUS_STRING.format(*progress_stats)
+            sys.stdout.write("\r" + status + " " * 4 + "\r")
+            sys.stdout.flush()
+        if self.callback:
+            self.callback(self.total, *progress_stats)
+
+    def _advance_hash(self, fd, wait=False):
+        """
+        hashes the contiguous prefix written so far, ranges complete out of
+        order so the bytes are read back from the (still cached) file.
+        """
+        if not self._hash_lock.acquire(wait):
+            # another range is hashing, it will pick these bytes up.
+            return
+        try:
+            for entry in self.journal.ranges:
+                written = entry["start"] + entry["done"]
+                while self._hashed < written:
+                    size = min(written - self._hashed, 4194304)
+                    self._hash.update(self.journal._read_at(fd, size, self._hashed))
+                    self._hashed += size
+                if written <= entry["end"]:
+                    break
+        finally:
+            self._hash_lock.release()
+
+    def _fetch(self, fd, index):
+        with self._idle:
+            if self._stop.is_set():
+                raise DownloadStopped("range %s not started, download stopped" % index)
+            self._fetching += 1
+        try:
+            return self._fetch_range(fd, index)
+        finally:
+            with self._idle:
+                self._fetching -= 1
+                self._idle.notify_all()
+
+    def _fetch_range(self, fd, index):
+        entry = self.journal.ranges[index]
+        start, end = entry["start"] + entry["done"], entry["end"]
+        if start > end:
+            return 0
+        offset = start
+        with self._sess.get(
+            self.url, headers=self._headers(start, end), stream=True, timeout=10
+        ) as resp:
+            if resp.status_code != 206:
+                raise HTTPStatusError(
+                    resp,
+                    "Udemy returned HTTP Code %s: %s for range %s-%s"
+                    % (resp.status_code, resp.reason, start, end),
+                )
+            for block in ReceiveBuffer().blocks(resp.raw, end + 1 - start, consumer=self):
+                if self._stop.is_set():
+                    raise DownloadStopped("range %s-%s stopped" % (start, end))
+                self._write_at(fd, block, offset)
+                self.journal.update(index, block)
+                offset += len(block)
+                self._report(len(block))
+                self.journal.save(fd)
+                self._advance_hash(fd)
+        if offset != end + 1:
+            raise IncompleteTransferError(
+                "incomplete range %s-%s, received %s byte(s)"
+                % (start, end, offset - start)
+            )
+        return offset - start
+
+    def _stop_ranges(self, executor):
+        """
+        Ctrl-C or the first failed range stops the others between two blocks
+        instead of letting them run to the end, `fd` is safe to close after.
+        """
+        self._stop.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+        # ranges sleeping in a retry backoff see the stop before they write.
+        with self._idle:
+            self._idle.wait_for(lambda: not self._fetching)
+
+    def download(self):
+        retVal = {}
+        self._t0 = time.time()
+        flags = os.O_RDWR | getattr(os, "O_BINARY", 0)
+        if self._can_resume():
+            fd = os.open(self.filepath, flags)
+            self.journal.validate(fd)
+        else:
+            self.journal.remove()
+            try:
+                self._preallocate()
+            except OSError as error:
+                return {"status": "False", "msg": "Unable to preallocate: %s" % (error)}
+            self.journal.reset(
+                self.total, self.etag, self.last_modified, self.segments()
+            )
+            fd = os.open(self.filepath, flags)
+        self._bytesdone = self._offset = self.journal.bytesdone
+        try:
+            pending = [
+                i
+                for i, entry in enumerate(self.journal.ranges)
+                if entry["done"] < entry["end"] - entry["start"] + 1
+            ]
+            if pending:
+                executor = ThreadPoolExecutor(max_workers=len(pending))
+                try:
+                    futures = [
+                        executor.submit(retry_policy.call, self._fetch, fd, i)
+                        for i in pending
+                    ]
+                    for future in as_completed(futures):
+                        future.result()
+                finally:
+                    self._stop_ranges(executor)
+        except KeyboardInterrupt as error:
+            self.journal.save(fd, force=True)
+            raise error
+        except conn_error as error:
+            retVal = {"status": "False", "msg": "ConnectionError: %s" % (str(error))}
+        except Exception as error:  # pylint: disable=W
+            retVal = {"status": "False", "msg": "Reason : {}".format(str(error))}
+        finally:
+            if self.journal.is_complete:
+                self.completed = True
+                self._advance_hash(fd, wait=True)
+                self.digest = self._hash.hexdigest()
+            else:
+                self.journal.save(fd, force=True)
+            os.close(fd)
+        if self.completed:
+            self.journal.remove()
+            retVal = {"status": "True", "msg": "download"}
+        return retVal
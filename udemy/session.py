@@ -28,6 +28,7 @@ from udemy.compat import (
     requests,
     HEADERS,
 )
+from udemy.retry import retry_policy
 
 
 class Session(object):
@@ -39,8 +40,10 @@ class Session(object):
         self._headers["Authorization"] = "Bearer {}".format(access_token)
         self._headers["X-Udemy-Authorization"] = "Bearer {}".format(access_token)
 
-    def _get(self, url):
-        session = self._session.get(url, headers=self._headers)
+    def _get(self, url, policy=retry_policy, headers=None):
+        if headers:
+            headers = dict(self._headers, **headers)
+        session = policy.call(self._session.get, url, headers=headers or self._headers)
         if session.ok or session.status_code in [502, 503]:
             return session
         if not session.ok:
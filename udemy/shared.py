@@ -25,7 +25,6 @@ THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 import json
 import subprocess
 
-from udemy.auxiliar.decrypt_all_sources import clean_title
 from udemy.compat import (
     re,
     os,
@@ -37,11 +36,38 @@ from udemy.compat import (
 )
 from udemy.decryptor.utils import extract_kid, mux_process, decrypt
 from udemy.ffmpeg import FFMPeg
+from udemy.hls import HLSDownload
+from udemy.postprocess import postprocessor
+from udemy.manifest import new_hash, hash_file
+from udemy.paths import safe_name, clean
+from udemy.retry import retry_policy
+from udemy.ratelimit import limiter
+from udemy.segmented import SegmentedDownload, ReceiveBuffer, PROGRESS_INTERVAL
+from udemy.transport import shared_session
 from udemy.logger import logger
 from udemy.utils import to_file, prepare_html
 
 
 class Downloader(object):
+    _kind = None
+
+    __slots__ = (
+        "_url",
+        "_filename",
+        "_mediatype",
+        "_extension",
+        "_active",
+        "_is_hls",
+        "_token",
+        "_connections",
+        "_sess",
+        "_asset_id",
+        "_digest",
+        "_pending",
+        "_parent",
+        "_fsize",
+    )
+
     def __init__(self):
         self._url = None
         self._filename = None
@@ -50,7 +76,11 @@ class Downloader(object):
         self._active = True
         self._is_hls = False
         self._token = None
-        self._sess = requests.session()
+        self._connections = 4
+        self._sess = shared_session()
+        self._asset_id = None
+        self._digest = None
+        self._pending = None
 
     @property
     def url(self):
@@ -79,6 +109,34 @@ class Downloader(object):
             self._filename = self._generate_filename()  # pylint: disable=E
         return self._filename
 
+    def set_filename(self, filename):
+        """saves the download as `filename` instead of the generated name"""
+        self._filename = filename
+
+    @property
+    def digest(self):
+        """sha256 of the file computed while it was downloaded"""
+        return self._digest
+
+    @property
+    def pending(self):
+        """future of the post-processing still running for this download"""
+        return self._pending
+
+    @property
+    def source(self):
+        fsize = getattr(self, "_fsize", None)
+        return {
+            "lecture_id": self.id,  # pylint: disable=E
+            "asset_id": self._asset_id,
+            "type": self.mediatype,
+            "kind": self._kind,
+            "language": getattr(self, "language", None),
+            # the query only carries the signature, the path names the file.
+            "url": re.sub(r"[?#].*$", "", self.url) if self.url else None,
+            "size": int(fsize) if fsize else None,
+        }
+
     def _generate_filename(self):  # pylint: disable=E
         pass
 
@@ -100,15 +158,8 @@ class Downloader(object):
             retVal = to_file(filename, "a", content)
         return retVal
 
-    def download(
-        self,
-        filepath="",
-        quiet=False,
-        callback=lambda *x: None,
-    ):
+    def _resolve_filepath(self, filepath=""):
         savedir = filename = ""
-        retVal = {}
-
         if filepath and os.path.isdir(filepath):
             savedir, filename = (
                 filepath,
@@ -124,17 +175,229 @@ class Downloader(object):
         filepath = os.path.join(savedir, filename)
         if os.name == "nt" and len(filepath) > 250:
             filepath = "\\\\?\\{}".format(filepath)
+        return filepath
 
-        if self.mediatype == "external_link":
-            return self._write_external_links(filepath)
-
+    def _is_downloaded(self, filepath):
         if filepath and filepath.endswith(".vtt"):
             filepath_vtt2srt = filepath.replace(".vtt", ".srt")
             if os.path.isfile(filepath_vtt2srt):
-                retVal = {"status": "True", "msg": "already downloaded"}
-                return retVal
+                return True
+        return os.path.isfile(filepath)
+
+    def _probe_filesize(self):
+        headers = {"User-Agent": HEADERS.get("User-Agent")}
+        try:
+            resp = retry_policy.call(
+                self._sess.head, self.url, headers=headers, allow_redirects=True
+            )
+            if resp.ok and int(resp.headers.get("Content-Length", 0)):
+                return int(resp.headers["Content-Length"])
+            # some CDNs refuse HEAD on signed urls, ask for a single byte.
+            headers["Range"] = "bytes=0-0"
+            with self._sess.get(self.url, stream=True, headers=headers) as resp:
+                if resp.status_code == 206:
+                    _ = resp.content
+                    mobj = re.search(r"/(\d+)$", resp.headers.get("Content-Range", ""))
+                    return int(mobj.group(1)) if mobj else 0
+                if resp.ok:
+                    return int(resp.headers.get("Content-Length", 0))
+        except (requests.RequestException, ValueError):
+            pass
+        return 0
+
+    def get_filesize(self):
+        """size of the remote file, probed once and cached (0 when unknown)"""
+        if getattr(self, "_fsize", None) is None:
+            self._fsize = float(self._probe_filesize())
+        return self._fsize
+
+    def _download_segmented(self, temp_filepath, quiet, callback, connections):
+        """downloads by byte ranges, None if the server can't do it"""
+        segmented = SegmentedDownload(
+            self._sess,
+            self.url,
+            temp_filepath,
+            connections=connections,
+            quiet=quiet,
+            callback=callback,
+        )
+        has_journal = os.path.isfile(segmented.journal.filepath)
+        if os.path.exists(temp_filepath) and not has_journal:
+            # '.part' files without a journal are resumed by the single stream.
+            return None
+        if connections <= 1 and not has_journal:
+            return None
+        if not segmented.probe():
+            if has_journal:
+                # a preallocated '.part' can't be appended to, start over.
+                segmented.journal.remove()
+                try:
+                    os.unlink(temp_filepath)
+                except OSError:
+                    pass
+            return None
+        retVal = segmented.download()
+        if segmented.completed:
+            self._active = False
+            self._digest = segmented.digest
+        return retVal
+
+    def _download_hls(self, temp_filepath, filepath, quiet, callback):
+        """fetches the segments natively, None when ffmpeg has to do it"""
+        hls = HLSDownload(
+            self._sess,
+            self.url,
+            self.token,
+            temp_filepath,
+            window=self._connections * 2,
+            quiet=quiet,
+            callback=callback,
+            name=self.title,
+        )
+        if not hls.load():
+            return None
+
+        def finalize(retVal):
+            # the only rename of the output, on the post-processing stage if remuxed.
+            if hls.completed:
+                os.rename(temp_filepath, filepath)
+                self._digest = hash_file(filepath).hexdigest()
+                self._active = False
+            return retVal
+
+        retVal = hls.download(finalize=finalize)
+        self._pending = hls.pending
+        return retVal
+
+    def _download_stream(self, temp_filepath, quiet, callback):
+        retVal = {}
+        bytes_to_be_downloaded = 0
+        fmode, offset = "wb", 0
+        bytesdone, t0 = 0, time.time()
+        headers = {"User-Agent": HEADERS.get("User-Agent"), "Accept-Encoding": None}
+        if os.path.exists(temp_filepath):
+            offset = os.stat(temp_filepath).st_size
+
+        digest = new_hash()
+        if offset:
+            offset_range = "bytes={}-".format(offset)
+            headers["Range"] = offset_range
+            bytesdone = offset
+            fmode = "ab"
+            hash_file(temp_filepath, digest)
+
+        status_string = (
+            "  {:,} Bytes [{:.2%}] received. Rate: [{:4.0f} "
+            "KB/s].  ETA: [{:.0f} secs]"
+        )
+
+        try:
+            try:
+                response = retry_policy.call(
+                    self._sess.get, self.url, headers=headers, stream=True, timeout=10
+                )
+            except conn_error as error:
+                return {
+                    "status": "False",
+                    "msg": "ConnectionError: %s" % (str(error)),
+                }
+            if response.ok:
+                bytes_to_be_downloaded = total = int(
+                    response.headers.get("Content-Length")
+                )
+                if bytesdone > 0:
+                    bytes_to_be_downloaded = bytes_to_be_downloaded + bytesdone
+                total = bytes_to_be_downloaded
+                with open(temp_filepath, fmode) as media_file:
+                    is_malformed = False
+                    reported_at = 0
+                    for block in ReceiveBuffer().blocks(response.raw, consumer=self):
+                        media_file.write(block)
+                        digest.update(block)
+                        bytesdone += len(block)
+                        now = time.time()
+                        if now - reported_at < PROGRESS_INTERVAL and bytesdone < total:
+                            continue
+                        reported_at = now
+                        elapsed = now - t0
+                        if elapsed:
+                            try:
+                                rate = (
+                                    (float(bytesdone) - float(offset)) / 1024.0
+                                ) / elapsed
+                                eta = (total - bytesdone) / (rate * 1024.0)
+                            except ZeroDivisionError:
+                                is_malformed = True
+                                try:
+                                    os.unlink(temp_filepath)
+                                except Exception:  # pylint: disable=W
+                                    pass
+                                retVal = {
+                                    "status": "False",
+                                    "msg": "ZeroDivisionError : it seems, lecture has malfunction or is zero byte(s) ..",
+                                }
+                                break
+                        else:
+                            rate = 0
+                            eta = 0
+
+                        if not is_malformed:
+                            progress_stats = (
+                                bytesdone,
+                                bytesdone * 1.0 / total,
+                                rate,
+                                eta,
+                            )
+
+                            if not quiet:
+                                status = status_string.format(*progress_stats)
+                                sys.stdout.write("\r" + status + " " * 4 + "\r")
+                                sys.stdout.flush()
+
+                            if callback:
+                                callback(total, *progress_stats)
+            if not response.ok:
+                code = response.status_code
+                reason = response.reason
+                retVal = {
+                    "status": "False",
+                    "msg": "Udemy returned HTTP Code %s: %s" % (code, reason),
+                }
+                response.close()
+        except KeyboardInterrupt as error:
+            raise error
+        except Exception as error:  # pylint: disable=W
+            retVal = {"status": "False", "msg": "Reason : {}".format(str(error))}
+            return retVal
+        # # check if file is downloaded completely
+        if os.path.isfile(temp_filepath):
+            total_bytes_done = os.stat(temp_filepath).st_size
+            if total_bytes_done == bytes_to_be_downloaded:
+                self._active = False
+                self._digest = digest.hexdigest()
+            # if total_bytes_done < bytes_to_be_downloaded:
+            #     # set active to be True as remaining bytes to be downloaded
+            #     self._active = True
+            #     # try downloading back again remaining bytes until we download completely
+            #     self.download(filepath=filepath, quiet=quiet)
+        return retVal
+
+    def download(
+        self,
+        filepath="",
+        quiet=False,
+        callback=lambda *x: None,
+        connections=None,
+    ):
+        if connections is None:
+            connections = self._connections
+        retVal = {}
+
+        filepath = self._resolve_filepath(filepath)
+        if self.mediatype == "external_link":
+            return self._write_external_links(filepath)
 
-        if os.path.isfile(filepath):
+        if self._is_downloaded(filepath):
             retVal = {"status": "True", "msg": "already downloaded"}
             return retVal
 
@@ -143,112 +406,20 @@ class Downloader(object):
         if self.is_hls:
             temp_filepath = filepath.replace(".mp4", "")
             temp_filepath = temp_filepath + ".hls-part.mp4"
+            retVal = self._download_hls(temp_filepath, filepath, quiet, callback)
+            if retVal is not None:
+                # finalized by _download_hls(), the temp file isn't ours to touch.
+                return retVal
             retVal = FFMPeg(None, self.url, self.token, temp_filepath).download()
-            if retVal:
+            if retVal.get("status") == "True":
                 self._active = False
+            if not self._active and os.path.isfile(temp_filepath):
+                # ffmpeg writes the output itself, hash it while it is still cached.
+                self._digest = hash_file(temp_filepath).hexdigest()
         else:
-            bytes_to_be_downloaded = 0
-            fmode, offset = "wb", 0
-            chunksize, bytesdone, t0 = 16384, 0, time.time()
-            headers = {"User-Agent": HEADERS.get("User-Agent"), "Accept-Encoding": None}
-            if os.path.exists(temp_filepath):
-                offset = os.stat(temp_filepath).st_size
-
-            if offset:
-                offset_range = "bytes={}-".format(offset)
-                headers["Range"] = offset_range
-                bytesdone = offset
-                fmode = "ab"
-
-            status_string = (
-                "  {:,} Bytes [{:.2%}] received. Rate: [{:4.0f} "
-                "KB/s].  ETA: [{:.0f} secs]"
-            )
-
-            try:
-                try:
-                    response = self._sess.get(
-                        self.url, headers=headers, stream=True, timeout=10
-                    )
-                except conn_error as error:
-                    return {
-                        "status": "False",
-                        "msg": "ConnectionError: %s" % (str(error)),
-                    }
-                if response.ok:
-                    bytes_to_be_downloaded = total = int(
-                        response.headers.get("Content-Length")
-                    )
-                    if bytesdone > 0:
-                        bytes_to_be_downloaded = bytes_to_be_downloaded + bytesdone
-                    total = bytes_to_be_downloaded
-                    with open(temp_filepath, fmode) as media_file:
-                        is_malformed = False
-                        for chunk in response.iter_content(chunksize):
-                            if not chunk:
-                                break
-                            media_file.write(chunk)
-                            elapsed = time.time() - t0
-                            bytesdone += len(chunk)
-                            if elapsed:
-                                try:
-                                    rate = (
-                                        (float(bytesdone) - float(offset)) / 1024.0
-                                    ) / elapsed
-                                    eta = (total - bytesdone) / (rate * 1024.0)
-                                except ZeroDivisionError:
-                                    is_malformed = True
-                                    try:
-                                        os.unlink(temp_filepath)
-                                    except Exception:  # pylint: disable=W
-                                        pass
-                                    retVal = {
-                                        "status": "False",
-                                        "msg": "ZeroDivisionError : it seems, lecture has malfunction or is zero byte(s) ..",
-                                    }
-                                    break
-                            else:
-                                rate = 0
-                                eta = 0
-
-                            if not is_malformed:
-                                progress_stats = (
-                                    bytesdone,
-                                    bytesdone * 1.0 / total,
-                                    rate,
-                                    eta,
-                                )
-
-                                if not quiet:
-                                    status = status_string.format(*progress_stats)
-                                    sys.stdout.write("\r" + status + " " * 4 + "\r")
-                                    sys.stdout.flush()
-
-                                if callback:
-                                    callback(total, *progress_stats)
-                if not response.ok:
-                    code = response.status_code
-                    reason = response.reason
-                    retVal = {
-                        "status": "False",
-                        "msg": "Udemy returned HTTP Code %s: %s" % (code, reason),
-                    }
-                    response.close()
-            except KeyboardInterrupt as error:
-                raise error
-            except Exception as error:  # pylint: disable=W
-                retVal = {"status": "False", "msg": "Reason : {}".format(str(error))}
-                return retVal
-            # # check if file is downloaded completely
-            if os.path.isfile(temp_filepath):
-                total_bytes_done = os.stat(temp_filepath).st_size
-                if total_bytes_done == bytes_to_be_downloaded:
-                    self._active = False
-                # if total_bytes_done < bytes_to_be_downloaded:
-                #     # set active to be True as remaining bytes to be downloaded
-                #     self._active = True
-                #     # try downloading back again remaining bytes until we download completely
-                #     self.download(filepath=filepath, quiet=quiet)
+            retVal = self._download_segmented(temp_filepath, quiet, callback, connections)
+            if retVal is None:
+                retVal = self._download_stream(temp_filepath, quiet, callback)
 
         if not self._active:
             os.rename(temp_filepath, filepath)
@@ -258,6 +429,20 @@ class Downloader(object):
 
 
 class EncryptDownloader(object):
+    __slots__ = (
+        "_url",
+        "_filename",
+        "_mediatype",
+        "_extension",
+        "_active",
+        "_is_hls",
+        "_token",
+        "_sess",
+        "_pending",
+        "_parent",
+        "_fsize",
+    )
+
     def __init__(self):
         self._url = None
         self._filename = None
@@ -266,7 +451,8 @@ class EncryptDownloader(object):
         self._active = True
         self._is_hls = False
         self._token = None
-        self._sess = requests.session()
+        self._sess = shared_session()
+        self._pending = None
 
     @property
     def url(self):
@@ -295,6 +481,15 @@ class EncryptDownloader(object):
             self._filename = self._generate_filename()  # pylint: disable=E
         return self._filename
 
+    def set_filename(self, filename):
+        """saves the download as `filename` instead of the generated name"""
+        self._filename = filename
+
+    @property
+    def pending(self):
+        """future of the track mux still running for this lecture"""
+        return self._pending
+
     def _generate_filename(self):  # pylint: disable=E
         pass
 
@@ -307,12 +502,17 @@ class EncryptDownloader(object):
         video_filepath_dec = file_name + ".decrypted.mp4"
         audio_filepath_dec = file_name + ".decrypted.m4a"
         logger.info(msg="> Downloading Lecture Tracks...", new_line=True)
-        ret_code = subprocess.Popen([
+        command = [
             "yt-dlp", "--force-generic-extractor", "--allow-unplayable-formats",
             "--concurrent-fragments", f"{concurrent_connections}", "--downloader",
             "aria2c", "--fixup", "never", "-k", "-o", f"{file_name}.encrypted.%(ext)s",
             "-f", format_id, f"{url}"
-        ]).wait()
+        ]
+        rate = limiter.current_rate()
+        if rate:
+            # aria2c does the transfer, it only honours its own limit.
+            command[1:1] = ["--downloader-args", f"aria2c:--max-overall-download-limit={rate}"]
+        ret_code = subprocess.Popen(command).wait()
         logger.info(msg="> Lecture Tracks Downloaded", new_line=True)
 
         logger.info(msg="Return code: " + str(ret_code))
@@ -326,13 +526,7 @@ class EncryptDownloader(object):
         audio_kid = extract_kid(audio_filepath_enc)
         logger.info(msg="KID for audio file is: " + audio_kid, new_line=True)
 
-        try:
-            if do_decrypt and keys_decryptors:
-                decrypt(keys_decryptors, video_kid, video_filepath_enc, video_filepath_dec)
-                decrypt(keys_decryptors, audio_kid, audio_filepath_enc, audio_filepath_dec)
-                mux_process(video_title, video_filepath_dec, audio_filepath_dec, lecture_file_path)
-            # else:
-            #     self.mux_process(file_name+"video_audio_encrypted.mp4", video_filepath_enc, audio_filepath_enc, output_path)
+        def cleanup(retVal):
             if not keep_encrypted and os.path.isfile(lecture_file_path):
                 os.remove(video_filepath_enc)
                 os.remove(audio_filepath_enc)
@@ -340,6 +534,27 @@ class EncryptDownloader(object):
             if do_decrypt and keys_decryptors:
                 os.remove(video_filepath_dec)
                 os.remove(audio_filepath_dec)
+            return retVal
+
+        try:
+            if do_decrypt and keys_decryptors:
+                decrypt(keys_decryptors, video_kid, video_filepath_enc, video_filepath_dec)
+                decrypt(keys_decryptors, audio_kid, audio_filepath_enc, audio_filepath_dec)
+                # muxed on the post-processing stage, the next lecture can start.
+                self._pending = postprocessor.submit(
+                    mux_process,
+                    video_title,
+                    video_filepath_dec,
+                    audio_filepath_dec,
+                    lecture_file_path,
+                    staged=os.path.getsize(video_filepath_dec) + os.path.getsize(audio_filepath_dec),
+                    finalize=cleanup,
+                    name=video_title,
+                )
+            # else:
+            #     self.mux_process(file_name+"video_audio_encrypted.mp4", video_filepath_enc, audio_filepath_enc, output_path)
+            else:
+                cleanup(None)
         except Exception as e:
             print(f"Error: ", e)
 
@@ -382,7 +597,8 @@ class UdemyCourse(object):
         skip_hls_stream=False,
         cache_session=False,
         callback=None,
-        chapter_start=0
+        chapter_start=0,
+        refresh=False,
     ):
 
         self._url = url
@@ -390,6 +606,7 @@ class UdemyCourse(object):
         self._password = password
         self._cookies = cookies
         self._cache_session = cache_session
+        self._refresh = refresh
         self._skip_hls_stream = skip_hls_stream
         self._callback = callback or (lambda x: None)
         self._have_basic = False
@@ -401,24 +618,35 @@ class UdemyCourse(object):
         self._total_quizzes = None
 
         self._chapters = []
+        # lecture id -> (position in the course, lecture), shared with quizzes.
+        self._lecture_index = {}
 
         self._chapter_start = chapter_start
 
         if basic:
             self._fetch_course()
 
-        whole_lectures = []
-        if self._chapters:
-            for c in self._chapters:
-                for l in c.get_lectures():
-                    whole_lectures.append(l)
-            for c in self._chapters:
-                for q in c.get_quizzes():
-                    q.update_related_questions_lectures(whole_lectures)
+        for chapter in self._chapters:
+            self._index_chapter(chapter)
 
     def _fetch_course(self):
         raise NotImplementedError
 
+    def _next_chapter(self):
+        """completes the next chapter of a course that is still being extracted"""
+        return None
+
+    def _index_chapter(self, chapter):
+        """
+        adds the lectures of a complete chapter to the course index, quizzes
+        resolve their related lectures against it once they are dumped.
+        """
+        for lecture in chapter.get_lectures():
+            if lecture.id not in self._lecture_index:
+                self._lecture_index[lecture.id] = (len(self._lecture_index), lecture)
+        for quiz in chapter.get_quizzes():
+            quiz.link_lectures(self._lecture_index)
+
     @property
     def id(self):
         if not self._id:
@@ -449,9 +677,7 @@ class UdemyCourse(object):
             self._fetch_course()
         return self._total_quizzes
 
-    def get_chapters(self, chapter_number=None, chapter_start=None, chapter_end=None):
-        if not self._chapters:
-            self._fetch_course()
+    def _select_chapters(self, chapters, chapter_number=None, chapter_start=None, chapter_end=None):
         if (
             chapter_number
             and not chapter_start
@@ -460,19 +686,64 @@ class UdemyCourse(object):
         ):
             is_okay = bool(0 < chapter_number <= self.chapters)
             if is_okay:
-                self._chapters = [self._chapters[chapter_number - 1]]
+                chapters = [chapters[chapter_number - 1]]
         if chapter_start and not chapter_number and isinstance(chapter_start, int):
             is_okay = bool(0 < chapter_start <= self.chapters)
             if is_okay:
-                self._chapters = self._chapters[chapter_start - 1 :]
+                chapters = chapters[chapter_start - 1 :]
         if chapter_end and not chapter_number and isinstance(chapter_end, int):
             is_okay = bool(0 < chapter_end <= self.chapters)
             if is_okay:
-                self._chapters = self._chapters[: chapter_end - 1]
-        return self._chapters
+                chapters = chapters[: chapter_end - 1]
+        return chapters
+
+    def get_chapters(self, chapter_number=None, chapter_start=None, chapter_end=None):
+        if not self._have_basic:
+            self._fetch_course()
+        while self._next_chapter() is not None:
+            pass
+        # the course keeps every chapter, sync compares against all of them.
+        return self._select_chapters(
+            self._chapters, chapter_number, chapter_start, chapter_end
+        )
+
+    def iter_chapters(self, chapter_number=None, chapter_start=None, chapter_end=None):
+        """
+        yields the chapters get_chapters() would return, each one as soon as
+        it is extracted. the course is extracted to the end either way.
+        """
+        if not self._have_basic:
+            self._fetch_course()
+        # the chapter count is known up front, select by position.
+        selected = set(
+            self._select_chapters(
+                list(range(self.chapters or 0)), chapter_number, chapter_start, chapter_end
+            )
+        )
+        position = 0
+        while True:
+            if position < len(self._chapters):
+                chapter = self._chapters[position]
+            else:
+                chapter = self._next_chapter()
+                if chapter is None:
+                    return
+            if position in selected:
+                yield chapter
+            position += 1
 
 
 class UdemyChapters(object):
+    __slots__ = (
+        "_chapter_id",
+        "_chapter_index",
+        "_chapter_title",
+        "_lectures_count",
+        "_question_count",
+        "_lectures",
+        "_quizzes",
+    )
+
     def __init__(self):
 
         self._chapter_id = None
@@ -509,6 +780,8 @@ class UdemyChapters(object):
         return self._question_count
 
     def get_lectures(self, lecture_number=None, lecture_start=None, lecture_end=None):
+        # selecting leaves the chapter whole, it is selected again by each pass.
+        lectures = self._lectures
         if (
             lecture_number
             and not lecture_start
@@ -517,18 +790,19 @@ class UdemyChapters(object):
         ):
             is_okay = bool(0 < lecture_number <= self.lectures)
             if is_okay:
-                self._lectures = [self._lectures[lecture_number - 1]]
+                lectures = [lectures[lecture_number - 1]]
         if lecture_start and not lecture_number and isinstance(lecture_start, int):
             is_okay = bool(0 < lecture_start <= self.lectures)
             if is_okay:
-                self._lectures = self._lectures[lecture_start - 1 :]
+                lectures = lectures[lecture_start - 1 :]
         if lecture_end and not lecture_number and isinstance(lecture_end, int):
             is_okay = bool(0 < lecture_end <= self.lectures)
             if is_okay:
-                self._lectures = self._lectures[: lecture_end - 1]
-        return self._lectures
+                lectures = lectures[: lecture_end - 1]
+        return lectures
 
     def get_quizzes(self, quiz_number=None, quiz_start=None, quiz_end=None):
+        quizzes = self._quizzes
         if (
                 quiz_number
                 and not quiz_start
@@ -537,19 +811,38 @@ class UdemyChapters(object):
         ):
             is_okay = bool(0 < quiz_number <= self.quizzes)
             if is_okay:
-                self._quizzes = [self._quizzes[quiz_number - 1]]
+                quizzes = [quizzes[quiz_number - 1]]
         if quiz_start and not quiz_number and isinstance(quiz_start, int):
             is_okay = bool(0 < quiz_start <= self.lectures)
             if is_okay:
-                self._quizzes = self._quizzes[quiz_start - 1:]
+                quizzes = quizzes[quiz_start - 1:]
         if quiz_end and not quiz_number and isinstance(quiz_end, int):
             is_okay = bool(0 < quiz_end <= self.lectures)
             if is_okay:
-                self._quizzes = self._quizzes[: quiz_end - 1]
-        return self._quizzes
+                quizzes = quizzes[: quiz_end - 1]
+        return quizzes
 
 
 class UdemyLectures(object):
+    __slots__ = (
+        "_best",
+        "_duration",
+        "_extension",
+        "_lecture_id",
+        "_lecture_title",
+        "_lecture_index",
+        "_sources_count",
+        "_assets_count",
+        "_subtitles_count",
+        "_html_content",
+        "_is_encrypted",
+        "_asset_id",
+        "_assets",
+        "_streams",
+        "_subtitles",
+        "_encrypt_streams",
+    )
+
     def __init__(self):
 
         self._best = None
@@ -683,6 +976,8 @@ class UdemyLectures(object):
 
 
 class UdemyLectureEncryptStreams(EncryptDownloader):
+    __slots__ = ("_quality", "_resolution", "_dimension", "_format_id")
+
     def __init__(self, parent):
         self._mediatype = None
         self._quality = None
@@ -703,8 +998,7 @@ class UdemyLectureEncryptStreams(EncryptDownloader):
         EncryptDownloader.__init__(self)
 
     def _generate_filename(self):
-        ok = re.compile(r'[^\\/:*?"<>|]')
-        filename = "".join(x if ok.match(x) else "_" for x in self.title)
+        filename = safe_name(self.title)
         filename += "." + self.extension
         return filename
 
@@ -764,6 +1058,10 @@ class UdemyLectureEncryptStreams(EncryptDownloader):
 
 
 class UdemyLectureStream(Downloader):
+    _kind = "lecture"
+
+    __slots__ = ("_quality", "_resolution", "_dimension")
+
     def __init__(self, parent):
 
         self._mediatype = None
@@ -787,8 +1085,7 @@ class UdemyLectureStream(Downloader):
         return out
 
     def _generate_filename(self):
-        ok = re.compile(r'[^\\/:*?"<>|]')
-        filename = "".join(x if ok.match(x) else "_" for x in self.title)
+        filename = safe_name(self.title)
         filename += "." + self.extension
         return filename
 
@@ -842,21 +1139,12 @@ class UdemyLectureStream(Downloader):
     def mediatype(self):
         return self._mediatype
 
-    def get_filesize(self):
-        if not self._fsize:
-            headers = {"User-Agent": HEADERS.get("User-Agent")}
-            try:
-                with requests.get(self.url, stream=True, headers=headers) as resp:
-                    if resp.ok:
-                        self._fsize = float(resp.headers.get("Content-Length", 0))
-                    if not resp.ok:
-                        self._fsize = 0
-            except conn_error:
-                self._fsize = 0
-        return self._fsize
-
 
 class UdemyLectureAssets(Downloader):
+    _kind = "asset"
+
+    __slots__ = ()
+
     def __init__(self, parent):
 
         self._extension = None
@@ -875,8 +1163,7 @@ class UdemyLectureAssets(Downloader):
         return out
 
     def _generate_filename(self):
-        ok = re.compile(r'[^\\/:*?"<>|]')
-        filename = "".join(x if ok.match(x) else "_" for x in self.title)
+        filename = safe_name(self.title)
         filename += ".{}".format(self.extension)
         return filename
 
@@ -906,21 +1193,12 @@ class UdemyLectureAssets(Downloader):
     def mediatype(self):
         return self._mediatype
 
-    def get_filesize(self):
-        if not self._fsize:
-            headers = {"User-Agent": HEADERS.get("User-Agent")}
-            try:
-                with requests.get(self.url, stream=True, headers=headers) as resp:
-                    if resp.ok:
-                        self._fsize = float(resp.headers.get("Content-Length", 0))
-                    if not resp.ok:
-                        self._fsize = 0
-            except conn_error:
-                self._fsize = 0
-        return self._fsize
-
 
 class UdemyLectureSubtitles(Downloader):
+    _kind = "subtitle"
+
+    __slots__ = ("_language",)
+
     def __init__(self, parent):
 
         self._mediatype = None
@@ -934,14 +1212,15 @@ class UdemyLectureSubtitles(Downloader):
         self._active = False
 
         Downloader.__init__(self)
+        # captions are a few KB, a range probe would only add a round trip.
+        self._connections = 1
 
     def __repr__(self):
         out = "%s:%s@%s" % (self.mediatype, self.language, self.extension)
         return out
 
     def _generate_filename(self):
-        ok = re.compile(r'[^\\/:*?"<>|]')
-        filename = "".join(x if ok.match(x) else "_" for x in self.title)
+        filename = safe_name(self.title)
         filename += ".{}.{}".format(self.language, self.extension)
         return filename
 
@@ -991,22 +1270,18 @@ class UdemyLectureSubtitles(Downloader):
             _temp = subtitles
         return _temp
 
-    def get_filesize(self):
-        if not self._fsize:
-            headers = {"User-Agent": HEADERS.get("User-Agent")}
-            try:
-                with requests.get(self.url, stream=True, headers=headers) as resp:
-                    if resp.ok:
-                        self._fsize = float(resp.headers.get("Content-Length", 0))
-                    if not resp.ok:
-                        self._fsize = 0
-            except conn_error:
-                self._fsize = 0
-        return self._fsize
-
 
 # PLUGIN: QUIZZES
 class UdemyQuizzes(object):
+    __slots__ = (
+        "_quiz_id",
+        "_quiz_title",
+        "_question_count",
+        "_quiz_index",
+        "_questions",
+        "_lecture_index",
+    )
+
     def __init__(self):
         self._quiz_id = None
         self._quiz_title = None
@@ -1015,6 +1290,7 @@ class UdemyQuizzes(object):
         self._quiz_index = None
 
         self._questions = []
+        self._lecture_index = {}
 
     def __repr__(self):
         quiz = "{title}".format(title=self.title)
@@ -1042,17 +1318,16 @@ class UdemyQuizzes(object):
             self._process_questions()
         return self._questions
 
-    def update_related_questions_lectures(self, lectures):
-        self._questions = self.questions
-        for q in self._questions:
-            q.update_related_lectures(lectures)
+    @property
+    def lecture_index(self):
+        return self._lecture_index
 
+    def link_lectures(self, lecture_index):
+        """questions look their related lectures up in `lecture_index` when needed"""
+        self._lecture_index = lecture_index
 
     def _clean(self, text):
-        ok = re.compile(r'[^\\/:*?"<>|]')
-        text = "".join(x if ok.match(x) else "_" for x in text)
-        text = re.sub(r"\.+$", "", text.strip())
-        return text
+        return clean(text)
 
     def dump(self, filepath):
         filename = os.path.join(filepath, f"{self._quiz_title}")
@@ -1061,7 +1336,7 @@ class UdemyQuizzes(object):
         if os.path.isfile(filename):
             retVal = {"status": "True", "msg": "already downloaded"}
             return retVal
-        questions = [x.mapper() for x in self._questions]
+        questions = [x.mapper() for x in self.questions]
         content = {
             "id": self._quiz_id,
             "title": self._quiz_title,
@@ -1072,6 +1347,21 @@ class UdemyQuizzes(object):
 
 
 class UdemyQuizQuestion(object):
+    __slots__ = (
+        "_parent",
+        "_index",
+        "_class",
+        "_id",
+        "_assessment_type",
+        "_feedbacks",
+        "_answers",
+        "_correct_response",
+        "_section",
+        "_question_plain",
+        "_explanation_html",
+        "_related_lectures",
+    )
+
     def __init__(self, parent):
         self._parent = parent
 
@@ -1085,7 +1375,7 @@ class UdemyQuizQuestion(object):
         self._section = None
         self._question_plain = None
         self._explanation_html = None
-        self._related_lectures = []
+        self._related_lectures = None
 
     @property
     def id(self):
@@ -1105,11 +1395,12 @@ class UdemyQuizQuestion(object):
 
     @property
     def related_lectures(self):
+        if self._related_lectures is None:
+            self._related_lectures = self._process_related_lectures(
+                self._parent.lecture_index
+            )
         return self._related_lectures
 
-    def update_related_lectures(self, lectures):
-        self._related_lectures = self._process_related_lectures(lectures)
-
     def mapper(self):
         return {
             "_class": self._class,
@@ -1127,6 +1418,6 @@ class UdemyQuizQuestion(object):
                     "title": x.title,
                     "index": x.index
                 }
-                for x in self._related_lectures
+                for x in self.related_lectures
             ]
         }
\ No newline at end of file
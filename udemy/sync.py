@@ -0,0 +1,175 @@
+# pylint: disable=R,C,W
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+
+Author  : Nasir Khan (r0ot h3x49)
+Github  : https://github.com/r0oth3x49
+License : MIT
+
+
+Copyright (c) 2018-2025 Nasir Khan (r0ot h3x49)
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), to deal in the
+Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, 
+and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR
+ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH 
+THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""
+
+from udemy.compat import os
+
+
+class CourseSync(object):
+    """
+    Reconciles a course directory with the freshly extracted curriculum, the
+    manifest of the previous run being the snapshot. Files are matched by
+    lecture id and kind (asset id for assets, language for subtitles); a
+    match with another asset id, url or size is changed, a match at another
+    path is moved on disk. What is left to download is then picked up by the
+    'already downloaded' checks of the downloaders.
+    """
+
+    def __init__(self, manifest):
+        self.manifest = manifest
+        self.new = []
+        self.changed = []
+        self.moved = []
+        self.unchanged = []
+        self.removed = []
+        self._items = []
+        self._lectures = set()
+        self._index = {}
+        self._legacy = {}
+        for relpath, entry in manifest.files.items():
+            key = self.identity(entry.get("source") or {})
+            if key:
+                self._index.setdefault(key, []).append(relpath)
+            else:
+                # recorded before sources carried their kind, matched by path.
+                self._legacy[self._normpath(self._abspath(relpath))] = relpath
+
+    @staticmethod
+    def identity(source):
+        kind, lecture_id = source.get("kind"), source.get("lecture_id")
+        if not kind or lecture_id is None:
+            return None
+        if kind == "asset":
+            return kind, lecture_id, source.get("asset_id")
+        if kind == "subtitle":
+            return kind, lecture_id, source.get("language")
+        return kind, lecture_id
+
+    @staticmethod
+    def is_changed(previous, current):
+        for name in ("asset_id", "url", "size"):
+            if previous.get(name) and current.get(name) and previous[name] != current[name]:
+                return True
+        return False
+
+    def _abspath(self, relpath):
+        return os.path.join(self.manifest.course_path, *relpath.split("/"))
+
+    def _normpath(self, filepath):
+        return os.path.normcase(os.path.abspath(filepath))
+
+    def _candidates(self, filepath):
+        """paths a file downloaded to `filepath` can end up at"""
+        if filepath.endswith(".vtt"):
+            return [filepath, filepath[:-4] + ".srt"]
+        return [filepath]
+
+    def _target(self, relpath, filepath):
+        """where `relpath` belongs now, keeping its own extension ('.srt')"""
+        stem = os.path.splitext(filepath)[0]
+        return stem + os.path.splitext(relpath)[1]
+
+    def add(self, item, filepath):
+        """`filepath` is where the current curriculum puts `item`"""
+        source = item.source
+        key = self.identity(source)
+        if not key:
+            return
+        self._lectures.add(source["lecture_id"])
+        self._items.append((key, source, filepath))
+
+    def plan(self, lectures=None):
+        """
+        classifies every added item, `lectures` are the ids of the whole
+        course so files of lectures that were skipped aren't reported.
+        """
+        claimed = set()
+        self._moves, self._stale = [], set()
+        for key, source, filepath in self._items:
+            relpaths = [
+                r for r in self._index.get(key, []) if os.path.isfile(self._abspath(r))
+            ]
+            title = os.path.basename(filepath)
+            if not relpaths:
+                relpaths = [
+                    self._legacy[p]
+                    for p in map(self._normpath, self._candidates(filepath))
+                    if p in self._legacy and os.path.isfile(p)
+                ]
+            if not relpaths:
+                self.new.append(title)
+                continue
+            claimed.update(relpaths)
+            previous = self.manifest.files[relpaths[0]].get("source") or {}
+            if self.is_changed(previous, source):
+                self.changed.append(title)
+                self._stale.update(relpaths)
+                continue
+            moves = [
+                (r, self._target(r, filepath))
+                for r in relpaths
+                if self._normpath(self._abspath(r)) != self._normpath(self._target(r, filepath))
+            ]
+            if moves:
+                self.moved.append((relpaths[0], self.manifest._relpath(moves[0][1])))
+                self._moves.extend((r, target, source) for r, target in moves)
+            else:
+                self.unchanged.append(title)
+            for relpath in relpaths:
+                self.manifest.files[relpath]["source"] = source
+        targets = set(self._normpath(target) for _, target, _ in self._moves)
+        for _, _, filepath in self._items:
+            targets.update(map(self._normpath, self._candidates(filepath)))
+        for relpath in self.manifest.files:
+            if relpath in claimed or self._normpath(self._abspath(relpath)) in self._legacy:
+                continue
+            lecture_id = (self.manifest.files[relpath].get("source") or {}).get("lecture_id")
+            # a tracked file in the way of the new layout is of an older revision.
+            if self._normpath(self._abspath(relpath)) in targets:
+                self._stale.add(relpath)
+            elif lecture_id in self._lectures or (
+                lectures is not None and lecture_id not in lectures
+            ):
+                self.removed.append(relpath)
+        return self
+
+    def apply(self):
+        """moves files in two steps so that swapped names don't collide"""
+        staged = []
+        for relpath, target, source in self._moves:
+            temp = target + ".sync"
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            os.replace(self._abspath(relpath), temp)
+            staged.append((relpath, target, temp, source))
+        for relpath in self._stale:
+            try:
+                os.remove(self._abspath(relpath))
+            except OSError:
+                pass
+            self.manifest.discard(relpath)
+        for relpath, target, temp, source in staged:
+            os.replace(temp, target)
+        self.manifest.move([(relpath, target, source) for relpath, target, _, source in staged])
+        return self
@@ -0,0 +1,131 @@
+# pylint: disable=R,C,W
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+
+Author  : Nasir Khan (r0ot h3x49)
+Github  : https://github.com/r0oth3x49
+License : MIT
+
+
+Copyright (c) 2018-2025 Nasir Khan (r0ot h3x49)
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), to deal in the
+Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, 
+and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR
+ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH 
+THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""
+
+import threading
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from udemy.compat import requests
+
+
+class TransportStats(object):
+    """Counts requests sent and connections (handshakes) opened by the shared session."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.connections = 0
+
+    def _add_request(self):
+        with self._lock:
+            self.requests += 1
+
+    def _add_connection(self):
+        with self._lock:
+            self.connections += 1
+
+    @property
+    def reused(self):
+        """requests served over an already open (keep-alive) connection"""
+        return max(0, self.requests - self.connections)
+
+    def reset(self):
+        with self._lock:
+            self.requests = 0
+            self.connections = 0
+
+    def __repr__(self):
+        return "requests=%s new=%s reused=%s" % (
+            self.requests,
+            self.connections,
+            self.reused,
+        )
+
+
+stats = TransportStats()
+
+
+class _CountingHTTPConnection(HTTPConnection):
+    def connect(self):
+        stats._add_connection()
+        return super(_CountingHTTPConnection, self).connect()
+
+
+class _CountingHTTPSConnection(HTTPSConnection):
+    def connect(self):
+        stats._add_connection()
+        return super(_CountingHTTPSConnection, self).connect()
+
+
+class _CountingHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _CountingHTTPConnection
+
+
+class _CountingHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _CountingHTTPSConnection
+
+
+class PooledAdapter(HTTPAdapter):
+    """
+    HTTPAdapter keeping one connection pool per host, connections are only
+    opened on first use and every pool shares requests' preloaded SSL context.
+    """
+
+    def __init__(self, pool_connections=32, pool_maxsize=64, **kwargs):
+        super(PooledAdapter, self).__init__(
+            pool_connections=pool_connections, pool_maxsize=pool_maxsize, **kwargs
+        )
+
+    def init_poolmanager(self, *args, **kwargs):
+        super(PooledAdapter, self).init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _CountingHTTPConnectionPool,
+            "https": _CountingHTTPSConnectionPool,
+        }
+
+    def send(self, request, **kwargs):
+        stats._add_request()
+        return super(PooledAdapter, self).send(request, **kwargs)
+
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def shared_session():
+    """Returns the process wide requests session used for media transfers."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.session()
+                adapter = PooledAdapter()
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _session = session
+    return _session
@@ -37,7 +37,8 @@ def course(
     skip_hls_stream=False,
     cache_session=False,
     callback=None,
-    chapter_start=0
+    chapter_start=0,
+    refresh=False,
 ):
     """Returns udemy course instance.
 
@@ -46,6 +47,7 @@ def course(
         username : Udemy email account required : type (string).
         password : Udemy account password required : type (string)
         cookies  : Udemy account logged in browser cookies optional : type (string)
+        refresh  : Ignore the cached course information : type (bool)
     """
     return Udemy(
         url,
@@ -56,7 +58,8 @@ def course(
         skip_hls_stream,
         cache_session,
         callback,
-        chapter_start
+        chapter_start,
+        refresh,
     )
 
 
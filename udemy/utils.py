@@ -24,6 +24,8 @@ THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 
 """
 
+import errno
+
 from udemy.compat import (
     re,
     os,
@@ -35,6 +37,22 @@ from udemy.compat import (
 from udemy.logger import logger
 
 
+def preallocate(fd, size):
+    """
+    reserves `size` bytes for the file behind `fd` in one extent where the
+    filesystem allows it, running out of space raises right away.
+    """
+    if hasattr(os, "posix_fallocate"):
+        try:
+            os.posix_fallocate(fd, 0, size)
+            return
+        except OSError as error:
+            if error.errno == errno.ENOSPC:
+                raise
+            # not supported by the filesystem, fall back to a sparse file.
+    os.ftruncate(fd, size)
+
+
 def extract_cookie_string(raw_cookies):
     cookies = {}
     try:
@@ -82,16 +100,6 @@ def to_human_readable(content_length):
     return hr
 
 
-def to_filepath(base, name):
-    base = re.sub(r'"', "", base.strip())
-    filepath = os.path.join(base, name)
-    try:
-        os.makedirs(filepath)
-    except:
-        pass
-    return filepath
-
-
 def prepare_html(title, html):
     data = """
                 <html>